@@ -1,16 +1,35 @@
 import os
-from flask import Flask, jsonify, make_response, request
+
+from flask import Flask, jsonify, request
 from dotenv import load_dotenv
+from sqlalchemy.orm.exc import StaleDataError
 
 from .config import Config
+from .cors import CorsPolicy, PreflightMiddleware
+from .database import configure_engine_options, instrument_engine
 from .extensions import db, jwt, migrate
-from .blueprints.auth import auth_bp
-from .blueprints.organizations import organizations_bp
-from .blueprints.tasks import tasks_bp
-from .blueprints.roadmap import roadmap_bp
-from .blueprints.projects import projects_bp
-from .blueprints.teams import teams_bp
-from .blueprints.health import health_bp
+from .metrics import init_metrics
+from .profiling import init_profiling
+from .query_budget import init_query_budget
+from .response_cache import init_response_cache
+from .single_flight import init_single_flight
+from .slow_queries import init_slow_queries
+from .versioning import VersionConflict, conflict_response
+
+# (module, blueprint attribute, url prefix). Blueprint modules are imported by
+# the factory rather than at package import, so ``import app`` stays cheap.
+BLUEPRINTS = (
+    ("auth", "auth_bp", "/api/auth"),
+    ("organizations", "organizations_bp", "/api/organizations"),
+    ("tasks", "tasks_bp", "/api/tasks"),
+    ("roadmap", "roadmap_bp", "/api/roadmap"),
+    ("projects", "projects_bp", "/api/projects"),
+    ("teams", "teams_bp", "/api/teams"),
+    ("health", "health_bp", "/health"),
+    ("admin", "admin_bp", "/api/admin"),
+    ("batch", "batch_bp", "/api/batch"),
+    ("jobs", "jobs_bp", "/api/jobs"),
+)
 
 
 def create_app(config_class: type[Config] = Config) -> Flask:
@@ -21,7 +40,16 @@ def create_app(config_class: type[Config] = Config) -> Flask:
     app.config.from_object(config_class)
 
     _register_extensions(app)
+    init_metrics(app)
+    init_response_cache(app)
+    init_single_flight(app)
+    init_slow_queries(app)
     _setup_cors(app)
+    # Registered after CORS so its after_request runs first and a failed
+    # budget response still gets CORS headers.
+    init_query_budget(app)
+    # Outermost middleware so a profiled request includes CORS and routing.
+    init_profiling(app)
     _register_blueprints(app)
     _register_error_handlers(app)
 
@@ -29,48 +57,41 @@ def create_app(config_class: type[Config] = Config) -> Flask:
 
 
 def _setup_cors(app: Flask) -> None:
-    """Setup CORS handling"""
-    
+    """Answer preflights in WSGI middleware and tag responses for allowed origins."""
+    policy = CorsPolicy(app.config["CORS_ORIGINS"], app.config["CORS_MAX_AGE"])
+    app.extensions["cors"] = policy
+    app.wsgi_app = PreflightMiddleware(app.wsgi_app, policy)
+
     @app.after_request
     def after_request(response):
-        """Add CORS headers to every response"""
-        origin = request.headers.get('Origin')
-        if origin:
-            response.headers['Access-Control-Allow-Origin'] = origin
-            response.headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
-            response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization'
-            response.headers['Access-Control-Allow-Credentials'] = 'true'
-        return response
-    
-    @app.route('/', defaults={'path': ''}, methods=['OPTIONS'])
-    @app.route('/<path:path>', methods=['OPTIONS'])
-    def handle_options(path):
-        """Handle all OPTIONS requests"""
-        response = make_response('', 200)
-        origin = request.headers.get('Origin')
-        if origin:
-            response.headers['Access-Control-Allow-Origin'] = origin
-            response.headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
-            response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization'
-            response.headers['Access-Control-Allow-Credentials'] = 'true'
-            response.headers['Access-Control-Max-Age'] = '3600'
+        """Add CORS headers for allowed origins"""
+        response.vary.add("Origin")
+        for name, value in policy.response_headers(request.headers.get("Origin")):
+            response.headers[name] = value
         return response
 
 
 def _register_extensions(app: Flask) -> None:
+    from . import models  # noqa: F401  - register tables for Migrate
+    from .org_events import init_org_events
+    from .project_stats import init_project_stats
+    from .task_activity import init_task_activity
+
+    configure_engine_options(app)
     db.init_app(app)
+    instrument_engine(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
+    init_org_events(app)
+    init_task_activity(app)
+    init_project_stats(app)
 
 
 def _register_blueprints(app: Flask) -> None:
-    app.register_blueprint(auth_bp, url_prefix="/api/auth")
-    app.register_blueprint(organizations_bp, url_prefix="/api/organizations")
-    app.register_blueprint(tasks_bp, url_prefix="/api/tasks")
-    app.register_blueprint(roadmap_bp, url_prefix="/api/roadmap")
-    app.register_blueprint(projects_bp, url_prefix="/api/projects")
-    app.register_blueprint(teams_bp, url_prefix="/api/teams")
-    app.register_blueprint(health_bp, url_prefix="/health")
+    for module, attr, url_prefix in BLUEPRINTS:
+        # __import__ rather than importlib so -X importtime sees these imports.
+        package = __import__(f"{__name__}.blueprints.{module}", fromlist=[attr])
+        app.register_blueprint(getattr(package, attr), url_prefix=url_prefix)
 
 
 def _register_error_handlers(app: Flask) -> None:
@@ -78,6 +99,16 @@ def _register_error_handlers(app: Flask) -> None:
     def not_found(error):  # type: ignore[override]
         return jsonify({"message": "Not found"}), 404
 
+    @app.errorhandler(VersionConflict)
+    def version_conflict(error):  # type: ignore[override]
+        return conflict_response(error)
+
+    @app.errorhandler(StaleDataError)
+    def stale_data(error):  # type: ignore[override]
+        # The ORM's version check lost a race between load and UPDATE.
+        db.session.rollback()
+        return conflict_response(VersionConflict())
+
     @app.errorhandler(500)
     def server_error(error):  # type: ignore[override]
         if app.debug:
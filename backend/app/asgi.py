@@ -0,0 +1,320 @@
+"""Optional ASGI serving mode.
+
+The hot read endpoints (task, project and roadmap lists and ``/api/auth/me``)
+are served natively on an event loop with an async SQLAlchemy engine
+(aiosqlite / asyncpg), so a single process can keep thousands of list queries
+in flight. ``/api/organizations/<id>/events`` streams are served from an
+``EventHub`` (``app/org_events.py``), so idle streams cost no threads. Every
+other request falls through to the regular Flask app, which runs in
+asgiref's thread pool.
+
+Usage:
+    pip install -r requirements-async.txt
+    uvicorn asgi:app --host 0.0.0.0 --port 5001
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+from typing import Any, Awaitable, Callable, Mapping
+from urllib.parse import parse_qsl
+
+from flask import Flask
+from flask_jwt_extended import decode_token
+from jwt import ExpiredSignatureError, InvalidTokenError
+from sqlalchemy import select
+from sqlalchemy.engine import URL
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+except ImportError as err:  # pragma: no cover - optional dependency
+    raise ImportError("ASGI mode needs the packages in requirements-async.txt") from err
+
+from . import create_app
+from .blueprints.auth import _user_response
+from .blueprints.projects import _project_to_dict
+from .blueprints.roadmap import _milestone_to_dict, _phase_to_dict
+from .blueprints.tasks import _task_to_dict
+from .cors import is_preflight
+from .database import _is_sqlite, attach_sqlite_pragmas, engine_options
+from .extensions import db
+from .jobs import start_workers, stop_workers
+from .metrics import metrics
+from .models import Organization, OrganizationMember, Project, RoadmapMilestone, RoadmapPhase, Task, User
+from .org_events import (
+    HEARTBEAT, RETRY_MS, EventHub, backlog_query, latest_id_query, oldest_id_query, parse_last_event_id, replay,
+    retry_frame,
+)
+from .project_stats import projects_with_stats_query, stats_to_dict
+from .subtasks import group, subtasks_query
+
+Payload = tuple[dict[str, Any], int]
+Handler = Callable[[AsyncSession, str, dict[str, str]], Awaitable[Payload]]
+
+_ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+_EVENTS_PATH = re.compile(r"^/api/organizations/([^/]+)/events/?$")
+
+
+def async_database_url(app: Flask) -> URL:
+    """The app's database URL with its driver swapped for an asyncio one."""
+    with app.app_context():
+        # Flask-SQLAlchemy has already resolved relative SQLite paths here.
+        url = db.engine.url
+    driver = app.config.get("ASYNC_DATABASE_DRIVER") or _ASYNC_DRIVERS.get(url.get_backend_name())
+    if not driver:
+        raise RuntimeError(f"No async driver known for {url.get_backend_name()!r}; set ASYNC_DATABASE_DRIVER")
+    url = url.set(drivername=driver)
+    if driver.endswith("+asyncpg") and "sslmode" in url.query:
+        sslmode = url.query["sslmode"]
+        url = url.difference_update_query(["sslmode"]).update_query_dict({"ssl": sslmode})
+    return url
+
+
+def async_engine_options(config: Mapping[str, Any]) -> dict[str, Any]:
+    # Same sizing as the sync profile; the async engine picks its own pool class.
+    return {k: v for k, v in engine_options(config).items() if k != "poolclass"}
+
+
+class AsyncReadApp:
+    """ASGI app serving the hot GET routes natively and delegating the rest to Flask."""
+
+    def __init__(self, flask_app: Flask) -> None:
+        self.flask_app = flask_app
+        self.fallback = WsgiToAsgi(flask_app)
+        self.engine = create_async_engine(
+            async_database_url(flask_app), **async_engine_options(flask_app.config)
+        )
+        if _is_sqlite(flask_app.config["SQLALCHEMY_DATABASE_URI"]):
+            attach_sqlite_pragmas(self.engine.sync_engine, flask_app.config)
+        self.sessionmaker = async_sessionmaker(self.engine, expire_on_commit=False)
+        self.cors = flask_app.extensions["cors"]
+        config = flask_app.config
+        self.events = EventHub(self.sessionmaker, config["EVENTS_POLL_INTERVAL"], config["EVENTS_QUEUE_SIZE"])
+        metrics.add_collector("org_events", self.events.metric_lines)
+        self.routes: dict[str, Handler] = {
+            "/api/auth/me": self.me,
+            "/api/tasks": self.list_tasks,
+            "/api/projects": self.list_projects,
+            "/api/roadmap/phases": self.list_phases,
+            "/api/roadmap/milestones": self.list_milestones,
+        }
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] == "http" and scope["method"] == "OPTIONS":
+            headers = dict(scope["headers"])
+            origin = headers.get(b"origin", b"").decode("latin-1") or None
+            if is_preflight("OPTIONS", origin, headers.get(b"access-control-request-method")):
+                await self._send(send, 204, self.cors.preflight_headers(origin), b"")
+                return
+        if scope["type"] == "http" and scope["method"] == "GET":
+            handler = self.routes.get(scope["path"].rstrip("/"))
+            if handler is not None:
+                await self._dispatch(handler, scope, send)
+                return
+            match = _EVENTS_PATH.match(scope["path"])
+            if match is not None:
+                await self.stream_events(match.group(1), scope, receive, send)
+                return
+        await self.fallback(scope, receive, send)
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                start_workers(self.flask_app)
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.events.close()
+                await asyncio.to_thread(stop_workers, self.flask_app.config["JOB_LEASE_SECONDS"])
+                await self.engine.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _dispatch(self, handler: Handler, scope, send) -> None:
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+        user_id, error = self._authenticate(headers.get("authorization"))
+        if error is not None:
+            payload, status = error
+        else:
+            params = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+            async with self.sessionmaker() as session:
+                payload, status = await handler(session, user_id, params)
+        await self._respond(send, payload, status, headers.get("origin"))
+
+    async def stream_events(self, org_id: str, scope, receive, send) -> None:
+        """Server-Sent Events for one org, resuming after ``Last-Event-ID``."""
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+        params = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+        origin = headers.get("origin")
+        # EventSource cannot set headers; accept the token as ?jwt= like the Flask route.
+        token = headers.get("authorization") or (f"Bearer {params['jwt']}" if params.get("jwt") else None)
+        user_id, error = self._authenticate(token)
+        if error is not None:
+            await self._respond(send, *error, origin)
+            return
+        async with self.sessionmaker() as session:
+            member = await session.scalar(
+                select(OrganizationMember.id).filter_by(organization_id=org_id, user_id=user_id, status="active")
+            )
+        if member is None:
+            await self._respond(send, {"message": "Not a member of this organization"}, 403, origin)
+            return
+
+        limit = self.flask_app.config["EVENTS_BACKLOG_LIMIT"]
+        last_id = parse_last_event_id(headers.get("last-event-id"), params.get("lastEventId"))
+        # Subscribe before reading the backlog so nothing committed in between is lost.
+        subscriber = await self.events.subscribe(org_id)
+        try:
+            frames, sent = [retry_frame(RETRY_MS)], set()
+            if last_id is not None:
+                async with self.sessionmaker() as session:
+                    latest = await session.scalar(latest_id_query())
+                    oldest = await session.scalar(oldest_id_query())
+                    backlog = (await session.execute(backlog_query(org_id, last_id, limit))).all()
+                replayed, sent = replay(last_id, latest, oldest, backlog, limit)
+                frames += replayed
+            response_headers = [
+                ("Content-Type", "text/event-stream"),
+                ("Cache-Control", "no-cache"),
+                ("X-Accel-Buffering", "no"),
+                ("Vary", "Origin"),
+            ]
+            raw_headers = [
+                (k.lower().encode("latin-1"), v.encode("latin-1"))
+                for k, v in response_headers + self.cors.response_headers(origin)
+            ]
+            await send({"type": "http.response.start", "status": 200, "headers": raw_headers})
+            await send({"type": "http.response.body", "body": b"".join(frames), "more_body": True})
+            await self._pump(subscriber, sent, receive, send)
+        finally:
+            self.events.unsubscribe(org_id, subscriber)
+
+    async def _pump(self, subscriber, sent: set[int], receive, send) -> None:
+        heartbeat = self.flask_app.config["EVENTS_HEARTBEAT_SECONDS"]
+        disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+        try:
+            while not subscriber.overflowed:
+                get = asyncio.ensure_future(subscriber.queue.get())
+                done, _ = await asyncio.wait({get, disconnected}, timeout=heartbeat,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if get not in done:
+                    get.cancel()
+                    if disconnected in done:
+                        return
+                    body = HEARTBEAT
+                else:
+                    items = [get.result()]
+                    while not subscriber.queue.empty():
+                        items.append(subscriber.queue.get_nowait())
+                    if None in items:
+                        break
+                    body = b"".join(frame for event_id, frame in items if event_id not in sent)
+                    if not body:
+                        continue
+                await send({"type": "http.response.body", "body": body, "more_body": True})
+            # Overflowed or shutting down: end the stream; the client resumes by id.
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            disconnected.cancel()
+
+    def _authenticate(self, authorization: str | None) -> tuple[str | None, Payload | None]:
+        """Validate the bearer token the same way ``@jwt_required()`` does."""
+        if not authorization:
+            return None, ({"msg": "Missing Authorization Header"}, 401)
+        scheme, _, token = authorization.partition(" ")
+        if scheme != "Bearer" or not token:
+            return None, ({"msg": "Bad Authorization header. Expected 'Authorization: Bearer <JWT>'"}, 422)
+        try:
+            with self.flask_app.app_context():
+                claims = decode_token(token)
+        except ExpiredSignatureError:
+            return None, ({"msg": "Token has expired"}, 401)
+        except InvalidTokenError as err:
+            return None, ({"msg": str(err)}, 422)
+        if claims.get("type") != "access":
+            return None, ({"msg": "Only non-refresh tokens are allowed"}, 422)
+        return claims["sub"], None
+
+    async def _respond(self, send, payload: dict[str, Any], status: int, origin: str | None) -> None:
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        headers = [
+            ("Content-Type", "application/json"),
+            ("Content-Length", str(len(body))),
+            ("Vary", "Origin"),
+        ]
+        await self._send(send, status, headers + self.cors.response_headers(origin), body)
+
+    async def _send(self, send, status: int, headers: list[tuple[str, str]], body: bytes) -> None:
+        raw_headers = [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers]
+        await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def me(self, session: AsyncSession, user_id: str, params: dict[str, str]) -> Payload:
+        user = await session.get(User, user_id)
+        if not user:
+            return {"message": "User not found"}, 404
+        rows = await session.execute(
+            select(OrganizationMember, Organization)
+            .join(Organization, OrganizationMember.organization_id == Organization.id)
+            .filter(OrganizationMember.user_id == user.id, OrganizationMember.status == "active")
+        )
+        orgs = [
+            {
+                "id": org.id,
+                "name": org.name,
+                "slug": org.slug,
+                "role": m.role,
+                "teams": m.teams or [],
+            }
+            for m, org in rows
+        ]
+        return {"user": _user_response(user), "memberships": orgs}, 200
+
+    async def list_tasks(self, session: AsyncSession, user_id: str, params: dict[str, str]) -> Payload:
+        stmt = select(Task)
+        if params.get("organizationId"):
+            stmt = stmt.filter_by(organization_id=params["organizationId"])
+        tasks = (await session.scalars(stmt.order_by(Task.created_at.desc()))).all()
+        subtasks = group(await session.execute(subtasks_query(params.get("organizationId") or None))) if tasks else {}
+        return {"tasks": [_task_to_dict(t, subtasks.get(t.id)) for t in tasks]}, 200
+
+    async def list_projects(self, session: AsyncSession, user_id: str, params: dict[str, str]) -> Payload:
+        if params.get("include") == "stats":
+            rows = (await session.execute(projects_with_stats_query(params.get("organizationId")))).all()
+            return {"projects": [{**_project_to_dict(row.Project), "stats": stats_to_dict(row)} for row in rows]}, 200
+        stmt = select(Project)
+        if params.get("organizationId"):
+            stmt = stmt.filter_by(organization_id=params["organizationId"])
+        projects = await session.scalars(stmt.order_by(Project.created_at.desc()))
+        return {"projects": [_project_to_dict(p) for p in projects]}, 200
+
+    async def list_phases(self, session: AsyncSession, user_id: str, params: dict[str, str]) -> Payload:
+        stmt = select(RoadmapPhase)
+        if params.get("organizationId"):
+            stmt = stmt.filter_by(organization_id=params["organizationId"])
+        phases = await session.scalars(
+            stmt.order_by(RoadmapPhase.order_index.asc(), RoadmapPhase.created_at.asc())
+        )
+        return {"phases": [_phase_to_dict(p) for p in phases]}, 200
+
+    async def list_milestones(self, session: AsyncSession, user_id: str, params: dict[str, str]) -> Payload:
+        stmt = select(RoadmapMilestone)
+        if params.get("organizationId"):
+            stmt = stmt.filter_by(organization_id=params["organizationId"])
+        milestones = await session.scalars(stmt.order_by(RoadmapMilestone.week.asc().nulls_last()))
+        return {"milestones": [_milestone_to_dict(m) for m in milestones]}, 200
+
+
+async def _wait_for_disconnect(receive) -> None:
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+def create_asgi_app(flask_app: Flask | None = None) -> AsyncReadApp:
+    """ASGI counterpart of :func:`app.create_app`."""
+    return AsyncReadApp(flask_app or create_app())
@@ -0,0 +1,178 @@
+"""Execution of ``/api/batch`` sub-requests.
+
+Each sub-request is dispatched through the app's normal routing in its own
+request context, carrying the batch's ``Authorization`` header, so route
+decorators, error handlers, metrics and query budgets apply exactly as for
+a direct call. What a separate HTTP request would pay again is shared
+instead:
+
+- the environ is a copy of the batch request's with the method, path, body
+  and headers replaced, rather than one built from scratch;
+- the batch's token, already verified by ``/api/batch`` itself, is not
+  decoded again (``extensions.verified_tokens``); ``jwt_required`` still
+  checks its type and freshness for each sub-request;
+- sub-requests run in one app context and reuse its session, which is
+  closed after each one so every sub-request still commits or rolls back
+  on its own and starts from a clean identity map.
+
+Sub-requests run in order. Consecutive ``GET``s are independent reads and
+run concurrently on a small thread pool (``BATCH_MAX_WORKERS``), each with
+an app context of its own, except on SQLite, where the reads would only
+contend for the GIL and the pool's handoff makes them slower; any other
+method waits for the reads before it and runs alone, so a read listed
+after a write sees that write.
+"""
+from __future__ import annotations
+
+import inspect
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Any
+from urllib.parse import unquote_to_bytes
+
+from flask import Flask, Response, jsonify
+
+from .extensions import db, verified_tokens
+from .schemas.batch import SubRequestSchema
+
+logger = logging.getLogger(__name__)
+
+# Headers a sub-request may not set itself; auth always comes from the batch.
+_BLOCKED_HEADERS = frozenset({"authorization", "cookie", "host", "content-length"})
+# Response headers worth passing back to the client.
+_RETURNED_HEADERS = ("ETag", "Location", "X-Cache", "Content-Type")
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def _pool(workers: int) -> ThreadPoolExecutor:
+    # Created on first use, so a preloaded gunicorn master never owns threads.
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch")
+    return _executor
+
+
+def check_path(path: str) -> str | None:
+    """Why ``path`` cannot be batched, or ``None`` if it can."""
+    if not path.startswith("/api/"):
+        return "path must start with /api/"
+    if path.split("?", 1)[0].rstrip("/") == "/api/batch":
+        return "batches cannot be nested"
+    return None
+
+
+def run_batch(app: Flask, requests: list[SubRequestSchema], environ: dict[str, Any],
+              claims: dict[str, Any] | None = None) -> list[dict[str, Any]]:
+    """Run sub-requests in order, reads concurrently; one result per request.
+
+    ``environ`` is the batch request's; ``claims`` its verified JWT.
+    """
+    workers = app.config["BATCH_MAX_WORKERS"]
+    concurrent = workers > 1 and db.engine.dialect.name != "sqlite"
+    results: list[dict[str, Any]] = []
+    reads: list[SubRequestSchema] = []
+    verified: dict[str, dict] = {}
+    token = _bearer_token(environ.get("HTTP_AUTHORIZATION"))
+    if token and claims:
+        verified[token] = claims
+
+    def run(sub: SubRequestSchema) -> dict[str, Any]:
+        return _run_one(app, sub, environ, verified)
+
+    def run_on_pool(sub: SubRequestSchema) -> dict[str, Any]:
+        with app.app_context():
+            return run(sub)
+
+    def flush_reads() -> None:
+        if len(reads) > 1 and concurrent:
+            results.extend(_pool(workers).map(run_on_pool, reads))
+        else:
+            results.extend(run(sub) for sub in reads)
+        reads.clear()
+
+    with app.app_context():
+        for sub in requests:
+            if sub.method == "GET":
+                reads.append(sub)
+                continue
+            flush_reads()
+            results.append(run(sub))
+        flush_reads()
+    return results
+
+
+def _bearer_token(authorization: str | None) -> str | None:
+    scheme, _, token = (authorization or "").partition(" ")
+    return token.strip() if scheme == "Bearer" and token.strip() else None
+
+
+def _environ(base: dict[str, Any], sub: SubRequestSchema) -> dict[str, Any]:
+    """The batch request's environ with ``sub``'s method, path, body and headers."""
+    path, _, query = sub.path.partition("?")
+    body = b"" if sub.body is None else json.dumps(sub.body).encode()
+    environ = {
+        key: value for key, value in base.items()
+        if not key.startswith(("HTTP_", "werkzeug.")) and key not in ("CONTENT_TYPE", "CONTENT_LENGTH")
+    }
+    environ.update({
+        "REQUEST_METHOD": sub.method,
+        "PATH_INFO": unquote_to_bytes(path).decode("latin-1"),
+        "QUERY_STRING": query,
+        "wsgi.input": BytesIO(body),
+        "CONTENT_LENGTH": str(len(body)),
+    })
+    for name in ("HTTP_HOST", "HTTP_AUTHORIZATION"):
+        if name in base:
+            environ[name] = base[name]
+    if sub.body is not None:
+        environ["CONTENT_TYPE"] = "application/json"
+    for name, value in (sub.headers or {}).items():
+        if name.lower() in _BLOCKED_HEADERS:
+            continue
+        key = name.upper().replace("-", "_")
+        environ[key if key == "CONTENT_TYPE" else f"HTTP_{key}"] = value
+    return environ
+
+
+def _run_one(app: Flask, sub: SubRequestSchema, base: dict[str, Any], verified: dict[str, dict]) -> dict[str, Any]:
+    """Dispatch ``sub`` in the current app context."""
+    error = check_path(sub.path)
+    if error is not None:
+        return _result(sub, 400, {"message": error})
+    token = verified_tokens.set(verified)
+    try:
+        with app.request_context(_environ(base, sub)):
+            try:
+                response = app.full_dispatch_request()
+            except Exception:  # noqa: BLE001 - one failed sub-request must not fail the batch
+                logger.exception("Batch sub-request %s %s failed", sub.method, sub.path)
+                response = jsonify({"message": "Internal server error"})
+                response.status_code = 500
+            # Generator bodies (exports, event streams) may never end; refuse them.
+            if inspect.isgenerator(response.response):
+                response.close()
+                return _result(sub, 400, {"message": "Streaming endpoints cannot be batched"})
+            return _result(sub, response.status_code, _body(response), response)
+    finally:
+        verified_tokens.reset(token)
+        # What the request teardown would do: nothing uncommitted carries over.
+        db.session.close()
+
+
+def _body(response: Response) -> Any:
+    if response.is_json:
+        return response.get_json(silent=True)
+    data = response.get_data(as_text=True)
+    return data or None
+
+
+def _result(sub: SubRequestSchema, status: int, body: Any, response: Response | None = None) -> dict[str, Any]:
+    result: dict[str, Any] = {"status": status, "body": body}
+    if sub.id is not None:
+        result["id"] = sub.id
+    if response is not None:
+        result["headers"] = {name: response.headers[name] for name in _RETURNED_HEADERS if name in response.headers}
+    return result
@@ -0,0 +1,66 @@
+from functools import wraps
+
+from flask import Blueprint, Response, current_app, jsonify, request, send_file
+from flask_jwt_extended import get_jwt_identity, jwt_required
+
+from ..models import User
+from ..profiling import list_profiles, profile_dir, profile_path, render_stats
+
+admin_bp = Blueprint("admin", __name__)
+
+
+def is_admin(user_id: str | None) -> bool:
+    """Operators are listed by email in ``ADMIN_EMAILS``."""
+    admins = current_app.config.get("ADMIN_EMAILS") or []
+    if not user_id or not admins:
+        return False
+    user = User.query.get(user_id)
+    return bool(user and user.email in admins)
+
+
+def admin_required(view):
+    @wraps(view)
+    @jwt_required()
+    def wrapper(*args, **kwargs):
+        if not is_admin(get_jwt_identity()):
+            return jsonify({"message": "Admin access required"}), 403
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+@admin_bp.get("/slow-queries")
+@admin_required
+def list_slow_queries():
+    log = current_app.extensions.get("slow_queries")
+    if log is None:
+        return jsonify({"enabled": False, "queries": []}), 200
+    limit = request.args.get("limit", default=50, type=int)
+    return jsonify({
+        "enabled": True,
+        "thresholdMs": current_app.config["SLOW_QUERY_MS"],
+        "queries": log.entries(limit),
+    }), 200
+
+
+@admin_bp.get("/profiles")
+@admin_required
+def list_request_profiles():
+    return jsonify({"profiles": list_profiles(profile_dir(current_app))}), 200
+
+
+@admin_bp.get("/profiles/<profile_id>")
+@admin_required
+def get_request_profile(profile_id: str):
+    path = profile_path(profile_dir(current_app), profile_id)
+    if path is None:
+        return jsonify({"message": "Profile not found"}), 404
+    if request.args.get("download"):
+        return send_file(path, mimetype="application/octet-stream", as_attachment=True)
+    sort = request.args.get("sort", "cumulative")
+    limit = request.args.get("limit", default=40, type=int)
+    try:
+        text = render_stats(path, sort, limit)
+    except KeyError:
+        return jsonify({"message": f"Unknown sort key {sort!r}"}), 400
+    return Response(text, mimetype="text/plain")
@@ -7,9 +7,11 @@ from flask_jwt_extended import (
     get_jwt_identity,
     jwt_required,
 )
+from sqlalchemy.orm import joinedload
 
 from ..extensions import db
 from ..models import OrganizationMember, User
+from ..query_budget import query_budget
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -75,13 +77,18 @@ def refresh_token():
 
 @auth_bp.get("/me")
 @jwt_required()
+@query_budget(2)
 def me():
     user_id = get_jwt_identity()
     user = User.query.get(user_id)
     if not user:
         return jsonify({"message": "User not found"}), 404
 
-    memberships = OrganizationMember.query.filter_by(user_id=user.id, status="active").all()
+    memberships = (
+        OrganizationMember.query.options(joinedload(OrganizationMember.organization))
+        .filter_by(user_id=user.id, status="active")
+        .all()
+    )
     orgs = [
         {
             "id": m.organization.id,
@@ -0,0 +1,31 @@
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import get_jwt, jwt_required
+
+batch_bp = Blueprint("batch", __name__)
+
+
+@batch_bp.post("")
+@jwt_required()
+def run_batch():
+    """Run several API calls in one round trip.
+
+    Body: ``{"requests": [{"id": "phases", "method": "GET", "path":
+    "/api/roadmap/phases?organizationId=..."}, ...]}``, at most
+    ``BATCH_MAX_REQUESTS``. Returns ``{"responses": [...]}`` in the same
+    order, each with ``id``, ``status``, ``headers`` and ``body``.
+    """
+    from pydantic import ValidationError
+
+    from ..batch import run_batch as run
+    from ..schemas.batch import BatchSchema
+
+    try:
+        data = BatchSchema.model_validate(request.get_json(force=True) or {})
+    except ValidationError as err:
+        return jsonify({"message": "Invalid payload", "errors": err.errors()}), 400
+    limit = current_app.config["BATCH_MAX_REQUESTS"]
+    if len(data.requests) > limit:
+        return jsonify({"message": f"At most {limit} requests per batch"}), 400
+
+    responses = run(current_app._get_current_object(), data.requests, request.environ, get_jwt())
+    return jsonify({"responses": responses}), 200
@@ -1,5 +1,8 @@
 from flask import Blueprint, jsonify
 
+from ..database import pool_stats
+from ..extensions import db
+
 health_bp = Blueprint("health", __name__)
 
 
@@ -11,3 +14,8 @@ def health_check():
 @health_bp.get("/cors-test")
 def cors_test():
     return jsonify({"message": "CORS is working"}), 200
+
+
+@health_bp.get("/pool")
+def pool_status():
+    return jsonify({"pool": pool_stats.snapshot(db.engine)}), 200
@@ -0,0 +1,111 @@
+from flask import Blueprint, current_app, jsonify, request, send_from_directory
+from flask_jwt_extended import get_jwt_identity, jwt_required
+
+from ..extensions import db
+from ..models import Job, OrganizationMember
+from ..rbac import has_permission
+
+jobs_bp = Blueprint("jobs", __name__)
+
+
+def _job_to_dict(job: Job):
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "organizationId": job.organization_id,
+        "createdBy": job.created_by,
+        "status": job.status,
+        "progress": job.progress,
+        "total": job.total,
+        "message": job.message,
+        "result": job.result,
+        "error": job.error,
+        "attempts": job.attempts,
+        "maxAttempts": job.max_attempts,
+        "cancelRequested": job.cancel_requested,
+        "runAt": job.run_at.isoformat() if job.run_at else None,
+        "createdAt": job.created_at.isoformat() if job.created_at else None,
+        "startedAt": job.started_at.isoformat() if job.started_at else None,
+        "finishedAt": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def job_accepted(job: Job):
+    """202 response for a newly enqueued job, pointing at its status URL."""
+    response = jsonify({"job": _job_to_dict(job)})
+    response.status_code = 202
+    response.headers["Location"] = f"/api/jobs/{job.id}"
+    return response
+
+
+def _get_visible_job(job_id: str):
+    """The job if the caller created it or administers its org, else None."""
+    job = db.session.get(Job, job_id)
+    if job is None:
+        return None
+    user_id = get_jwt_identity()
+    if job.created_by == user_id:
+        return job
+    if job.organization_id:
+        membership = OrganizationMember.query.filter_by(
+            organization_id=job.organization_id, user_id=user_id, status="active"
+        ).first()
+        if membership and has_permission(membership.role, membership.teams or [], "organization", "read"):
+            return job
+    return None
+
+
+@jobs_bp.get("/")
+@jwt_required()
+def list_jobs():
+    """The caller's most recent jobs, optionally by ``organizationId``/``status``."""
+    query = Job.query.filter_by(created_by=get_jwt_identity())
+    if request.args.get("organizationId"):
+        query = query.filter_by(organization_id=request.args["organizationId"])
+    if request.args.get("status"):
+        query = query.filter_by(status=request.args["status"])
+    limit = min(request.args.get("limit", 50, type=int), 200)
+    jobs = query.order_by(Job.created_at.desc()).limit(limit).all()
+    return jsonify({"jobs": [_job_to_dict(j) for j in jobs]}), 200
+
+
+@jobs_bp.get("/<job_id>")
+@jwt_required()
+def get_job(job_id: str):
+    job = _get_visible_job(job_id)
+    if job is None:
+        return jsonify({"message": "Job not found"}), 404
+    return jsonify({"job": _job_to_dict(job)}), 200
+
+
+@jobs_bp.post("/<job_id>/cancel")
+@jwt_required()
+def cancel_job(job_id: str):
+    """Cancel a queued job, or ask a running one to stop at its next progress update."""
+    from ..jobs import cancel
+
+    job = _get_visible_job(job_id)
+    if job is None:
+        return jsonify({"message": "Job not found"}), 404
+    if not cancel(job.id):
+        return jsonify({"message": f"Job already {job.status}", "job": _job_to_dict(job)}), 409
+    db.session.refresh(job)
+    return jsonify({"job": _job_to_dict(job)}), 202
+
+
+@jobs_bp.get("/<job_id>/download")
+@jwt_required()
+def download_job_result(job_id: str):
+    from ..jobs import output_dir
+
+    job = _get_visible_job(job_id)
+    if job is None:
+        return jsonify({"message": "Job not found"}), 404
+    if job.status != "succeeded" or not (job.result or {}).get("file"):
+        return jsonify({"message": "Job has no file to download"}), 409
+    return send_from_directory(
+        output_dir(current_app),
+        job.result["file"],
+        mimetype=job.result.get("mimetype"),
+        as_attachment=True,
+    )
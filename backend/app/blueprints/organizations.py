@@ -1,12 +1,15 @@
 import re
+import time
 from datetime import datetime
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
 from flask_jwt_extended import get_jwt_identity, jwt_required
+from sqlalchemy.orm import contains_eager
 
 from ..extensions import db
 from ..models import Organization, OrganizationMember, User
-from ..rbac import SYSTEM_ROLES
+from ..query_budget import query_budget
+from ..rbac import SYSTEM_ROLES, has_permission
 
 organizations_bp = Blueprint("organizations", __name__)
 
@@ -32,11 +35,13 @@ def _default_settings():
 
 @organizations_bp.get("/")
 @jwt_required()
+@query_budget(1)
 def list_organizations():
     user_id = get_jwt_identity()
     memberships = (
         OrganizationMember.query.filter_by(user_id=user_id, status="active")
         .join(Organization)
+        .options(contains_eager(OrganizationMember.organization))
         .all()
     )
     data = []
@@ -113,3 +118,184 @@ def create_organization():
         ),
         201,
     )
+
+
+@organizations_bp.get("/<org_id>/export")
+@jwt_required()
+def export_organization(org_id: str):
+    """Stream the org's teams, projects, phases, milestones and tasks.
+
+    ``format=ndjson|csv`` (CSV needs ``resource``), ``gzip=1`` to compress,
+    and ``resource`` + ``after`` to resume from the last exported record.
+    """
+    from ..org_export import FORMATS, csv_lines, encode, export_plan, iter_records, ndjson_lines
+
+    membership = OrganizationMember.query.filter_by(
+        organization_id=org_id, user_id=get_jwt_identity(), status="active"
+    ).first()
+    if not membership or not has_permission(membership.role, membership.teams or [], "organization", "read"):
+        return jsonify({"message": "Not allowed to export this organization"}), 403
+
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in FORMATS:
+        return jsonify({"message": f"format must be one of: {', '.join(FORMATS)}"}), 400
+    resource = request.args.get("resource")
+    if fmt == "csv" and not resource:
+        return jsonify({"message": "CSV exports need a resource"}), 400
+    try:
+        resources = export_plan(resource, single=fmt == "csv")
+    except ValueError as err:
+        return jsonify({"message": str(err)}), 400
+    gzip = request.args.get("gzip") == "1"
+
+    records = iter_records(org_id, resources, after=request.args.get("after"))
+    lines = csv_lines(records) if fmt == "csv" else ndjson_lines(records)
+    filename = f"{org_id}-{resource or 'all'}.{fmt}" + (".gz" if gzip else "")
+    mimetype = "application/gzip" if gzip else ("text/csv" if fmt == "csv" else "application/x-ndjson")
+    return Response(
+        stream_with_context(encode(lines, gzip=gzip)),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@organizations_bp.post("/<org_id>/export")
+@jwt_required()
+def enqueue_export(org_id: str):
+    """Run the export as a background job; download the file from the job when done.
+
+    Takes the same ``format``/``resource``/``gzip`` options, as query
+    parameters or a JSON body.
+    """
+    from ..jobs import enqueue
+    from ..org_export import FORMATS, export_plan
+    from .jobs import job_accepted
+
+    membership = OrganizationMember.query.filter_by(
+        organization_id=org_id, user_id=get_jwt_identity(), status="active"
+    ).first()
+    if not membership or not has_permission(membership.role, membership.teams or [], "organization", "read"):
+        return jsonify({"message": "Not allowed to export this organization"}), 403
+
+    options = {**request.args.to_dict(), **(request.get_json(silent=True) or {})}
+    fmt = options.get("format", "ndjson")
+    if fmt not in FORMATS:
+        return jsonify({"message": f"format must be one of: {', '.join(FORMATS)}"}), 400
+    resource = options.get("resource")
+    if fmt == "csv" and not resource:
+        return jsonify({"message": "CSV exports need a resource"}), 400
+    try:
+        export_plan(resource, single=fmt == "csv")
+    except ValueError as err:
+        return jsonify({"message": str(err)}), 400
+    gzip = options.get("gzip") in ("1", 1, True)
+
+    job = enqueue(
+        "export-org",
+        {"format": fmt, "resource": resource, "gzip": gzip},
+        organization_id=org_id,
+        created_by=get_jwt_identity(),
+    )
+    return job_accepted(job)
+
+
+@organizations_bp.get("/<org_id>/activity")
+@jwt_required()
+@query_budget(2)
+def org_activity(org_id: str):
+    """Task history of the org, newest first (``order=asc`` for oldest first).
+
+    Filters: ``taskId``, ``actorId``, ``since``/``until`` (ISO datetimes on
+    ``occurredAt``). Pages hold ``limit`` events (default 50, at most 200);
+    pass ``nextCursor`` back as ``cursor`` for the next one.
+    """
+    from pydantic import ValidationError
+
+    from ..schemas.task import ActivityQuerySchema
+    from ..task_activity import decode_cursor, encode_cursor, event_to_dict, feed_query
+
+    try:
+        query = ActivityQuerySchema.model_validate(request.args.to_dict())
+        cursor = decode_cursor(query.cursor) if query.cursor else None
+    except ValidationError as err:
+        return jsonify({"message": "Invalid query", "errors": err.errors(include_url=False)}), 400
+    except ValueError as err:
+        return jsonify({"message": str(err)}), 400
+    membership = OrganizationMember.query.filter_by(
+        organization_id=org_id, user_id=get_jwt_identity(), status="active"
+    ).first()
+    if not membership:
+        return jsonify({"message": "Not a member of this organization"}), 403
+
+    rows = db.session.execute(feed_query(
+        org_id,
+        query.limit,
+        task_id=query.taskId,
+        actor_id=query.actorId,
+        since=query.since,
+        until=query.until,
+        cursor=cursor,
+        newest_first=query.order == "desc",
+    )).all()
+    page = rows[:query.limit]
+    next_cursor = encode_cursor(page[-1]) if len(rows) > query.limit else None
+    return jsonify({"events": [event_to_dict(row) for row in page], "nextCursor": next_cursor}), 200
+
+
+@organizations_bp.get("/<org_id>/events")
+@jwt_required(locations=["headers", "query_string"])
+def organization_events(org_id: str):
+    """Server-Sent Events of the org's task, phase, milestone and team changes.
+
+    EventSource cannot set headers, so the token may also be sent as
+    ``?jwt=``. Resumes after ``Last-Event-ID`` (or ``?lastEventId=``). Each
+    stream holds a worker thread here, so it ends after
+    ``EVENTS_WSGI_STREAM_SECONDS`` and the browser reconnects; the ASGI mode
+    serves this URL from a shared hub instead.
+    """
+    from ..org_events import (
+        GAP_TIMEOUT, HEARTBEAT, LOG_BATCH, RETRY_MS, Cursor, backlog_query, latest_id_query, oldest_id_query,
+        parse_last_event_id, replay, retry_frame, to_frame,
+    )
+
+    membership = OrganizationMember.query.filter_by(
+        organization_id=org_id, user_id=get_jwt_identity(), status="active"
+    ).first()
+    if not membership:
+        return jsonify({"message": "Not a member of this organization"}), 403
+    config = current_app.config
+    last_id = parse_last_event_id(request.headers.get("Last-Event-ID"), request.args.get("lastEventId"))
+
+    def generate():
+        yield retry_frame(RETRY_MS)
+        cursor = Cursor(db.session.execute(latest_id_query()).scalar(), GAP_TIMEOUT)
+        sent: set[int] = set()
+        if last_id is not None:
+            backlog = db.session.execute(backlog_query(org_id, last_id, config["EVENTS_BACKLOG_LIMIT"])).all()
+            oldest = db.session.execute(oldest_id_query()).scalar()
+            frames, sent = replay(last_id, cursor.position, oldest, backlog, config["EVENTS_BACKLOG_LIMIT"])
+            yield b"".join(frames)
+        deadline = time.monotonic() + config["EVENTS_WSGI_STREAM_SECONDS"]
+        quiet_since = time.monotonic()
+        while time.monotonic() < deadline:
+            # Only this org's rows, from the (organization_id, id) index. Other
+            # orgs' ids look like gaps to the cursor, which skips each one
+            # GAP_TIMEOUT after it showed up, as it does for uncommitted ids.
+            rows = db.session.execute(backlog_query(org_id, cursor.position, LOG_BATCH)).all()
+            # Release the connection (and the read snapshot) between polls.
+            db.session.close()
+            frames = [to_frame(row) for row in cursor.advance(rows) if row.id not in sent]
+            if frames:
+                yield b"".join(frames)
+                quiet_since = time.monotonic()
+            elif time.monotonic() - quiet_since >= config["EVENTS_HEARTBEAT_SECONDS"]:
+                yield HEARTBEAT
+                quiet_since = time.monotonic()
+            if len(rows) < LOG_BATCH:
+                time.sleep(config["EVENTS_POLL_INTERVAL"])
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
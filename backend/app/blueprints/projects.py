@@ -3,6 +3,10 @@ from flask_jwt_extended import get_jwt_identity, jwt_required
 
 from ..extensions import db
 from ..models import Project
+from ..partial_update import patch_values, update_returning
+from ..query_budget import query_budget
+from ..response_cache import cached
+from ..versioning import check_if_match, expected_version, versioned
 
 projects_bp = Blueprint("projects", __name__)
 
@@ -19,13 +23,30 @@ def _project_to_dict(project: Project):
         "createdBy": project.created_by,
         "createdAt": project.created_at.isoformat(),
         "updatedAt": project.updated_at.isoformat(),
+        "version": project.version,
     }
 
 
+def _stats_day() -> str:
+    """Today for ``include=stats``, whose "overdue" counts depend on it."""
+    from ..project_stats import current_day
+
+    return current_day().isoformat() if request.args.get("include") == "stats" else ""
+
+
 @projects_bp.get("/")
 @jwt_required()
+@cached("projects", vary_on=_stats_day)
+@query_budget(1)
 def list_projects():
+    """Projects, newest first. ``include=stats`` adds each one's task rollup (same single query)."""
     org_id = request.args.get("organizationId")
+    if request.args.get("include") == "stats":
+        from ..project_stats import projects_with_stats_query, stats_to_dict
+
+        rows = db.session.execute(projects_with_stats_query(org_id)).all()
+        projects = [{**_project_to_dict(row.Project), "stats": stats_to_dict(row)} for row in rows]
+        return jsonify({"projects": projects}), 200
     query = Project.query
     if org_id:
         query = query.filter_by(organization_id=org_id)
@@ -55,25 +76,56 @@ def create_project():
     )
     db.session.add(project)
     db.session.commit()
-    return jsonify({"project": _project_to_dict(project)}), 201
+    return versioned({"project": _project_to_dict(project)}, project.version, 201)
 
 
 @projects_bp.put("/<project_id>")
 @jwt_required()
 def update_project(project_id: str):
     project = Project.query.get_or_404(project_id)
+    check_if_match(project.version)
     payload = request.get_json(force=True) or {}
     for field in ["name", "key", "description", "visibility", "status", "organization_id"]:
         if field in payload:
             setattr(project, field, payload[field])
     db.session.commit()
-    return jsonify({"project": _project_to_dict(project)}), 200
+    return versioned({"project": _project_to_dict(project)}, project.version)
+
+
+_PROJECT_PATCH_FIELDS = {
+    "organizationId": "organization_id",
+    "name": "name",
+    "key": "key",
+    "description": "description",
+    "visibility": "visibility",
+    "status": "status",
+}
+
+
+@projects_bp.patch("/<project_id>")
+@jwt_required()
+def patch_project(project_id: str):
+    from pydantic import ValidationError
+
+    from ..schemas.project import ProjectUpdateSchema
+
+    payload = request.get_json(force=True) or {}
+    try:
+        data = ProjectUpdateSchema.model_validate(payload)
+        values = patch_values(Project.__table__, data, _PROJECT_PATCH_FIELDS)
+    except ValidationError as err:
+        return jsonify({"message": "Invalid payload", "errors": err.errors()}), 400
+    except ValueError as err:
+        return jsonify({"message": str(err)}), 400
+    row = update_returning(Project.__table__, project_id, values, expected_version())
+    return versioned({"project": _project_to_dict(row)}, row.version)
 
 
 @projects_bp.delete("/<project_id>")
 @jwt_required()
 def delete_project(project_id: str):
     project = Project.query.get_or_404(project_id)
+    check_if_match(project.version)
     project.status = "archived"
     db.session.commit()
     return jsonify({"message": "Archived"}), 204
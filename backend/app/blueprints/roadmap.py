@@ -3,6 +3,10 @@ from flask_jwt_extended import jwt_required
 
 from ..extensions import db
 from ..models import RoadmapMilestone, RoadmapPhase
+from ..partial_update import patch_values, update_returning
+from ..query_budget import query_budget
+from ..response_cache import cached
+from ..versioning import check_if_match, expected_version, versioned
 
 roadmap_bp = Blueprint("roadmap", __name__)
 
@@ -18,6 +22,7 @@ def _phase_to_dict(phase: RoadmapPhase):
         "orderIndex": phase.order_index,
         "createdAt": phase.created_at.isoformat(),
         "updatedAt": phase.updated_at.isoformat(),
+        "version": phase.version,
     }
 
 
@@ -31,11 +36,14 @@ def _milestone_to_dict(milestone: RoadmapMilestone):
         "week": milestone.week,
         "createdAt": milestone.created_at.isoformat(),
         "updatedAt": milestone.updated_at.isoformat(),
+        "version": milestone.version,
     }
 
 
 @roadmap_bp.get("/phases")
 @jwt_required()
+@cached("phases")
+@query_budget(1)
 def list_phases():
     org_id = request.args.get("organizationId")
     query = RoadmapPhase.query
@@ -63,25 +71,56 @@ def create_phase():
     )
     db.session.add(phase)
     db.session.commit()
-    return jsonify({"phase": _phase_to_dict(phase)}), 201
+    return versioned({"phase": _phase_to_dict(phase)}, phase.version, 201)
 
 
 @roadmap_bp.put("/phases/<phase_id>")
 @jwt_required()
 def update_phase(phase_id: str):
     phase = RoadmapPhase.query.get_or_404(phase_id)
+    check_if_match(phase.version)
     payload = request.get_json(force=True) or {}
     for field in ["name", "description", "start_week", "end_week", "order_index", "organization_id"]:
         if field in payload:
             setattr(phase, field, payload[field])
     db.session.commit()
-    return jsonify({"phase": _phase_to_dict(phase)}), 200
+    return versioned({"phase": _phase_to_dict(phase)}, phase.version)
+
+
+_PHASE_PATCH_FIELDS = {
+    "organizationId": "organization_id",
+    "name": "name",
+    "description": "description",
+    "startWeek": "start_week",
+    "endWeek": "end_week",
+    "orderIndex": "order_index",
+}
+
+
+@roadmap_bp.patch("/phases/<phase_id>")
+@jwt_required()
+def patch_phase(phase_id: str):
+    from pydantic import ValidationError
+
+    from ..schemas.roadmap import PhaseUpdateSchema
+
+    payload = request.get_json(force=True) or {}
+    try:
+        data = PhaseUpdateSchema.model_validate(payload)
+        values = patch_values(RoadmapPhase.__table__, data, _PHASE_PATCH_FIELDS)
+    except ValidationError as err:
+        return jsonify({"message": "Invalid payload", "errors": err.errors()}), 400
+    except ValueError as err:
+        return jsonify({"message": str(err)}), 400
+    row = update_returning(RoadmapPhase.__table__, phase_id, values, expected_version())
+    return versioned({"phase": _phase_to_dict(row)}, row.version)
 
 
 @roadmap_bp.delete("/phases/<phase_id>")
 @jwt_required()
 def delete_phase(phase_id: str):
     phase = RoadmapPhase.query.get_or_404(phase_id)
+    check_if_match(phase.version)
     db.session.delete(phase)
     db.session.commit()
     return jsonify({"message": "Deleted"}), 204
@@ -89,6 +128,8 @@ def delete_phase(phase_id: str):
 
 @roadmap_bp.get("/milestones")
 @jwt_required()
+@cached("milestones")
+@query_budget(1)
 def list_milestones():
     org_id = request.args.get("organizationId")
     query = RoadmapMilestone.query
@@ -115,25 +156,55 @@ def create_milestone():
     )
     db.session.add(milestone)
     db.session.commit()
-    return jsonify({"milestone": _milestone_to_dict(milestone)}), 201
+    return versioned({"milestone": _milestone_to_dict(milestone)}, milestone.version, 201)
 
 
 @roadmap_bp.put("/milestones/<milestone_id>")
 @jwt_required()
 def update_milestone(milestone_id: str):
     milestone = RoadmapMilestone.query.get_or_404(milestone_id)
+    check_if_match(milestone.version)
     payload = request.get_json(force=True) or {}
     for field in ["title", "description", "week", "phase_id", "organization_id"]:
         if field in payload:
             setattr(milestone, field, payload[field])
     db.session.commit()
-    return jsonify({"milestone": _milestone_to_dict(milestone)}), 200
+    return versioned({"milestone": _milestone_to_dict(milestone)}, milestone.version)
+
+
+_MILESTONE_PATCH_FIELDS = {
+    "organizationId": "organization_id",
+    "phaseId": "phase_id",
+    "title": "title",
+    "description": "description",
+    "week": "week",
+}
+
+
+@roadmap_bp.patch("/milestones/<milestone_id>")
+@jwt_required()
+def patch_milestone(milestone_id: str):
+    from pydantic import ValidationError
+
+    from ..schemas.roadmap import MilestoneUpdateSchema
+
+    payload = request.get_json(force=True) or {}
+    try:
+        data = MilestoneUpdateSchema.model_validate(payload)
+        values = patch_values(RoadmapMilestone.__table__, data, _MILESTONE_PATCH_FIELDS)
+    except ValidationError as err:
+        return jsonify({"message": "Invalid payload", "errors": err.errors()}), 400
+    except ValueError as err:
+        return jsonify({"message": str(err)}), 400
+    row = update_returning(RoadmapMilestone.__table__, milestone_id, values, expected_version())
+    return versioned({"milestone": _milestone_to_dict(row)}, row.version)
 
 
 @roadmap_bp.delete("/milestones/<milestone_id>")
 @jwt_required()
 def delete_milestone(milestone_id: str):
     milestone = RoadmapMilestone.query.get_or_404(milestone_id)
+    check_if_match(milestone.version)
     db.session.delete(milestone)
     db.session.commit()
     return jsonify({"message": "Deleted"}), 204
@@ -1,17 +1,25 @@
+import io
+import json
+import os
 from datetime import datetime
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
 from flask_jwt_extended import get_jwt_identity, jwt_required
-from pydantic import ValidationError
+from sqlalchemy import delete
+from sqlalchemy.orm.attributes import flag_modified
 
 from ..extensions import db
-from ..models import Task
-from ..schemas.task import TaskCreateSchema, TaskUpdateSchema
+from ..models import OrganizationMember, Subtask, Task
+from ..partial_update import patch_values, update_returning
+from ..query_budget import query_budget
+from ..response_cache import cached
+from ..versioning import check_if_match, expected_version, versioned
+from ..rbac import has_permission
 
 tasks_bp = Blueprint("tasks", __name__)
 
 
-def _task_to_dict(task: Task):
+def _task_to_dict(task: Task, subtasks: list | None = None):
     return {
         "id": task.id,
         "organizationId": task.organization_id,
@@ -30,35 +38,49 @@ def _task_to_dict(task: Task):
         "dependencies": task.dependencies or [],
         "tags": task.tags or [],
         "progress": task.progress,
-        "subtasks": task.subtasks or [],
+        "subtasks": subtasks or [],
+        "subtasksCompleted": task.subtasks_completed,
+        "subtasksTotal": task.subtasks_total,
         "blockedReason": task.blocked_reason,
         "createdBy": task.created_by,
         "completedAt": task.completed_at.isoformat() if task.completed_at else None,
         "createdAt": task.created_at.isoformat(),
         "updatedAt": task.updated_at.isoformat(),
+        "version": task.version,
     }
 
 
 @tasks_bp.get("/")
 @jwt_required()
+@cached("tasks")
+@query_budget(2)
 def list_tasks():
+    from ..subtasks import load_subtasks
+
     org_id = request.args.get("organizationId")
     query = Task.query
     if org_id:
         query = query.filter_by(organization_id=org_id)
     tasks = query.order_by(Task.created_at.desc()).all()
-    return jsonify({"tasks": [_task_to_dict(t) for t in tasks]}), 200
+    subtasks = load_subtasks(organization_id=org_id or None) if tasks else {}
+    return jsonify({"tasks": [_task_to_dict(t, subtasks.get(t.id)) for t in tasks]}), 200
 
 
 @tasks_bp.post("/")
 @jwt_required()
 def create_task():
+    from pydantic import ValidationError
+
+    from ..schemas.task import TaskCreateSchema
+    from ..subtasks import normalize, replace_subtasks, rollup_values
+
     user_id = get_jwt_identity()
     payload = request.get_json(force=True) or {}
     try:
         data = TaskCreateSchema.model_validate(payload)
-    } except ValidationError as err:
+    except ValidationError as err:
         return jsonify({"message": "Invalid payload", "errors": err.errors()}), 400
+    subtasks = normalize(data.subtasks or [])
 
     task = Task(
         organization_id=data.organizationId,
@@ -76,21 +98,104 @@ def create_task():
         assigned_to=data.assignedTo or [],
         dependencies=data.dependencies or [],
         tags=data.tags or [],
-        progress=data.progress or 0,
-        subtasks=[s.model_dump() for s in data.subtasks] if data.subtasks else [],
         blocked_reason=data.blockedReason,
         created_by=user_id,
         completed_at=_parse_datetime(data.completedAt),
+        **{"progress": data.progress or 0, **rollup_values(subtasks)},
     )
     db.session.add(task)
+    if subtasks:
+        db.session.flush()
+        replace_subtasks(task.id, subtasks)
     db.session.commit()
-    return jsonify({"task": _task_to_dict(task)}), 201
+    return versioned({"task": _task_to_dict(task, subtasks)}, task.version, 201)
+
+
+@tasks_bp.post("/import")
+@jwt_required()
+def import_tasks():
+    """Stream-import tasks from a CSV or NDJSON body (or a multipart ``file``).
+
+    With ``Accept: application/x-ndjson`` the response streams one progress
+    line per batch followed by the final summary. With ``async=1`` the file
+    is saved and imported by a background job instead (202 + job).
+    """
+    from ..task_import import FORMATS, TaskImporter, detect_format, iter_rows
+
+    user_id = get_jwt_identity()
+    org_id = request.args.get("organizationId")
+    if not org_id:
+        return jsonify({"message": "organizationId is required"}), 400
+    membership = OrganizationMember.query.filter_by(organization_id=org_id, user_id=user_id, status="active").first()
+    if not membership or not has_permission(membership.role, membership.teams or [], "task", "create"):
+        return jsonify({"message": "Not allowed to import tasks into this organization"}), 403
+
+    upload = request.files.get("file") if request.mimetype == "multipart/form-data" else None
+    if upload is not None:
+        stream, fmt = upload.stream, detect_format(upload.filename, upload.mimetype)
+    else:
+        stream, fmt = io.BufferedReader(request.stream), detect_format(content_type=request.mimetype)
+    fmt = request.args.get("format") or fmt
+    if fmt not in FORMATS:
+        return jsonify({"message": f"format must be one of: {', '.join(FORMATS)}"}), 400
+
+    if request.args.get("async") == "1":
+        return _enqueue_import(stream, fmt, org_id, user_id)
+
+    importer = TaskImporter(
+        org_id,
+        user_id,
+        batch_size=current_app.config["IMPORT_BATCH_SIZE"],
+        max_errors=current_app.config["IMPORT_MAX_ERRORS"],
+    )
+    rows = iter_rows(stream, fmt)
+    if request.accept_mimetypes.best == "application/x-ndjson":
+        def generate():
+            for result in importer.iter_run(rows):
+                yield json.dumps({
+                    "event": "progress",
+                    "processed": result.processed,
+                    "imported": result.imported,
+                    "failed": result.failed,
+                }) + "\n"
+            yield json.dumps({"event": "done", **importer.result.to_dict()}) + "\n"
+
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+    return jsonify(importer.run(rows).to_dict()), 200
+
+
+def _enqueue_import(stream, fmt: str, org_id: str, user_id: str):
+    import shutil
+    import uuid
+
+    from ..jobs import enqueue, output_dir
+    from .jobs import job_accepted
+
+    job_id = str(uuid.uuid4())
+    upload = f"{job_id}.upload"
+    with open(os.path.join(output_dir(current_app), upload), "wb") as out:
+        shutil.copyfileobj(stream, out, 1024 * 1024)
+    job = enqueue(
+        "import-tasks",
+        {"upload": upload, "format": fmt},
+        organization_id=org_id,
+        created_by=user_id,
+        job_id=job_id,
+    )
+    return job_accepted(job)
 
 
 @tasks_bp.put("/<task_id>")
 @jwt_required()
 def update_task(task_id: str):
+    from pydantic import ValidationError
+
+    from ..schemas.task import TaskUpdateSchema
+    from ..subtasks import load_subtasks, normalize, replace_subtasks, rollup_values
+
     task = Task.query.get_or_404(task_id)
+    check_if_match(task.version)
     payload = request.get_json(force=True) or {}
     try:
         data = TaskUpdateSchema.model_validate(payload)
@@ -125,26 +230,173 @@ def update_task(task_id: str):
         task.dependencies = data.dependencies or []
     if data.tags is not None:
         task.tags = data.tags or []
-    if data.progress is not None:
+    if data.progress is not None and not task.subtasks_total:
+        # With subtasks, progress follows them.
         task.progress = data.progress
-    if data.subtasks is not None:
-        task.subtasks = [s.model_dump() for s in data.subtasks] if data.subtasks else []
     if data.completedAt is not None:
         task.completed_at = _parse_datetime(data.completedAt)
+    if data.subtasks is not None:
+        subtasks = normalize(data.subtasks)
+        replace_subtasks(task.id, subtasks)
+        for column, value in rollup_values(subtasks).items():
+            setattr(task, column, value)
+        # Bumps the version and publishes the change even when the counts stay the same.
+        flag_modified(task, "subtasks_total")
+    else:
+        subtasks = load_subtasks(task_ids=[task.id]).get(task.id)
 
     db.session.commit()
-    return jsonify({"task": _task_to_dict(task)}), 200
+    return versioned({"task": _task_to_dict(task, subtasks)}, task.version)
+
+
+def _list_or_empty(value):
+    return value or []
+
+
+_TASK_PATCH_FIELDS = {
+    "title": "title",
+    "description": "description",
+    "status": "status",
+    "priority": "priority",
+    "phase": "phase",
+    "week": "week",
+    "startDate": ("start_date", lambda v: _parse_date(v)),
+    "endDate": ("end_date", lambda v: _parse_date(v)),
+    "estimatedHours": "estimated_hours",
+    "actualHours": "actual_hours",
+    "assignedTo": ("assigned_to", _list_or_empty),
+    "dependencies": ("dependencies", _list_or_empty),
+    "tags": ("tags", _list_or_empty),
+    "progress": "progress",
+    "blockedReason": "blocked_reason",
+    "completedAt": ("completed_at", lambda v: _parse_datetime(v)),
+}
+
+
+@tasks_bp.patch("/<task_id>")
+@jwt_required()
+def patch_task(task_id: str):
+    from pydantic import ValidationError
+
+    from ..project_stats import STATS_COLUMNS, record_change, with_snapshot
+    from ..schemas.task import TaskUpdateSchema
+    from ..subtasks import load_subtasks, normalize, progress_expression, replace_subtasks, rollup_values
+    from ..task_activity import record_update
+
+    payload = request.get_json(force=True) or {}
+    try:
+        data = TaskUpdateSchema.model_validate(payload)
+        values = patch_values(Task.__table__, data, _TASK_PATCH_FIELDS)
+    except ValidationError as err:
+        return jsonify({"message": "Invalid payload", "errors": err.errors()}), 400
+    except ValueError as err:
+        return jsonify({"message": str(err)}), 400
+
+    table = Task.__table__
+    subtasks = None
+    if "subtasks" in data.model_fields_set:
+        subtasks = normalize(data.subtasks or [])
+        values.update(rollup_values(subtasks))
+    elif "progress" in values:
+        # With subtasks, progress follows them.
+        values["progress"] = progress_expression(table.c.subtasks_total, table.c.subtasks_completed, values["progress"])
+
+    def write(old, version):
+        def before_commit(row):
+            if subtasks is not None:
+                replace_subtasks(row.id, subtasks)
+            record_update(row, values)
+            if old is not None:
+                record_change(old._mapping, row._mapping)
+
+        return update_returning(table, task_id, values, version, before_commit=before_commit)
+
+    if any(column in values for column in STATS_COLUMNS):
+        # The project rollup moves by the difference, so it needs the values being replaced.
+        row = with_snapshot(task_id, expected_version(), write)
+    else:
+        row = write(None, expected_version())
+    if subtasks is None:
+        subtasks = load_subtasks(task_ids=[row.id]).get(row.id)
+    return versioned({"task": _task_to_dict(row, subtasks)}, row.version)
 
 
 @tasks_bp.delete("/<task_id>")
 @jwt_required()
 def delete_task(task_id: str):
     task = Task.query.get_or_404(task_id)
+    check_if_match(task.version)
+    # Not left to ON DELETE CASCADE, which SQLite only honours with foreign keys enabled.
+    db.session.execute(delete(Subtask).where(Subtask.task_id == task.id))
     db.session.delete(task)
     db.session.commit()
     return jsonify({"message": "Task deleted"}), 204
 
 
+def _subtask_response(subtask, rollup, status: int = 200):
+    from ..subtasks import rollup_to_dict
+
+    payload = {"task": rollup_to_dict(rollup)}
+    if subtask is not None:
+        payload["subtask"] = subtask
+    return versioned(payload, rollup.version, status)
+
+
+@tasks_bp.post("/<task_id>/subtasks")
+@jwt_required()
+def create_subtask(task_id: str):
+    """Append one subtask; the task's counters and progress follow in the same transaction."""
+    import uuid
+
+    from pydantic import ValidationError
+
+    from ..schemas.task import SubtaskCreateSchema
+    from ..subtasks import DuplicateSubtask, add_subtask
+
+    payload = request.get_json(force=True) or {}
+    try:
+        data = SubtaskCreateSchema.model_validate(payload)
+    except ValidationError as err:
+        return jsonify({"message": "Invalid payload", "errors": err.errors()}), 400
+    item = {"id": data.id or str(uuid.uuid4()), "title": data.title, "status": data.status}
+    try:
+        subtask, rollup = add_subtask(task_id, item, expected_version())
+    except DuplicateSubtask:
+        return jsonify({"message": "A subtask with this id already exists"}), 409
+    return _subtask_response(subtask, rollup, 201)
+
+
+@tasks_bp.patch("/<task_id>/subtasks/<subtask_id>")
+@jwt_required()
+def patch_subtask(task_id: str, subtask_id: str):
+    from pydantic import ValidationError
+
+    from ..schemas.task import SubtaskUpdateSchema
+    from ..subtasks import update_subtask
+
+    payload = request.get_json(force=True) or {}
+    try:
+        data = SubtaskUpdateSchema.model_validate(payload)
+        values = patch_values(Subtask.__table__, data, {"title": "title", "status": "status"})
+    except ValidationError as err:
+        return jsonify({"message": "Invalid payload", "errors": err.errors()}), 400
+    except ValueError as err:
+        return jsonify({"message": str(err)}), 400
+    if not values:
+        return jsonify({"message": "Nothing to update"}), 400
+    subtask, rollup = update_subtask(task_id, subtask_id, values, expected_version())
+    return _subtask_response(subtask, rollup)
+
+
+@tasks_bp.delete("/<task_id>/subtasks/<subtask_id>")
+@jwt_required()
+def delete_subtask(task_id: str, subtask_id: str):
+    from ..subtasks import delete_subtask as remove
+
+    rollup = remove(task_id, subtask_id, expected_version())
+    return _subtask_response(None, rollup)
+
+
 def _parse_date(value):
     if not value:
         return None
@@ -1,8 +1,12 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from flask_jwt_extended import jwt_required
 
 from ..extensions import db
 from ..models import Team
+from ..partial_update import patch_values, update_returning
+from ..query_budget import query_budget
+from ..response_cache import cached
+from ..versioning import check_if_match, expected_version, versioned
 
 teams_bp = Blueprint("teams", __name__)
 
@@ -17,11 +21,14 @@ def _team_to_dict(team: Team):
         "memberCount": team.member_count,
         "createdAt": team.created_at.isoformat(),
         "updatedAt": team.updated_at.isoformat(),
+        "version": team.version,
     }
 
 
 @teams_bp.get("/")
 @jwt_required()
+@cached("teams")
+@query_budget(1)
 def list_teams():
     org_id = request.args.get("organizationId")
     query = Team.query
@@ -31,6 +38,46 @@ def list_teams():
     return jsonify({"teams": [_team_to_dict(t) for t in teams]}), 200
 
 
+def _default_week() -> str:
+    """The week ``from`` defaults to, which the query string alone does not pin down."""
+    from datetime import datetime
+
+    from ..workload import week_start
+
+    return "" if request.args.get("from") else week_start(datetime.utcnow().date()).isoformat()
+
+
+@teams_bp.get("/workload")
+@jwt_required()
+@cached("workload", vary_on=_default_week)
+@query_budget(1)
+def team_workload():
+    """Estimated hours of open tasks per assignee per week, with over-capacity flags.
+
+    Query: ``organizationId``, ``from`` (date, snapped to its Monday; default
+    this week), ``weeks`` (1-52, default 12), ``capacity`` (hours per person
+    per week, default ``WORKLOAD_WEEKLY_CAPACITY``) and ``planStart`` (the
+    date plan week 1 starts on, to place tasks that only have a ``week``).
+    """
+    from datetime import datetime, timedelta
+
+    from pydantic import ValidationError
+
+    from ..schemas.team import WorkloadQuerySchema
+    from ..workload import compute, week_start, workload_query
+
+    try:
+        query = WorkloadQuerySchema.model_validate(request.args.to_dict())
+    except ValidationError as err:
+        return jsonify({"message": "Invalid query", "errors": err.errors(include_url=False)}), 400
+    start = week_start(query.start or datetime.utcnow().date())
+    end = start + timedelta(weeks=query.weeks)
+    rows = db.session.execute(workload_query(query.organizationId, start, end)).all()
+    capacity = query.capacity or current_app.config["WORKLOAD_WEEKLY_CAPACITY"]
+    workload = compute(rows, start, query.weeks, capacity, query.planStart)
+    return jsonify({"workload": workload.to_dict()}), 200
+
+
 @teams_bp.post("/")
 @jwt_required()
 def create_team():
@@ -48,13 +95,14 @@ def create_team():
     )
     db.session.add(team)
     db.session.commit()
-    return jsonify({"team": _team_to_dict(team)}), 201
+    return versioned({"team": _team_to_dict(team)}, team.version, 201)
 
 
 @teams_bp.put("/<team_id>")
 @jwt_required()
 def update_team(team_id: str):
     team = Team.query.get_or_404(team_id)
+    check_if_match(team.version)
     payload = request.get_json(force=True) or {}
     for field in ["name", "category", "description", "organization_id"]:
         if field in payload:
@@ -62,13 +110,42 @@ def update_team(team_id: str):
     if "memberCount" in payload:
         team.member_count = payload.get("memberCount") or 0
     db.session.commit()
-    return jsonify({"team": _team_to_dict(team)}), 200
+    return versioned({"team": _team_to_dict(team)}, team.version)
+
+
+_TEAM_PATCH_FIELDS = {
+    "organizationId": "organization_id",
+    "name": "name",
+    "category": "category",
+    "description": "description",
+    "memberCount": ("member_count", lambda v: v or 0),
+}
+
+
+@teams_bp.patch("/<team_id>")
+@jwt_required()
+def patch_team(team_id: str):
+    from pydantic import ValidationError
+
+    from ..schemas.team import TeamUpdateSchema
+
+    payload = request.get_json(force=True) or {}
+    try:
+        data = TeamUpdateSchema.model_validate(payload)
+        values = patch_values(Team.__table__, data, _TEAM_PATCH_FIELDS)
+    except ValidationError as err:
+        return jsonify({"message": "Invalid payload", "errors": err.errors()}), 400
+    except ValueError as err:
+        return jsonify({"message": str(err)}), 400
+    row = update_returning(Team.__table__, team_id, values, expected_version())
+    return versioned({"team": _team_to_dict(row)}, row.version)
 
 
 @teams_bp.delete("/<team_id>")
 @jwt_required()
 def delete_team(team_id: str):
     team = Team.query.get_or_404(team_id)
+    check_if_match(team.version)
     db.session.delete(team)
     db.session.commit()
     return jsonify({"message": "Deleted"}), 204
@@ -10,6 +10,16 @@ class Config:
     JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY", "dev-jwt-secret")
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=30)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=14)
+
+    # Engine profile (see app/database.py). SQLALCHEMY_ENGINE_OPTIONS set on a
+    # subclass still wins over anything derived from these.
+    DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "10"))
+    DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", "1800"))
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_CACHE_SIZE_KB = int(os.environ.get("SQLITE_CACHE_SIZE_KB", "65536"))
+    SQLITE_MMAP_SIZE = int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
     
     # Parse CORS origins from environment
     _cors_origins = os.environ.get("CORS_ORIGINS", "http://localhost:3000,http://localhost:5173")
@@ -27,3 +37,69 @@ class Config:
         CORS_ORIGINS: List[str] = [origin.strip() for origin in _cors_origins.split(",")]
     else:
         CORS_ORIGINS: List[str] = [_cors_origins]
+
+    # Browsers cap this (Chromium at 2h); longer values are harmless.
+    CORS_MAX_AGE = int(os.environ.get("CORS_MAX_AGE", "86400"))
+
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+
+    # Development/test only: record SQL per request, flag N+1 patterns and
+    # enforce @query_budget limits ("raise" fails the request, "warn" logs).
+    QUERY_TRACKING = os.environ.get("QUERY_TRACKING", "0") == "1"
+    QUERY_BUDGET_MODE = os.environ.get("QUERY_BUDGET_MODE", "raise")
+    N_PLUS_ONE_THRESHOLD = int(os.environ.get("N_PLUS_ONE_THRESHOLD", "3"))
+
+    # Comma-separated emails allowed to use /api/admin endpoints.
+    ADMIN_EMAILS: List[str] = [e.strip().lower() for e in os.environ.get("ADMIN_EMAILS", "").split(",") if e.strip()]
+
+    # Slow-query log (app/slow_queries.py); 0 disables it.
+    SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", "0"))
+    SLOW_QUERY_LOG_PATH = os.environ.get("SLOW_QUERY_LOG_PATH")
+    SLOW_QUERY_LOG_MAX_BYTES = int(os.environ.get("SLOW_QUERY_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    SLOW_QUERY_LOG_BACKUPS = int(os.environ.get("SLOW_QUERY_LOG_BACKUPS", "5"))
+    SLOW_QUERY_KEEP = int(os.environ.get("SLOW_QUERY_KEEP", "200"))
+    SLOW_QUERY_EXPLAIN_ANALYZE = os.environ.get("SLOW_QUERY_EXPLAIN_ANALYZE", "0") == "1"
+
+    # X-Profile: 1 from an admin profiles that request (app/profiling.py).
+    PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "1") == "1"
+    PROFILE_DIR = os.environ.get("PROFILE_DIR")
+
+    # Bulk task import (app/task_import.py).
+    IMPORT_BATCH_SIZE = int(os.environ.get("IMPORT_BATCH_SIZE", "5000"))
+    IMPORT_MAX_ERRORS = int(os.environ.get("IMPORT_MAX_ERRORS", "1000"))
+
+    # Org-scoped list response cache (app/response_cache.py): "" (off),
+    # "memory", "redis://..." or "package.module:Class".
+    RESPONSE_CACHE_BACKEND = os.environ.get("RESPONSE_CACHE_BACKEND", "")
+    RESPONSE_CACHE_TTL = int(os.environ.get("RESPONSE_CACHE_TTL", "300"))
+    RESPONSE_CACHE_MAX_BYTES = int(os.environ.get("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    RESPONSE_CACHE_MAX_ENTRY_BYTES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRY_BYTES", "0"))  # 0 = max/8
+
+    # Identical concurrent list reads share one computation (app/single_flight.py);
+    # needs the response cache, whose generation-aware keys it uses.
+    REQUEST_COALESCING = os.environ.get("REQUEST_COALESCING", "1") == "1"
+    REQUEST_COALESCING_TIMEOUT = float(os.environ.get("REQUEST_COALESCING_TIMEOUT", "30"))
+
+    # Server-Sent Events of org changes (app/org_events.py).
+    EVENTS_POLL_INTERVAL = float(os.environ.get("EVENTS_POLL_INTERVAL", "1"))
+    EVENTS_HEARTBEAT_SECONDS = int(os.environ.get("EVENTS_HEARTBEAT_SECONDS", "15"))
+    EVENTS_BACKLOG_LIMIT = int(os.environ.get("EVENTS_BACKLOG_LIMIT", "1000"))
+    EVENTS_QUEUE_SIZE = int(os.environ.get("EVENTS_QUEUE_SIZE", "1000"))
+    EVENTS_WSGI_STREAM_SECONDS = int(os.environ.get("EVENTS_WSGI_STREAM_SECONDS", "60"))
+    EVENTS_RETENTION_HOURS = int(os.environ.get("EVENTS_RETENTION_HOURS", "72"))
+
+    # POST /api/batch (app/batch.py): sub-requests per call, threads for concurrent reads.
+    BATCH_MAX_REQUESTS = int(os.environ.get("BATCH_MAX_REQUESTS", "20"))
+    BATCH_MAX_WORKERS = int(os.environ.get("BATCH_MAX_WORKERS", "4"))
+
+    # Background jobs (app/jobs.py). JOB_WORKERS threads per web process; 0 = use `flask run-jobs`.
+    JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "0"))
+    JOB_POLL_INTERVAL = float(os.environ.get("JOB_POLL_INTERVAL", "1"))
+    JOB_LEASE_SECONDS = int(os.environ.get("JOB_LEASE_SECONDS", "60"))
+    JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", "3"))
+    JOB_RETRY_BACKOFF = float(os.environ.get("JOB_RETRY_BACKOFF", "10"))
+    JOB_OUTPUT_DIR = os.environ.get("JOB_OUTPUT_DIR", "")  # default: instance/jobs
+    JOB_RETENTION_HOURS = int(os.environ.get("JOB_RETENTION_HOURS", "168"))
+
+    # GET /api/teams/workload (app/workload.py): hours per person per week before a week is flagged.
+    WORKLOAD_WEEKLY_CAPACITY = float(os.environ.get("WORKLOAD_WEEKLY_CAPACITY", "40"))
@@ -0,0 +1,67 @@
+"""CORS handling.
+
+Preflight requests are answered by a WSGI middleware in front of Flask, so
+they never reach routing, JWT decoding or the database. Header sets are built
+once per allowed origin when the app is created.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+ALLOW_METHODS = "GET, POST, PUT, PATCH, DELETE, OPTIONS"
+ALLOW_HEADERS = "Content-Type, Authorization, X-Profile, If-Match, Last-Event-ID"
+EXPOSE_HEADERS = "X-Profile-Id, ETag"
+
+Headers = list[tuple[str, str]]
+
+
+class CorsPolicy:
+    """Origin allowlist with prebuilt response and preflight headers."""
+
+    def __init__(self, origins: Iterable[str], max_age: int) -> None:
+        self.origins = frozenset(o.rstrip("/") for o in origins if o)
+        self._response: dict[str, Headers] = {}
+        self._preflight: dict[str, Headers] = {}
+        for origin in self.origins:
+            self._response[origin] = [
+                ("Access-Control-Allow-Origin", origin),
+                ("Access-Control-Allow-Credentials", "true"),
+                ("Access-Control-Expose-Headers", EXPOSE_HEADERS),
+            ]
+            self._preflight[origin] = self._response[origin] + [
+                ("Vary", "Origin"),
+                ("Access-Control-Allow-Methods", ALLOW_METHODS),
+                ("Access-Control-Allow-Headers", ALLOW_HEADERS),
+                ("Access-Control-Max-Age", str(max_age)),
+                ("Content-Length", "0"),
+            ]
+        self._rejected: Headers = [("Vary", "Origin"), ("Content-Length", "0")]
+
+    def response_headers(self, origin: str | None) -> Headers:
+        """Headers to add to a normal response; empty for unknown origins."""
+        return self._response.get(origin, []) if origin else []
+
+    def preflight_headers(self, origin: str | None) -> Headers:
+        """Full preflight answer; without CORS headers the browser blocks the request."""
+        return self._preflight.get(origin, self._rejected) if origin else self._rejected
+
+
+def is_preflight(method: str, origin: str | None, request_method: str | None) -> bool:
+    return method == "OPTIONS" and bool(origin) and bool(request_method)
+
+
+class PreflightMiddleware:
+    """Answer CORS preflights before Flask dispatches the request."""
+
+    def __init__(self, wsgi_app, policy: CorsPolicy) -> None:
+        self.wsgi_app = wsgi_app
+        self.policy = policy
+
+    def __call__(self, environ, start_response):
+        origin = environ.get("HTTP_ORIGIN")
+        if is_preflight(
+            environ["REQUEST_METHOD"], origin, environ.get("HTTP_ACCESS_CONTROL_REQUEST_METHOD")
+        ):
+            start_response("204 No Content", list(self.policy.preflight_headers(origin)))
+            return [b""]
+        return self.wsgi_app(environ, start_response)
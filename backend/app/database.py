@@ -0,0 +1,186 @@
+"""Engine profile and connection-pool instrumentation.
+
+Postgres gets a sized, pre-pinged, recycled LIFO queue pool. File-backed SQLite
+gets the same pool plus WAL and the pragmas below, applied on every new DBAPI
+connection. Pool counters are per process and exposed at ``/health/pool``.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Mapping
+
+from flask import Flask
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool
+
+from .extensions import db
+
+
+class PoolStats:
+    """Thread-safe checkout/wait counters for the current process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_seconds_total += seconds
+            if seconds > self.wait_seconds_max:
+                self.wait_seconds_max = seconds
+            if timed_out:
+                self.timeouts += 1
+
+    def incr(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self, engine: Engine | None = None) -> dict[str, Any]:
+        with self._lock:
+            data: dict[str, Any] = {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "waitSecondsTotal": round(self.wait_seconds_total, 6),
+                "waitSecondsMax": round(self.wait_seconds_max, 6),
+                "waitSecondsAvg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+            }
+        pool = engine.pool if engine is not None else None
+        data["poolClass"] = type(pool).__name__ if pool is not None else None
+        if isinstance(pool, QueuePool):
+            data.update(
+                {
+                    "size": pool.size(),
+                    "checkedIn": pool.checkedin(),
+                    "checkedOut": pool.checkedout(),
+                    "overflow": pool.overflow(),
+                }
+            )
+        return data
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+    def connect(self):  # type: ignore[override]
+        started = time.perf_counter()
+        try:
+            conn = super().connect()
+        except exc.TimeoutError:
+            pool_stats.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        pool_stats.record_wait(time.perf_counter() - started)
+        return conn
+
+
+def _is_sqlite(uri: str) -> bool:
+    return make_url(uri).get_backend_name() == "sqlite"
+
+
+def _is_sqlite_memory(uri: str) -> bool:
+    database = make_url(uri).database
+    return database is None or database in {"", ":memory:"}
+
+
+def engine_options(config: Mapping[str, Any]) -> dict[str, Any]:
+    """Build ``SQLALCHEMY_ENGINE_OPTIONS`` for the configured database."""
+    uri = config["SQLALCHEMY_DATABASE_URI"]
+    if _is_sqlite(uri):
+        if _is_sqlite_memory(uri):
+            # Flask-SQLAlchemy forces a StaticPool for in-memory databases.
+            return {}
+        return {
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": config["DB_POOL_SIZE"],
+            "max_overflow": config["DB_MAX_OVERFLOW"],
+            "pool_timeout": config["DB_POOL_TIMEOUT"],
+            "connect_args": {"timeout": config["SQLITE_BUSY_TIMEOUT_MS"] / 1000},
+        }
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": config["DB_POOL_SIZE"],
+        "max_overflow": config["DB_MAX_OVERFLOW"],
+        "pool_timeout": config["DB_POOL_TIMEOUT"],
+        "pool_recycle": config["DB_POOL_RECYCLE"],
+        "pool_pre_ping": True,
+        "pool_use_lifo": True,
+    }
+
+
+def sqlite_pragmas(config: Mapping[str, Any]) -> list[str]:
+    pragmas = [
+        f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT_MS'])}",
+        f"PRAGMA cache_size=-{int(config['SQLITE_CACHE_SIZE_KB'])}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if not _is_sqlite_memory(config["SQLALCHEMY_DATABASE_URI"]):
+        pragmas += [
+            "PRAGMA journal_mode=WAL",
+            "PRAGMA synchronous=NORMAL",
+            f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}",
+        ]
+    return pragmas
+
+
+def attach_sqlite_pragmas(engine: Engine, config: Mapping[str, Any]) -> None:
+    """Run :func:`sqlite_pragmas` on every new DBAPI connection of ``engine``."""
+    pragmas = sqlite_pragmas(config)
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def configure_engine_options(app: Flask) -> None:
+    """Merge the engine profile into the app config before ``db.init_app``."""
+    options = engine_options(app.config)
+    options.update(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+
+
+def instrument_engine(app: Flask) -> None:
+    """Attach pragma and pool listeners to the app's engine."""
+    with app.app_context():
+        engine = db.engine
+
+    if _is_sqlite(app.config["SQLALCHEMY_DATABASE_URI"]):
+        attach_sqlite_pragmas(engine, app.config)
+
+    event.listen(engine, "connect", lambda *_: pool_stats.incr("connects"))
+    event.listen(engine, "checkout", lambda *_: pool_stats.incr("checkouts"))
+    event.listen(engine, "checkin", lambda *_: pool_stats.incr("checkins"))
+    event.listen(engine, "invalidate", lambda *_: pool_stats.incr("invalidations"))
+
+
+def reset_engine_after_fork(app: Flask) -> None:
+    """Drop connections inherited from the parent so each worker builds its own pool.
+
+    ``close=False`` leaves the parent's sockets alone; they are simply
+    de-referenced in the child instead of being shut down underneath the
+    parent or sibling workers.
+    """
+    with app.app_context():
+        db.engine.dispose(close=False)
+    pool_stats.reset()
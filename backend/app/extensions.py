@@ -1,7 +1,34 @@
-from flask_jwt_extended import JWTManager
+from contextvars import ContextVar
+
+from flask_jwt_extended import JWTManager as _JWTManager
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 
+# Encoded token -> claims already verified in this ``/api/batch`` call (app/batch.py).
+verified_tokens: ContextVar[dict[str, dict] | None] = ContextVar("verified_tokens", default=None)
+
+
+class JWTManager(_JWTManager):
+    """Skips re-decoding a token verified earlier in the same batch.
+
+    Only the signature/expiry decode is reused; ``jwt_required`` still runs
+    its type, freshness and revocation checks on the claims. Overrides a
+    private hook of Flask-JWT-Extended, so the version is pinned exactly in
+    requirements.txt and ``test_batch.py`` checks the hook is still used.
+    Any argument besides the token (CSRF value, ``allow_expired`` or one a
+    later release adds) goes straight to the library.
+    """
+
+    def _decode_jwt_from_config(self, encoded_token: str, *args, **kwargs) -> dict:
+        verified = verified_tokens.get()
+        if verified is None or any(args) or any(kwargs.values()):
+            return super()._decode_jwt_from_config(encoded_token, *args, **kwargs)
+        claims = verified.get(encoded_token)
+        if claims is None:
+            claims = verified[encoded_token] = super()._decode_jwt_from_config(encoded_token)
+        return dict(claims)
+
+
 db = SQLAlchemy()
 migrate = Migrate()
 jwt = JWTManager()
@@ -0,0 +1,384 @@
+"""Background jobs backed by the ``jobs`` table.
+
+Slow operations are enqueued as rows and run by a ``WorkerPool``: threads
+inside each web process (``JOB_WORKERS``) or a sidecar process
+(``flask --app manage run-jobs``), with no broker besides the database.
+
+A worker claims the oldest due job with one ``UPDATE ... WHERE id =
+(SELECT ... FOR UPDATE SKIP LOCKED) RETURNING``. On Postgres, ``SKIP
+LOCKED`` lets many workers claim different rows at once. On SQLite the
+statement runs under the database write lock, so two workers can never take
+the same job. While a job runs, its pool refreshes ``heartbeat_at``. A
+running job whose heartbeat is older than ``JOB_LEASE_SECONDS`` (its process
+died) is queued again or, out of attempts, failed.
+
+Handlers are registered with ``@job("kind")`` and receive a ``JobContext``
+and the payload. A raised exception is retried ``max_attempts`` times with
+exponential backoff. ``ctx.progress()`` records progress and is where a
+cancellation request takes effect.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import traceback
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+from flask import Flask, current_app
+from sqlalchemy import Row, delete, select, update
+
+from .extensions import db
+from .metrics import metrics
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[["JobContext", dict[str, Any]], "dict[str, Any] | None"]
+
+_HANDLERS: dict[str, tuple[Handler, int | None]] = {}
+_jobs = Job.__table__
+
+
+def job(kind: str, max_attempts: int | None = None) -> Callable[[Handler], Handler]:
+    """Register a handler for ``kind``; ``max_attempts`` overrides ``JOB_MAX_ATTEMPTS``."""
+
+    def decorator(fn: Handler) -> Handler:
+        _HANDLERS[kind] = (fn, max_attempts)
+        return fn
+
+    return decorator
+
+
+class JobCancelled(Exception):
+    """Raised by ``JobContext.progress`` once cancellation was requested."""
+
+
+class JobContext:
+    def __init__(self, row: Row, worker_id: str) -> None:
+        self.job_id = row.id
+        self.organization_id = row.organization_id
+        self.created_by = row.created_by
+        self.attempt = row.attempts
+        self.worker_id = worker_id
+
+    def progress(self, done: int, total: int | None = None, message: str | None = None) -> None:
+        """Record progress; raises ``JobCancelled`` if the job was cancelled.
+
+        Written through its own connection so it is visible at once. On
+        SQLite, call it between the handler's transactions, not inside one.
+        """
+        values: dict[str, Any] = {"progress": done, "heartbeat_at": datetime.utcnow()}
+        if total is not None:
+            values["total"] = total
+        if message is not None:
+            values["message"] = message[:255]
+        with db.engine.begin() as conn:
+            cancelled = conn.execute(
+                update(_jobs)
+                .where(_jobs.c.id == self.job_id, _jobs.c.locked_by == self.worker_id)
+                .values(values)
+                .returning(_jobs.c.cancel_requested)
+            ).scalar()
+        if cancelled:
+            raise JobCancelled()
+
+
+def enqueue(
+    kind: str,
+    payload: dict[str, Any] | None = None,
+    *,
+    organization_id: str | None = None,
+    created_by: str | None = None,
+    delay: float = 0,
+    job_id: str | None = None,
+) -> Job:
+    """Insert a queued job and commit; in-process workers are woken at once."""
+    if kind not in _HANDLERS:
+        raise ValueError(f"Unknown job kind {kind!r}")
+    max_attempts = _HANDLERS[kind][1] or current_app.config["JOB_MAX_ATTEMPTS"]
+    new_job = Job(
+        id=job_id or str(uuid.uuid4()),
+        kind=kind,
+        payload=payload or {},
+        organization_id=organization_id,
+        created_by=created_by,
+        max_attempts=max_attempts,
+        run_at=datetime.utcnow() + timedelta(seconds=delay),
+    )
+    db.session.add(new_job)
+    db.session.commit()
+    if _pool is not None:
+        _pool.wake.set()
+    return new_job
+
+
+def cancel(job_id: str) -> bool:
+    """Cancel a queued job now, or ask a running one to stop; False if already finished."""
+    now = datetime.utcnow()
+    done = db.session.execute(
+        update(_jobs)
+        .where(_jobs.c.id == job_id, _jobs.c.status == "queued")
+        .values(status="cancelled", finished_at=now)
+    ).rowcount
+    if not done:
+        done = db.session.execute(
+            update(_jobs).where(_jobs.c.id == job_id, _jobs.c.status == "running").values(cancel_requested=True)
+        ).rowcount
+    db.session.commit()
+    return bool(done)
+
+
+def output_dir(app: Flask) -> str:
+    path = app.config.get("JOB_OUTPUT_DIR") or os.path.join(app.instance_path, "jobs")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def claim(worker_id: str) -> Row | None:
+    now = datetime.utcnow()
+    next_due = (
+        select(_jobs.c.id)
+        .where(_jobs.c.status == "queued", _jobs.c.run_at <= now)
+        .order_by(_jobs.c.run_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    row = db.session.execute(
+        update(_jobs)
+        .where(_jobs.c.id == next_due, _jobs.c.status == "queued")
+        .values(
+            status="running",
+            locked_by=worker_id,
+            heartbeat_at=now,
+            started_at=now,
+            attempts=_jobs.c.attempts + 1,
+        )
+        .returning(*_jobs.c)
+    ).one_or_none()
+    db.session.commit()
+    return row
+
+
+def reap(lease_seconds: int) -> int:
+    """Requeue (or fail, when out of attempts) running jobs whose worker went silent."""
+    now = datetime.utcnow()
+    stale = (_jobs.c.status == "running") & (_jobs.c.heartbeat_at < now - timedelta(seconds=lease_seconds))
+    lost = "Worker stopped responding"
+    count = db.session.execute(
+        update(_jobs)
+        .where(stale, _jobs.c.attempts >= _jobs.c.max_attempts)
+        .values(status="failed", error=lost, locked_by=None, finished_at=now)
+    ).rowcount
+    count += db.session.execute(
+        update(_jobs).where(stale).values(status="queued", error=lost, locked_by=None, run_at=now)
+    ).rowcount
+    db.session.commit()
+    return count
+
+
+def prune(older_than: timedelta, directory: str) -> int:
+    """Delete finished jobs older than ``older_than`` and their output files."""
+    cutoff = datetime.utcnow() - older_than
+    finished = _jobs.c.status.in_(("succeeded", "failed", "cancelled")) & (_jobs.c.finished_at < cutoff)
+    for payload, result in db.session.execute(select(_jobs.c.payload, _jobs.c.result).where(finished)):
+        for name in ((result or {}).get("file"), (payload or {}).get("upload")):
+            if name:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except FileNotFoundError:
+                    pass
+    count = db.session.execute(delete(_jobs).where(finished)).rowcount
+    db.session.commit()
+    return count
+
+
+class WorkerPool:
+    def __init__(self, app: Flask, workers: int) -> None:
+        config = app.config
+        self.app = app
+        self.workers = workers
+        self.poll_interval = config["JOB_POLL_INTERVAL"]
+        self.lease_seconds = config["JOB_LEASE_SECONDS"]
+        self.retry_backoff = config["JOB_RETRY_BACKOFF"]
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.wake = threading.Event()
+        self._stopping = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.running: set[str] = set()
+        self.finished: dict[tuple[str, str], int] = {}
+
+    def start(self) -> None:
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        thread = threading.Thread(target=self._supervise, name="job-supervisor", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop claiming; wait up to ``timeout`` for running jobs to finish."""
+        self._stopping.set()
+        self.wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                with self.app.app_context():
+                    row = claim(self.worker_id)
+                    if row is not None:
+                        self._run(row)
+                        continue
+            except Exception:  # noqa: BLE001 - a broken poll must not kill the worker
+                logger.exception("Job worker poll failed")
+            self.wake.wait(self.poll_interval)
+            self.wake.clear()
+
+    def _run(self, row: Row) -> None:
+        with self._lock:
+            self.running.add(row.id)
+        mine = (_jobs.c.id == row.id) & (_jobs.c.locked_by == self.worker_id)
+        try:
+            handler = _HANDLERS.get(row.kind)
+            if handler is None:
+                raise LookupError(f"No handler registered for {row.kind!r}")
+            result = handler[0](JobContext(row, self.worker_id), row.payload or {})
+            db.session.rollback()
+            values = {"status": "succeeded", "result": result, "error": None, "finished_at": datetime.utcnow()}
+        except JobCancelled:
+            db.session.rollback()
+            values = {"status": "cancelled", "finished_at": datetime.utcnow()}
+        except Exception as err:  # noqa: BLE001 - recorded on the job
+            db.session.rollback()
+            logger.exception("Job %s (%s) failed on attempt %s", row.id, row.kind, row.attempts)
+            error = "".join(traceback.format_exception_only(type(err), err)).strip()
+            if row.attempts < row.max_attempts:
+                delay = self.retry_backoff * 2 ** (row.attempts - 1)
+                values = {"status": "queued", "error": error, "run_at": datetime.utcnow() + timedelta(seconds=delay)}
+            else:
+                values = {"status": "failed", "error": error, "finished_at": datetime.utcnow()}
+        finally:
+            with self._lock:
+                self.running.discard(row.id)
+        # Guarded by locked_by: if our lease was reaped, the new owner decides.
+        db.session.execute(update(_jobs).where(mine).values(locked_by=None, **values))
+        db.session.commit()
+        with self._lock:
+            key = (row.kind, values["status"])
+            self.finished[key] = self.finished.get(key, 0) + 1
+
+    def _supervise(self) -> None:
+        interval = max(self.lease_seconds / 3, 1)
+        while not self._stopping.wait(interval):
+            try:
+                with self.app.app_context():
+                    with self._lock:
+                        running = list(self.running)
+                    if running:
+                        db.session.execute(
+                            update(_jobs)
+                            .where(_jobs.c.id.in_(running), _jobs.c.locked_by == self.worker_id)
+                            .values(heartbeat_at=datetime.utcnow())
+                        )
+                        db.session.commit()
+                    if reap(self.lease_seconds):
+                        self.wake.set()
+            except Exception:  # noqa: BLE001
+                logger.exception("Job heartbeat failed")
+
+    def metric_lines(self, pid: str) -> list[str]:
+        with self._lock:
+            running, finished = len(self.running), dict(self.finished)
+        lines = ["# TYPE jobs_running gauge", f'jobs_running{{pid="{pid}"}} {running}', "# TYPE jobs_finished_total counter"]
+        lines += [
+            f'jobs_finished_total{{pid="{pid}",kind="{kind}",status="{status}"}} {n}'
+            for (kind, status), n in sorted(finished.items())
+        ]
+        return lines
+
+
+_pool: WorkerPool | None = None
+
+
+def start_workers(app: Flask, workers: int | None = None) -> WorkerPool | None:
+    """Start this process's worker pool (``JOB_WORKERS`` threads by default)."""
+    global _pool
+    workers = app.config["JOB_WORKERS"] if workers is None else workers
+    if workers <= 0 or _pool is not None:
+        return _pool
+    _pool = WorkerPool(app, workers)
+    _pool.start()
+    metrics.add_collector("jobs", _pool.metric_lines)
+    return _pool
+
+
+def stop_workers(timeout: float | None = None) -> None:
+    global _pool
+    if _pool is not None:
+        _pool.stop(timeout)
+        _pool = None
+
+
+@job("export-org")
+def export_org(ctx: JobContext, payload: dict[str, Any]) -> dict[str, Any]:
+    """Write an organization export to ``JOB_OUTPUT_DIR``; download it from the job."""
+    from .org_export import csv_lines, encode, export_plan, iter_records, ndjson_lines
+
+    fmt = payload.get("format", "ndjson")
+    resource = payload.get("resource")
+    gzip = bool(payload.get("gzip"))
+    name = f"{ctx.job_id}.{fmt}" + (".gz" if gzip else "")
+    count = 0
+
+    def counted(records):
+        nonlocal count
+        for record in records:
+            count += 1
+            if count % 10_000 == 0:
+                ctx.progress(count, message=f"{count:,} records exported")
+            yield record
+
+    records = counted(iter_records(ctx.organization_id, export_plan(resource, single=fmt == "csv")))
+    lines = csv_lines(records) if fmt == "csv" else ndjson_lines(records)
+    path = os.path.join(output_dir(current_app), name)
+    size = 0
+    with open(path, "wb") as out:
+        for chunk in encode(lines, gzip=gzip):
+            out.write(chunk)
+            size += len(chunk)
+    ctx.progress(count, count, f"{count:,} records exported")
+    mimetype = "application/gzip" if gzip else ("text/csv" if fmt == "csv" else "application/x-ndjson")
+    return {"file": name, "bytes": size, "records": count, "mimetype": mimetype}
+
+
+# Committed batches stay committed, so a retry would import them twice.
+@job("import-tasks", max_attempts=1)
+def import_tasks(ctx: JobContext, payload: dict[str, Any]) -> dict[str, Any]:
+    """Import an uploaded CSV/NDJSON file saved as ``payload["upload"]``."""
+    from .task_import import TaskImporter, iter_rows
+
+    config = current_app.config
+
+    def progress(result) -> None:
+        ctx.progress(result.processed, message=f"{result.imported:,} imported, {result.failed:,} failed")
+
+    importer = TaskImporter(
+        ctx.organization_id,
+        ctx.created_by,
+        batch_size=config["IMPORT_BATCH_SIZE"],
+        max_errors=config["IMPORT_MAX_ERRORS"],
+        progress=progress,
+    )
+    path = os.path.join(output_dir(current_app), payload["upload"])
+    with open(path, "rb") as fh:
+        result = importer.run(iter_rows(fh, payload["format"]))
+    os.remove(path)
+    return result.to_dict()
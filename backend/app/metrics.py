@@ -0,0 +1,204 @@
+"""Request and database metrics in Prometheus text format.
+
+Per-endpoint latency histograms, status counters, SQL statements and SQL time
+per request, and connection-pool gauges, served at ``/metrics``. Everything is
+kept in per-process dicts guarded by one lock; under gunicorn each worker
+reports its own numbers, labelled with ``pid``.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Iterable
+
+from flask import Flask, Response, g, request
+from sqlalchemy import event
+
+from .database import pool_stats
+from .extensions import db
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# [statement count, seconds] for the request running in this context.
+_sql_usage: ContextVar[list | None] = ContextVar("sql_usage", default=None)
+
+
+class Histogram:
+    def __init__(self, buckets: Iterable[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Other subsystems append their own lines: name -> fn(pid) -> lines.
+        self.collectors: dict[str, Callable[[str], list[str]]] = {}
+        self.reset()
+
+    def add_collector(self, name: str, collector: Callable[[str], list[str]]) -> None:
+        self.collectors[name] = collector
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests: dict[tuple[str, str, int], int] = {}
+            self.latency: dict[tuple[str, str], Histogram] = {}
+            self.sql_count: dict[str, Histogram] = {}
+            self.sql_seconds: dict[str, float] = {}
+
+    def observe_request(self, endpoint: str, method: str, status: int, seconds: float, sql: list | None) -> None:
+        with self._lock:
+            key = (endpoint, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            hist = self.latency.get((endpoint, method))
+            if hist is None:
+                hist = self.latency[(endpoint, method)] = Histogram(LATENCY_BUCKETS)
+            hist.observe(seconds)
+            if sql is not None:
+                hist = self.sql_count.get(endpoint)
+                if hist is None:
+                    hist = self.sql_count[endpoint] = Histogram(QUERY_COUNT_BUCKETS)
+                hist.observe(sql[0])
+                self.sql_seconds[endpoint] = self.sql_seconds.get(endpoint, 0.0) + sql[1]
+
+    def render(self, pool: dict) -> str:
+        pid = str(os.getpid())
+        lines: list[str] = []
+        with self._lock:
+            lines += [
+                "# HELP http_requests_total Requests handled, by endpoint and status.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (endpoint, method, status), value in sorted(self.requests.items()):
+                labels = _labels(pid=pid, endpoint=endpoint, method=method, status=str(status))
+                lines.append(f"http_requests_total{labels} {value}")
+
+            lines += [
+                "# HELP http_request_duration_seconds Request latency.",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for (endpoint, method), hist in sorted(self.latency.items()):
+                lines += _histogram_lines(
+                    "http_request_duration_seconds", hist, pid=pid, endpoint=endpoint, method=method
+                )
+
+            lines += [
+                "# HELP db_statements_per_request SQL statements executed per request.",
+                "# TYPE db_statements_per_request histogram",
+            ]
+            for endpoint, hist in sorted(self.sql_count.items()):
+                lines += _histogram_lines("db_statements_per_request", hist, pid=pid, endpoint=endpoint)
+
+            lines += [
+                "# HELP db_statement_seconds_total Time spent in SQL statements.",
+                "# TYPE db_statement_seconds_total counter",
+            ]
+            for endpoint, seconds in sorted(self.sql_seconds.items()):
+                lines.append(f"db_statement_seconds_total{_labels(pid=pid, endpoint=endpoint)} {seconds:.6f}")
+
+        gauges = {
+            "db_pool_size": pool.get("size"),
+            "db_pool_checked_out": pool.get("checkedOut"),
+            "db_pool_checked_in": pool.get("checkedIn"),
+            "db_pool_overflow": pool.get("overflow"),
+        }
+        counters = {
+            "db_pool_checkouts_total": pool["checkouts"],
+            "db_pool_connects_total": pool["connects"],
+            "db_pool_timeouts_total": pool["timeouts"],
+            "db_pool_invalidations_total": pool["invalidations"],
+            "db_pool_wait_seconds_total": pool["waitSecondsTotal"],
+        }
+        labels = _labels(pid=pid)
+        for name, value in gauges.items():
+            if value is not None:
+                lines += [f"# TYPE {name} gauge", f"{name}{labels} {value}"]
+        for name, value in counters.items():
+            lines += [f"# TYPE {name} counter", f"{name}{labels} {value}"]
+        for collector in list(self.collectors.values()):
+            lines += collector(pid)
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _histogram_lines(name: str, hist: Histogram, **labels: str) -> list[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip(hist.buckets, hist.counts):
+        cumulative += count
+        lines.append(f"{name}_bucket{_labels(**labels, le=repr(float(bound)))} {cumulative}")
+    lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {hist.count}")
+    lines.append(f"{name}_sum{_labels(**labels)} {hist.sum:.6f}")
+    lines.append(f"{name}_count{_labels(**labels)} {hist.count}")
+    return lines
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _sql_usage.get() is not None:
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    usage = _sql_usage.get()
+    started = conn.info.get("metrics_started")
+    if usage is not None and started:
+        usage[0] += 1
+        usage[1] += time.perf_counter() - started.pop()
+
+
+def init_metrics(app: Flask) -> None:
+    """Install request hooks, SQL listeners and the ``/metrics`` route."""
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_started = time.perf_counter()
+        g.metrics_sql_token = _sql_usage.set([0, 0.0])
+
+    @app.after_request
+    def _record(response):
+        started = g.pop("metrics_started", None)
+        if started is not None:
+            sql = _sql_usage.get()
+            _sql_usage.reset(g.pop("metrics_sql_token"))
+            metrics.observe_request(
+                request.endpoint or "unmatched",
+                request.method,
+                response.status_code,
+                time.perf_counter() - started,
+                sql,
+            )
+        return response
+
+    def metrics_view():
+        pool = pool_stats.snapshot(db.engine)
+        return Response(metrics.render(pool), mimetype="text/plain; version=0.0.4")
+
+    app.add_url_rule("/metrics", "metrics", metrics_view, methods=["GET"])
@@ -1,17 +1,29 @@
 from .user import User
 from .organization import Organization, OrganizationMember
 from .task import Task
+from .subtask import Subtask
 from .roadmap import RoadmapPhase, RoadmapMilestone
 from .team import Team
 from .project import Project
+from .event import OrgEvent
+from .job import Job
+from .task_event import TaskEvent
+from .cache_generation import CacheGeneration
+from .project_stats import ProjectStats
 
 __all__ = [
     "User",
     "Organization",
     "OrganizationMember",
     "Task",
+    "Subtask",
     "RoadmapPhase",
     "RoadmapMilestone",
     "Team",
     "Project",
+    "OrgEvent",
+    "Job",
+    "TaskEvent",
+    "CacheGeneration",
+    "ProjectStats",
 ]
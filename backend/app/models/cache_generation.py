@@ -0,0 +1,10 @@
+from ..extensions import db
+
+
+class CacheGeneration(db.Model):
+    """Write counter per org; the list response cache keys entries by it."""
+
+    __tablename__ = "cache_generations"
+
+    organization_id = db.Column(db.String(36), primary_key=True)
+    generation = db.Column(db.BigInteger, nullable=False, default=0)
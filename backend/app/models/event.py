@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from ..extensions import db
+
+
+class OrgEvent(db.Model):
+    """Append-only log of committed changes, read by the SSE event streams."""
+
+    __tablename__ = "org_events"
+    __table_args__ = (
+        db.Index("ix_org_events_org_id", "organization_id", "id"),
+        # Never reuse ids of pruned rows: clients resume by id.
+        {"sqlite_autoincrement": True},
+    )
+
+    id = db.Column(db.BigInteger().with_variant(db.Integer, "sqlite"), primary_key=True, autoincrement=True)
+    organization_id = db.Column(db.String(36), nullable=False)
+    resource = db.Column(db.String(32), nullable=False)
+    action = db.Column(db.String(16), nullable=False)
+    resource_id = db.Column(db.String(36), nullable=True)
+    version = db.Column(db.Integer, nullable=True)
+    data = db.Column(db.JSON, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
@@ -0,0 +1,37 @@
+import uuid
+from datetime import datetime
+
+from ..extensions import db
+
+
+def _uuid() -> str:
+    return str(uuid.uuid4())
+
+
+class Job(db.Model):
+    """A unit of background work, claimed and run by ``app.jobs.WorkerPool``."""
+
+    __tablename__ = "jobs"
+    __table_args__ = (db.Index("ix_jobs_claim", "status", "run_at"),)
+
+    id = db.Column(db.String(36), primary_key=True, default=_uuid)
+    kind = db.Column(db.String(64), nullable=False)
+    organization_id = db.Column(db.String(36), db.ForeignKey("organizations.id"), nullable=True, index=True)
+    created_by = db.Column(db.String(36), db.ForeignKey("users.id"), nullable=True)
+    # queued -> running -> succeeded | failed | cancelled (running -> queued on retry)
+    status = db.Column(db.String(16), nullable=False, default="queued")
+    payload = db.Column(db.JSON, nullable=False, default=dict)
+    result = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    progress = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Integer, nullable=True)
+    message = db.Column(db.String(255), nullable=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=3)
+    cancel_requested = db.Column(db.Boolean, nullable=False, default=False)
+    run_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    locked_by = db.Column(db.String(64), nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
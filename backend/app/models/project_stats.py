@@ -0,0 +1,18 @@
+from ..extensions import db
+
+
+class ProjectStats(db.Model):
+    """Task counters per project, kept up to date by every task write (``app/project_stats.py``)."""
+
+    __tablename__ = "project_stats"
+
+    project_id = db.Column(db.String(36), primary_key=True)
+    tasks = db.Column(db.Integer, nullable=False, default=0)
+    pending = db.Column(db.Integer, nullable=False, default=0)
+    in_progress = db.Column(db.Integer, nullable=False, default=0)
+    completed = db.Column(db.Integer, nullable=False, default=0)
+    blocked = db.Column(db.Integer, nullable=False, default=0)
+    estimated_hours = db.Column(db.Float, nullable=False, default=0)
+    actual_hours = db.Column(db.Float, nullable=False, default=0)
+    # Sum of task progress, completed tasks counting as 100.
+    progress_sum = db.Column(db.BigInteger, nullable=False, default=0)
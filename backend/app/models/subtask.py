@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from ..extensions import db
+
+
+class Subtask(db.Model):
+    """A checklist item of a task; ``Task.subtasks_total``/``subtasks_completed`` roll them up."""
+
+    __tablename__ = "subtasks"
+
+    task_id = db.Column(db.String(36), db.ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    # Chosen by the client (the web app uses UUIDs), unique within the task.
+    id = db.Column(db.String(64), primary_key=True)
+    title = db.Column(db.String(255), nullable=False)
+    status = db.Column(db.String(50), nullable=False, default="pending")
+    position = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -28,9 +28,25 @@ class Task(db.Model):
     dependencies = db.Column(db.JSON, nullable=False, default=list)
     tags = db.Column(db.JSON, nullable=False, default=list)
     progress = db.Column(db.Integer, nullable=False, default=0)
-    subtasks = db.Column(db.JSON, nullable=False, default=list)
+    # Rolled up from the ``subtasks`` table in the same transaction as each subtask write.
+    subtasks_total = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    subtasks_completed = db.Column(db.Integer, nullable=False, default=0, server_default="0")
     blocked_reason = db.Column(db.Text, nullable=True)
     created_by = db.Column(db.String(36), db.ForeignKey("users.id"), nullable=True)
     completed_at = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
+    __table_args__ = (
+        # Open tasks by due date, for the per-project "overdue" count.
+        db.Index(
+            "ix_tasks_open_end_date",
+            "organization_id",
+            "end_date",
+            "project_id",
+            postgresql_where=db.text("status <> 'completed'"),
+            sqlite_where=db.text("status <> 'completed'"),
+        ),
+    )
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from ..extensions import db
+
+
+class TaskEvent(db.Model):
+    """Append-only history of task changes, for activity feeds and cycle-time reports.
+
+    Rows are never updated or pruned. ``changes`` holds the values written
+    (camelCase keys); the value before a change is the previous event's.
+    """
+
+    __tablename__ = "task_events"
+    __table_args__ = (
+        db.Index("ix_task_events_org_time", "organization_id", "occurred_at", "id"),
+        db.Index("ix_task_events_task_time", "task_id", "occurred_at", "id"),
+        {"sqlite_autoincrement": True},
+    )
+
+    id = db.Column(db.BigInteger().with_variant(db.Integer, "sqlite"), primary_key=True, autoincrement=True)
+    organization_id = db.Column(db.String(36), nullable=True)
+    # No foreign key: the history outlives deleted tasks.
+    task_id = db.Column(db.String(36), nullable=False)
+    actor_id = db.Column(db.String(36), nullable=True)
+    action = db.Column(db.String(16), nullable=False)
+    changes = db.Column(db.JSON, nullable=True)
+    occurred_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,316 @@
+"""Organization change events, streamed to clients as Server-Sent Events.
+
+Every committed create, update or delete of a task, roadmap phase, milestone
+or team appends a compact row to ``org_events`` in the same transaction as the
+change: ORM flushes are picked up by a session listener, Core writes call
+``record()``. The table is the source of truth for delivery, so events
+written by any worker reach streams served by any other, and a client
+reconnecting with ``Last-Event-ID`` resumes from the log.
+
+``EventHub`` serves the streams in the ASGI mode (``app/asgi.py``): one
+polling query per process feeds per-org sets of asyncio queues, so an idle
+connection costs a queue and a suspended task rather than a thread. The
+Flask route is a fallback for the WSGI servers that polls per connection,
+reading only its org's rows, and ends the stream after
+``EVENTS_WSGI_STREAM_SECONDS``; the browser then reconnects and resumes.
+
+Frames look like::
+
+    id: 42
+    event: change
+    data: {"resource": "tasks", "action": "updated", "id": "...", "version": 3}
+
+A ``reset`` event means the client is too far behind (events pruned, or more
+than ``EVENTS_BACKLOG_LIMIT`` missed) and should refetch everything.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any
+
+from flask import Flask
+from sqlalchemy import Select, delete, event, func, insert, inspect, select
+
+from .extensions import db
+from .models import OrgEvent
+
+logger = logging.getLogger(__name__)
+
+# table name -> resource name used in events (same names as the export)
+RESOURCES = {
+    "tasks": "tasks",
+    "roadmap_phases": "phases",
+    "roadmap_milestones": "milestones",
+    "teams": "teams",
+}
+
+HEARTBEAT = b": keep-alive\n\n"
+RETRY_MS = 2_000
+GAP_TIMEOUT = 5.0
+LOG_BATCH = 5_000
+
+
+def _row(org_id: str, resource: str, action: str, resource_id: str | None = None,
+         version: int | None = None, data: dict[str, Any] | None = None) -> dict[str, Any]:
+    return {
+        "organization_id": org_id,
+        "resource": resource,
+        "action": action,
+        "resource_id": resource_id,
+        "version": version,
+        "data": data,
+        "created_at": datetime.utcnow(),
+    }
+
+
+def record(org_id: str | None, table_name: str, action: str, resource_id: str | None = None,
+           version: int | None = None, data: dict[str, Any] | None = None) -> None:
+    """Append an event for a Core write; it commits with the current transaction."""
+    resource = RESOURCES.get(table_name)
+    if resource is None or not org_id:
+        return
+    db.session.execute(insert(OrgEvent.__table__), [_row(org_id, resource, action, resource_id, version, data)])
+
+
+def _after_flush(session, flush_context) -> None:
+    rows = []
+    for action, objects in (("created", session.new), ("updated", session.dirty), ("deleted", session.deleted)):
+        for obj in objects:
+            resource = RESOURCES.get(getattr(obj, "__tablename__", ""))
+            if resource is None:
+                continue
+            if action == "updated":
+                if not session.is_modified(obj, include_collections=False):
+                    continue
+                # A row moved between orgs is gone from the org it left.
+                for old_org in inspect(obj).attrs.organization_id.history.deleted:
+                    if old_org:
+                        rows.append(_row(old_org, resource, "deleted", obj.id, obj.version))
+            if obj.organization_id:
+                rows.append(_row(obj.organization_id, resource, action, obj.id, obj.version))
+    if rows:
+        session.connection().execute(insert(OrgEvent.__table__), rows)
+
+
+def init_org_events(app: Flask) -> None:
+    if not event.contains(db.session, "after_flush", _after_flush):
+        event.listen(db.session, "after_flush", _after_flush)
+
+
+def to_frame(row: Any) -> bytes:
+    payload: dict[str, Any] = {"resource": row.resource, "action": row.action}
+    if row.resource_id is not None:
+        payload["id"] = row.resource_id
+    if row.version is not None:
+        payload["version"] = row.version
+    if row.data:
+        payload.update(row.data)
+    return f"id: {row.id}\nevent: change\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n".encode()
+
+
+def reset_frame(latest_id: int) -> bytes:
+    return f"id: {latest_id}\nevent: reset\ndata: {{}}\n\n".encode()
+
+
+def retry_frame(milliseconds: int) -> bytes:
+    return f"retry: {milliseconds}\n\n".encode()
+
+
+def parse_last_event_id(header: str | None, query: str | None) -> int | None:
+    """``Last-Event-ID`` (sent by EventSource on reconnect), else ``?lastEventId=``."""
+    for value in (header, query):
+        if value and value.strip().isdigit():
+            return int(value)
+    return None
+
+
+def latest_id_query() -> Select:
+    return select(func.coalesce(func.max(OrgEvent.id), 0))
+
+
+def oldest_id_query() -> Select:
+    return select(func.min(OrgEvent.id))
+
+
+def backlog_query(org_id: str, after: int, limit: int) -> Select:
+    return (
+        select(OrgEvent.__table__)
+        .where(OrgEvent.organization_id == org_id, OrgEvent.id > after)
+        .order_by(OrgEvent.id)
+        .limit(limit)
+    )
+
+
+def replay(after: int, latest: int, oldest: int | None, backlog: list[Any], limit: int) -> tuple[list[bytes], set[int]]:
+    """Frames resuming a stream after event ``after``, and the ids they cover.
+
+    ``backlog`` is ``backlog_query(org, after, limit)``. When it may be
+    incomplete (pruned or over the limit) the client gets a reset instead.
+    """
+    if (oldest is not None and after + 1 < oldest) or len(backlog) >= limit:
+        return [reset_frame(latest)], set()
+    return [to_frame(row) for row in backlog], {row.id for row in backlog}
+
+
+def prune(older_than: timedelta) -> int:
+    """Delete events older than ``older_than``; returns the number removed."""
+    # Ids are never reused (AUTOINCREMENT on SQLite, a sequence on Postgres),
+    # so clients holding a pruned id get a reset rather than other events.
+    result = db.session.execute(delete(OrgEvent).where(OrgEvent.created_at < datetime.utcnow() - older_than))
+    db.session.commit()
+    return result.rowcount
+
+
+def log_query(after: int, limit: int) -> Select:
+    return select(OrgEvent.__table__).where(OrgEvent.id > after).order_by(OrgEvent.id).limit(limit)
+
+
+class Cursor:
+    """Read position in the log that tolerates ids becoming visible out of order.
+
+    On Postgres, ids are assigned before commit, so a lower id can become
+    visible after a higher one. ``position`` only advances over contiguous
+    ids; rows past a gap are returned once and remembered. Each missing id
+    is timed from when a higher id first showed it missing, and skipped once
+    it has stayed missing for ``gap_timeout`` (a rolled-back insert, or
+    another org's event when reading ``backlog_query``, never fills it), so
+    an old gap never carries a newer one along with it.
+    """
+
+    def __init__(self, position: int, gap_timeout: float) -> None:
+        self.position = position
+        self.gap_timeout = gap_timeout
+        self._seen: set[int] = set()
+        # missing id -> when it was first found missing
+        self._missing: dict[int, float] = {}
+        self._top = position
+
+    def advance(self, rows: list[Any]) -> list[Any]:
+        """Rows from ``log_query(self.position, ...)`` (or ``backlog_query``) not returned before."""
+        now = time.monotonic()
+        fresh = [row for row in rows if row.id not in self._seen]
+        for row in fresh:
+            self._seen.add(row.id)
+            self._missing.pop(row.id, None)
+        top = max((row.id for row in fresh), default=self._top)
+        for missing in range(self._top + 1, top):
+            if missing not in self._seen:
+                self._missing[missing] = now
+        self._top = max(self._top, top)
+        while True:
+            following = self.position + 1
+            if following in self._seen:
+                self._seen.discard(following)
+            elif following in self._missing and now - self._missing[following] > self.gap_timeout:
+                del self._missing[following]
+            else:
+                break
+            self.position = following
+        return fresh
+
+
+class _Subscriber:
+    __slots__ = ("queue", "overflowed")
+
+    def __init__(self, size: int) -> None:
+        self.queue: asyncio.Queue[Any] = asyncio.Queue(size)
+        self.overflowed = False
+
+
+class EventHub:
+    """Per-process fan-out of new ``org_events`` rows to subscribed streams.
+
+    A single task reads the log while anyone is subscribed, so the database
+    sees one query per ``poll_interval`` however many streams are open.
+    """
+
+    def __init__(self, sessionmaker: Any, poll_interval: float, queue_size: int,
+                 gap_timeout: float = GAP_TIMEOUT, batch: int = LOG_BATCH) -> None:
+        self.sessionmaker = sessionmaker
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.gap_timeout = gap_timeout
+        self.batch = batch
+        self.cursor = Cursor(0, gap_timeout)
+        self.delivered = 0
+        self._subscribers: dict[str, set[_Subscriber]] = {}
+        self._task: asyncio.Task | None = None
+        self._start_lock = asyncio.Lock()
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    async def subscribe(self, org_id: str) -> _Subscriber:
+        """Register a stream; rows committed after this returns are delivered to it."""
+        async with self._start_lock:
+            if self._task is None or self._task.done():
+                async with self.sessionmaker() as session:
+                    latest = (await session.execute(latest_id_query())).scalar()
+                self.cursor = Cursor(latest, self.gap_timeout)
+                self._task = asyncio.create_task(self._run())
+            subscriber = _Subscriber(self.queue_size)
+            self._subscribers.setdefault(org_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, org_id: str, subscriber: _Subscriber) -> None:
+        subs = self._subscribers.get(org_id)
+        if subs is not None:
+            subs.discard(subscriber)
+            if not subs:
+                del self._subscribers[org_id]
+
+    async def close(self) -> None:
+        """Stop polling and end every stream (``None`` tells a stream to finish)."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for subs in self._subscribers.values():
+            for subscriber in subs:
+                subscriber.overflowed = True
+                if not subscriber.queue.full():
+                    subscriber.queue.put_nowait(None)
+        self._subscribers.clear()
+
+    async def _run(self) -> None:
+        while self._subscribers:
+            try:
+                await self._poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # noqa: BLE001 - keep serving; the next poll retries
+                logger.exception("Polling org_events failed")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _poll(self) -> None:
+        async with self.sessionmaker() as session:
+            rows = (await session.execute(log_query(self.cursor.position, self.batch))).all()
+        self._dispatch(self.cursor.advance(rows))
+
+    def _dispatch(self, rows: list[Any]) -> None:
+        for row in rows:
+            subs = self._subscribers.get(row.organization_id)
+            if not subs:
+                continue
+            frame = (row.id, to_frame(row))
+            for subscriber in subs:
+                if subscriber.overflowed:
+                    continue
+                try:
+                    subscriber.queue.put_nowait(frame)
+                    self.delivered += 1
+                except asyncio.QueueFull:
+                    # A stalled client; its stream ends and it resumes from the log.
+                    subscriber.overflowed = True
+
+    def metric_lines(self, pid: str) -> list[str]:
+        return [
+            "# TYPE org_events_subscribers gauge",
+            f'org_events_subscribers{{pid="{pid}"}} {self.subscriber_count}',
+            "# TYPE org_events_delivered_total counter",
+            f'org_events_delivered_total{{pid="{pid}"}} {self.delivered}',
+        ]
@@ -0,0 +1,95 @@
+"""Single-statement partial updates for PATCH endpoints.
+
+Only the fields present in the payload are written, with one
+``UPDATE ... RETURNING`` that also hands back the full row, so a PATCH is
+one database round trip and never loads ORM objects. ``updated_at`` is
+refreshed by the column's ``onupdate`` and ``version`` is incremented; with
+an expected version (from ``If-Match``) the UPDATE is a compare-and-swap.
+Returned rows expose columns as attributes, so the usual ``_xxx_to_dict``
+serializers apply.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Mapping, Tuple, Union
+
+from flask import abort
+from pydantic import BaseModel
+from sqlalchemy import Row, Table, select, update
+
+from .extensions import db
+from .org_events import record
+from .response_cache import touch
+from .versioning import VersionConflict
+
+# payload field -> column name, or (column name, converter)
+FieldSpec = Union[str, Tuple[str, Callable[[Any], Any]]]
+
+
+def patch_values(table: Table, data: BaseModel, fields: Mapping[str, FieldSpec]) -> dict[str, Any]:
+    """Column values for the fields the client sent, explicit nulls included.
+
+    Raises ``ValueError`` when a null is sent for a non-nullable column.
+    """
+    values: dict[str, Any] = {}
+    not_nullable = []
+    for key in data.model_fields_set:
+        spec = fields.get(key)
+        if spec is None:
+            continue
+        column, convert = (spec, None) if isinstance(spec, str) else spec
+        value = getattr(data, key)
+        if convert is not None:
+            value = convert(value)
+        if value is None and not table.c[column].nullable:
+            not_nullable.append(key)
+            continue
+        values[column] = value
+    if not_nullable:
+        raise ValueError(f"{', '.join(sorted(not_nullable))} cannot be null")
+    return values
+
+
+def update_returning(
+    table: Table,
+    row_id: str,
+    values: dict[str, Any],
+    expected_version: int | None = None,
+    before_commit: Callable[[Row], None] | None = None,
+) -> Row:
+    """Apply ``values`` to one row and return it.
+
+    Aborts with 404 for unknown ids and raises ``VersionConflict`` when the
+    row is no longer at ``expected_version``. ``before_commit`` is called with
+    the updated row for dependent writes that must commit along with it.
+    """
+    if values:
+        old_org = None
+        if "organization_id" in values:
+            # Moving a row between orgs invalidates the org it leaves.
+            old_org = db.session.execute(select(table.c.organization_id).where(table.c.id == row_id)).scalar()
+            touch(old_org)
+        values = {**values, "version": table.c.version + 1}
+        stmt = update(table).where(table.c.id == row_id)
+        if expected_version is not None:
+            stmt = stmt.where(table.c.version == expected_version)
+        row = db.session.execute(stmt.values(values).returning(*table.c)).one_or_none()
+        if row is not None:
+            touch(row.organization_id)
+            if old_org and old_org != row.organization_id:
+                record(old_org, table.name, "deleted", row.id, row.version)
+            record(row.organization_id, table.name, "updated", row.id, row.version)
+            if before_commit is not None:
+                before_commit(row)
+        db.session.commit()
+        if row is None and expected_version is not None:
+            # Only the failure path pays for telling "gone" from "changed".
+            current = db.session.execute(select(table.c.version).where(table.c.id == row_id)).scalar()
+            if current is not None:
+                raise VersionConflict(current)
+    else:
+        row = db.session.execute(select(table).where(table.c.id == row_id)).one_or_none()
+        if row is not None and expected_version is not None and row.version != expected_version:
+            raise VersionConflict(row.version)
+    if row is None:
+        abort(404)
+    return row
@@ -0,0 +1,156 @@
+"""On-demand profiling of single requests.
+
+An admin (see ``ADMIN_EMAILS``) sends ``X-Profile: 1`` and that one request
+runs under cProfile. The stats are dumped to ``PROFILE_DIR`` (default
+``instance/profiles``) as a ``.prof`` file readable by ``pstats`` or
+snakeviz, next to a small JSON description, and the response carries an
+``X-Profile-Id`` header. The body is profiled as the server reads it, so
+streamed responses are not buffered; their profile is saved when the
+stream ends. Requests without the header only pay for one environ lookup.
+"""
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Iterable, Iterator
+
+from flask import Flask
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+
+class ProfileOnDemandMiddleware:
+    def __init__(self, wsgi_app, app: Flask, directory: str) -> None:
+        self.wsgi_app = wsgi_app
+        self.app = app
+        self.directory = directory
+
+    def __call__(self, environ, start_response):
+        if environ.get("HTTP_X_PROFILE") != "1" or not self._authorized(environ):
+            return self.wsgi_app(environ, start_response)
+        return self._profile(environ, start_response)
+
+    def _authorized(self, environ) -> bool:
+        from .blueprints.admin import is_admin
+
+        with self.app.request_context(environ):
+            try:
+                verify_jwt_in_request()
+            except Exception:  # noqa: BLE001 - unauthenticated requests just aren't profiled
+                return False
+            return is_admin(get_jwt_identity())
+
+    def _profile(self, environ, start_response):
+        profile_id = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        status_holder: dict[str, str] = {}
+
+        def _start_response(status, headers, exc_info=None):
+            status_holder["status"] = status
+            return start_response(status, list(headers) + [("X-Profile-Id", profile_id)], exc_info)
+
+        profiler = cProfile.Profile()
+        return _ProfiledBody(
+            profiler,
+            lambda: self.wsgi_app(environ, _start_response),
+            lambda elapsed: self._save(profiler, profile_id, environ, status_holder.get("status"), elapsed),
+        )
+
+    def _save(self, profiler: cProfile.Profile, profile_id: str, environ, status: str | None, elapsed: float) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        profiler.dump_stats(os.path.join(self.directory, f"{profile_id}.prof"))
+        meta = {
+            "id": profile_id,
+            "at": datetime.utcnow().isoformat(),
+            "method": environ.get("REQUEST_METHOD"),
+            "path": environ.get("PATH_INFO"),
+            "query": environ.get("QUERY_STRING") or None,
+            "status": status,
+            "durationMs": round(elapsed * 1000, 3),
+        }
+        with open(os.path.join(self.directory, f"{profile_id}.json"), "w") as fh:
+            json.dump(meta, fh)
+
+
+class _ProfiledBody:
+    """A response body produced under the profiler one chunk at a time.
+
+    Nothing is buffered, so streamed responses (SSE, exports) flow as usual.
+    Only the time spent producing chunks is profiled, not the waits between
+    them, and the stats are saved on ``close()``, once the server is done
+    with the response.
+    """
+
+    def __init__(self, profiler: cProfile.Profile, run: Callable[[], Iterable[bytes]],
+                 save: Callable[[float], None]) -> None:
+        self.profiler = profiler
+        self.elapsed = 0.0
+        self._save = save
+        try:
+            self._app_iter = self._timed(run)
+            self._iterator = self._timed(lambda: iter(self._app_iter))
+        except BaseException:
+            save(self.elapsed)
+            raise
+
+    def _timed(self, fn: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        self.profiler.enable()
+        try:
+            return fn()
+        finally:
+            self.profiler.disable()
+            self.elapsed += time.perf_counter() - started
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self
+
+    def __next__(self) -> bytes:
+        return self._timed(lambda: next(self._iterator))
+
+    def close(self) -> None:
+        try:
+            if hasattr(self._app_iter, "close"):
+                self._timed(self._app_iter.close)
+        finally:
+            self._save(self.elapsed)
+
+
+def profile_dir(app: Flask) -> str:
+    return app.config.get("PROFILE_DIR") or os.path.join(app.instance_path, "profiles")
+
+
+def list_profiles(directory: str) -> list[dict[str, Any]]:
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        if name.endswith(".json"):
+            with open(os.path.join(directory, name)) as fh:
+                profiles.append(json.load(fh))
+    return profiles
+
+
+def profile_path(directory: str, profile_id: str) -> str | None:
+    """Path of a saved profile, or ``None`` for unknown or malformed ids."""
+    if not profile_id or os.path.basename(profile_id) != profile_id:
+        return None
+    path = os.path.join(directory, f"{profile_id}.prof")
+    return path if os.path.isfile(path) else None
+
+
+def render_stats(path: str, sort: str = "cumulative", limit: int = 40) -> str:
+    out = io.StringIO()
+    stats = pstats.Stats(path, stream=out)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+def init_profiling(app: Flask) -> None:
+    if not app.config.get("PROFILING_ENABLED", True):
+        return
+    app.wsgi_app = ProfileOnDemandMiddleware(app.wsgi_app, app, profile_dir(app))
@@ -0,0 +1,236 @@
+"""Per-project task rollups for ``GET /api/projects/?include=stats``.
+
+Counts, hours and summed progress live in ``project_stats``, one row per
+project, and every task write moves them by its own contribution in the same
+transaction (``SET tasks = tasks + 1``), like the subtask counters on a
+task: ORM flushes (task create, ``PUT``, delete) through a session
+listener, ``PATCH`` and subtask changes through :func:`record_change`, and
+imports and generated data through :func:`record_inserted`, one upsert per
+batch. Reading the list is then a join on the project rows whatever the
+number of tasks.
+
+A relative update needs the values it replaces. ``PATCH`` reads them only
+when it writes a column the rollup depends on (:data:`STATS_COLUMNS`), and
+its UPDATE then only applies at the version it read (:func:`with_snapshot`),
+since SQLite takes no lock on that read. Subtask toggles derive the old
+progress from the counters, since a task with subtasks always has the
+derived progress; adding the first one reads it like ``PATCH`` does.
+
+"Overdue" depends on the date rather than on writes, so it is not stored: it
+is counted when the list is read, from the partial index of open tasks by
+end date (``ix_tasks_open_end_date``), which holds unfinished tasks only.
+"""
+from __future__ import annotations
+
+import importlib
+from datetime import date, datetime
+from typing import Any, Callable, Iterable, Mapping, TypeVar
+
+from flask import Flask
+from sqlalchemy import Row, Select, event, func, insert, inspect, literal_column, select, update
+
+from .extensions import db
+from .models import Project, ProjectStats, Task
+from .versioning import VersionConflict
+
+STATUSES = ("pending", "in-progress", "completed", "blocked")
+COMPLETED = "completed"
+
+# Task columns a project's rollup depends on.
+STATS_COLUMNS = ("project_id", "status", "progress", "estimated_hours", "actual_hours")
+
+_COUNTERS = ("tasks", *(status.replace("-", "_") for status in STATUSES), "estimated_hours", "actual_hours",
+             "progress_sum")
+
+Deltas = dict[str, dict[str, float]]
+T = TypeVar("T")
+
+# Reads of the old values before a write gives up on a busy task (412).
+SNAPSHOT_ATTEMPTS = 3
+
+
+def contribution(task: Mapping[str, Any]) -> dict[str, float]:
+    """What one task adds to its project's counters."""
+    status = task["status"]
+    values = {
+        "tasks": 1,
+        "estimated_hours": task["estimated_hours"] or 0,
+        "actual_hours": task["actual_hours"] or 0,
+        # Completed tasks count as done whatever progress they were left at.
+        "progress_sum": 100 if status == COMPLETED else task["progress"] or 0,
+    }
+    if status in STATUSES:
+        values[status.replace("-", "_")] = 1
+    return values
+
+
+def add(deltas: Deltas, task: Mapping[str, Any] | None, sign: int = 1) -> None:
+    """Accumulate ``task``'s contribution (``sign=-1`` takes it away)."""
+    if task is None or task["project_id"] is None:
+        return
+    counters = deltas.setdefault(task["project_id"], dict.fromkeys(_COUNTERS, 0))
+    for column, value in contribution(task).items():
+        counters[column] += sign * value
+
+
+def apply(session, deltas: Deltas) -> None:
+    """Move the counters by ``deltas``, creating rows for projects seen for the first time."""
+    table = ProjectStats.__table__
+    # Sorted, so concurrent transactions lock stats rows in one order.
+    rows = [{"project_id": project_id, **counters} for project_id, counters in sorted(deltas.items())
+            if any(counters.values())]
+    if not rows:
+        return
+    dialect = session.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        upsert = importlib.import_module(f"sqlalchemy.dialects.{dialect}").insert
+        stmt = upsert(table)
+        session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.project_id],
+                set_={column: table.c[column] + stmt.excluded[column] for column in _COUNTERS},
+            ),
+            rows,
+        )
+        return
+    ids = [row["project_id"] for row in rows]
+    known = set(session.execute(
+        select(table.c.project_id).where(table.c.project_id.in_(ids)).with_for_update()
+    ).scalars())
+    for row in rows:
+        if row["project_id"] in known:
+            session.execute(
+                update(table)
+                .where(table.c.project_id == row["project_id"])
+                .values({column: table.c[column] + row[column] for column in _COUNTERS})
+            )
+    missing = [row for row in rows if row["project_id"] not in known]
+    if missing:
+        session.execute(insert(table), missing)
+
+
+def snapshot(task_id: str) -> Row | None:
+    """The task's :data:`STATS_COLUMNS` and ``version``, row-locked (on Postgres) until commit."""
+    tasks = Task.__table__
+    stmt = select(*(tasks.c[column] for column in STATS_COLUMNS), tasks.c.version).where(tasks.c.id == task_id)
+    return db.session.execute(stmt.with_for_update()).one_or_none()
+
+
+def with_snapshot(task_id: str, expected_version: int | None,
+                  write: Callable[[Row | None, int | None], T]) -> T:
+    """Run ``write(old, version)`` with the task's :func:`snapshot` taken first.
+
+    ``write`` must only apply at ``version`` (compare-and-swap), so ``old`` is
+    exactly the row it replaces. A miss raises ``VersionConflict``: with
+    ``If-Match`` that is the client's 412, otherwise another write got in
+    after the read, and the snapshot is taken again.
+    """
+    attempts = SNAPSHOT_ATTEMPTS
+    while True:
+        old = snapshot(task_id)
+        if old is None:
+            return write(None, expected_version)  # unknown task: 404
+        if expected_version is not None and old.version != expected_version:
+            db.session.rollback()
+            raise VersionConflict(old.version)
+        try:
+            return write(old, old.version)
+        except VersionConflict:
+            attempts -= 1
+            if expected_version is not None or not attempts:
+                raise
+
+
+def record_change(old: Mapping[str, Any] | None, new: Mapping[str, Any] | None) -> None:
+    """Replace a task's contribution ``old`` with ``new`` in the current transaction."""
+    deltas: Deltas = {}
+    add(deltas, old, -1)
+    add(deltas, new)
+    apply(db.session, deltas)
+
+
+def record_inserted(rows: Iterable[Mapping[str, Any]]) -> None:
+    """Count Core-inserted task rows, one upsert for the lot."""
+    deltas: Deltas = {}
+    for row in rows:
+        add(deltas, row)
+    apply(db.session, deltas)
+
+
+def _values(obj: Task, old: bool = False) -> dict[str, Any]:
+    """``obj``'s stats columns as flushed, or as they were before (``old``)."""
+    attrs = inspect(obj).attrs
+    values = {}
+    for column in STATS_COLUMNS:
+        history = attrs[column].history
+        values[column] = history.deleted[0] if old and history.deleted else getattr(obj, column)
+    return values
+
+
+def _after_flush(session, flush_context) -> None:
+    deltas: Deltas = {}
+    for obj in session.new:
+        if isinstance(obj, Task):
+            add(deltas, _values(obj))
+    for obj in session.dirty:
+        if isinstance(obj, Task) and any(inspect(obj).attrs[c].history.has_changes() for c in STATS_COLUMNS):
+            add(deltas, _values(obj, old=True), -1)
+            add(deltas, _values(obj))
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            add(deltas, _values(obj, old=True), -1)
+    if deltas:
+        apply(session, deltas)
+
+
+def init_project_stats(app: Flask) -> None:
+    if not event.contains(db.session, "after_flush", _after_flush):
+        event.listen(db.session, "after_flush", _after_flush)
+
+
+def current_day() -> date:
+    """The (UTC) date "overdue" is evaluated against."""
+    return datetime.utcnow().date()
+
+
+def overdue_subquery(organization_id: str | None, today: date):
+    tasks = Task.__table__
+    stmt = select(tasks.c.project_id, func.count().label("overdue")).where(
+        # Spelled like the partial index's predicate, so SQLite can use it.
+        tasks.c.status != literal_column(f"'{COMPLETED}'"),
+        tasks.c.end_date < today,
+        tasks.c.project_id.is_not(None),
+    )
+    if organization_id:
+        stmt = stmt.where(tasks.c.organization_id == organization_id)
+    return stmt.group_by(tasks.c.project_id).subquery("overdue")
+
+
+def projects_with_stats_query(organization_id: str | None, today: date | None = None) -> Select:
+    """``(Project, <project_stats counters>, overdue)`` rows, newest first."""
+    stats = ProjectStats.__table__
+    overdue = overdue_subquery(organization_id, today or current_day())
+    stmt = (
+        select(Project, *(stats.c[column] for column in _COUNTERS), overdue.c.overdue)
+        .outerjoin(stats, stats.c.project_id == Project.id)
+        .outerjoin(overdue, overdue.c.project_id == Project.id)
+    )
+    if organization_id:
+        stmt = stmt.where(Project.organization_id == organization_id)
+    return stmt.order_by(Project.created_at.desc())
+
+
+def stats_to_dict(row: Any) -> dict[str, Any]:
+    """The ``stats`` object of one row of :func:`projects_with_stats_query`."""
+    values = row._mapping
+    total = values["tasks"] or 0
+    completed = values["completed"] or 0
+    return {
+        "tasks": total,
+        "byStatus": {status: values[status.replace("-", "_")] or 0 for status in STATUSES},
+        "open": total - completed,
+        "overdue": row.overdue or 0,
+        "estimatedHours": round(float(row.estimated_hours or 0), 2),
+        "actualHours": round(float(row.actual_hours or 0), 2),
+        "percentComplete": round(row.progress_sum / total) if total else 0,
+    }
@@ -0,0 +1,170 @@
+"""Per-request SQL tracking, N+1 detection and query budgets.
+
+Meant for development and tests (``QUERY_TRACKING=1``). Every statement run
+while handling a request is recorded; statements that repeat with only their
+parameters changing are reported as N+1 patterns, and views decorated with
+:func:`query_budget` fail when they run more statements than declared.
+
+In tests, use :func:`track_queries` directly::
+
+    with track_queries() as tracker:
+        client.get("/api/auth/me", headers=auth)
+    tracker.check(budget=2)
+"""
+from __future__ import annotations
+
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, TypeVar
+
+from flask import Flask, current_app, g, jsonify, request
+from sqlalchemy import event
+
+from .extensions import db
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+_IN_LIST = re.compile(r"\bIN \((?:[^()]*?)\)", re.IGNORECASE)
+_POSTCOMPILE = re.compile(r"\(?__\[POSTCOMPILE_\w+\]\)?")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    def __init__(self, report: dict) -> None:
+        super().__init__(report["message"])
+        self.report = report
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so calls differing only in parameters compare equal."""
+    shape = _POSTCOMPILE.sub("(?)", statement)
+    shape = _IN_LIST.sub("IN (?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryTracker:
+    def __init__(self) -> None:
+        self.statements: list[tuple[str, object]] = []
+
+    def record(self, statement: str, parameters: object) -> None:
+        self.statements.append((statement, parameters))
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, threshold: int) -> list[dict]:
+        """Statement shapes run at least ``threshold`` times with differing parameters."""
+        shapes = Counter(statement_shape(s) for s, _ in self.statements)
+        result = []
+        for shape, count in shapes.most_common():
+            if count < threshold:
+                break
+            params = {repr(p) for s, p in self.statements if statement_shape(s) == shape}
+            if len(params) > 1:
+                result.append({"statement": shape, "count": count})
+        return result
+
+    def report(self, budget: int | None = None, threshold: int = 3) -> dict | None:
+        """Describe budget and N+1 violations, or ``None`` when within limits."""
+        repeated = self.repeated(threshold)
+        over_budget = budget is not None and self.count > budget
+        if not repeated and not over_budget:
+            return None
+        reasons = []
+        if over_budget:
+            reasons.append(f"{self.count} queries exceed budget of {budget}")
+        if repeated:
+            reasons.append(f"{len(repeated)} repeated statement shape(s) (possible N+1)")
+        return {
+            "message": "; ".join(reasons),
+            "queries": self.count,
+            "budget": budget,
+            "repeated": repeated,
+        }
+
+    def check(self, budget: int | None = None, threshold: int = 3) -> None:
+        report = self.report(budget, threshold)
+        if report is not None:
+            raise QueryBudgetExceeded(report)
+
+
+_tracker: ContextVar[QueryTracker | None] = ContextVar("query_tracker", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryTracker]:
+    tracker = QueryTracker()
+    token = _tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _tracker.reset(token)
+
+
+@contextmanager
+def untracked() -> Iterator[None]:
+    """Leave statements out of the current tracker (infrastructure, not the view)."""
+    token = _tracker.set(None)
+    try:
+        yield
+    finally:
+        _tracker.reset(token)
+
+
+def query_budget(max_queries: int) -> Callable[[F], F]:
+    """Declare the maximum number of SQL statements a view may run."""
+
+    def decorator(view: F) -> F:
+        view._query_budget = max_queries  # type: ignore[attr-defined]
+        return view
+
+    return decorator
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    tracker = _tracker.get()
+    if tracker is not None:
+        tracker.record(statement, parameters)
+
+
+def init_query_budget(app: Flask) -> None:
+    """Record statements per request and enforce budgets when ``QUERY_TRACKING`` is on."""
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", _before_cursor_execute)
+
+    if not app.config.get("QUERY_TRACKING"):
+        return
+
+    @app.before_request
+    def _start_tracking():
+        g.query_budget_token = _tracker.set(QueryTracker())
+
+    @app.after_request
+    def _check_budget(response):
+        token = g.pop("query_budget_token", None)
+        if token is None:
+            return response
+        tracker = _tracker.get()
+        _tracker.reset(token)
+
+        view = current_app.view_functions.get(request.endpoint or "")
+        budget = getattr(view, "_query_budget", None)
+        report = tracker.report(budget, current_app.config["N_PLUS_ONE_THRESHOLD"])
+        response.headers["X-Query-Count"] = str(tracker.count)
+        if report is None:
+            return response
+
+        report["endpoint"] = request.endpoint
+        logger.warning("Query budget violation on %s: %s", request.endpoint, report["message"])
+        if current_app.config["QUERY_BUDGET_MODE"] != "raise":
+            return response
+        failed = jsonify({**report, "message": f"Query budget exceeded: {report['message']}"})
+        failed.status_code = 500
+        failed.headers["X-Query-Count"] = str(tracker.count)
+        return failed
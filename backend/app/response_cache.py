@@ -0,0 +1,284 @@
+"""Org-scoped cache for list responses, invalidated by generation counters.
+
+``@cached("tasks")`` on a list view stores its serialized 200 response under
+``(org, generation, resource, query params[, user])``. Every committed write
+touching an org bumps that org's generation, so all of its cached lists go
+stale at once without tracking individual keys; the orphaned entries age
+out of the LRU.
+
+Writes are picked up from ORM flushes (any row with an ``organization_id``)
+and from Core statements that call ``touch(org_id)``. Generations live in
+the ``cache_generations`` table and are bumped in the same transaction as the
+write, so every worker sees a write's new generation exactly when it sees
+the write: there is no window where another process serves the old list.
+Reading a generation is one primary-key lookup per cached request. On
+Postgres, concurrent writes to one org queue briefly on its generation row
+at commit time.
+
+Backends (``RESPONSE_CACHE_BACKEND``) only store the entries:
+
+- ``memory``: per-process LRU bounded by ``RESPONSE_CACHE_MAX_BYTES``; each
+  worker fills its own copy.
+- ``redis://...``: shared by all workers (needs the ``redis`` package);
+  eviction is left to Redis' maxmemory policy.
+- ``package.module:Class``: anything with the same methods as
+  ``MemoryBackend``, constructed with the app config.
+"""
+from __future__ import annotations
+
+import hashlib
+import importlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable
+
+from flask import Flask, Response, current_app, make_response, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event, insert, inspect, select, update
+
+from .extensions import db
+from .metrics import metrics
+from .models import CacheGeneration
+from .query_budget import untracked
+
+_TOUCHED = "response_cache_orgs"
+
+
+class MemoryBackend:
+    """In-process LRU with expiry, evicting by total size in bytes."""
+
+    def __init__(self, max_bytes: int, max_entry_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        if len(value) > self.max_entry_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self.bytes += len(value)
+            while self.bytes > self.max_bytes and self._entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self.bytes -= len(value)
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._entries), "bytes": self.bytes, "evictions": self.evictions}
+
+
+class RedisBackend:
+    def __init__(self, url: str, prefix: str = "epcentra:cache:") -> None:
+        try:
+            import redis
+        except ImportError as err:  # pragma: no cover - optional dependency
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis://... needs the redis package") from err
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        self.client.set(self.prefix + key, value, ex=ttl)
+
+    def stats(self) -> dict[str, int]:
+        return {}
+
+
+class ResponseCache:
+    def __init__(self, backend: Any, ttl: int) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits: dict[str, int] = {}
+        self.misses: dict[str, int] = {}
+
+    def key(self, org_id: str, resource: str, scope: str) -> str:
+        return _request_key(org_id, generation(org_id), resource, scope)
+
+    def record(self, resource: str, hit: bool) -> None:
+        with self._lock:
+            counts = self.hits if hit else self.misses
+            counts[resource] = counts.get(resource, 0) + 1
+
+    def metric_lines(self, pid: str) -> list[str]:
+        with self._lock:
+            hits, misses = dict(self.hits), dict(self.misses)
+        lines = ["# TYPE response_cache_hits_total counter"]
+        lines += [f'response_cache_hits_total{{pid="{pid}",resource="{r}"}} {n}' for r, n in sorted(hits.items())]
+        lines.append("# TYPE response_cache_misses_total counter")
+        lines += [f'response_cache_misses_total{{pid="{pid}",resource="{r}"}} {n}' for r, n in sorted(misses.items())]
+        stats = self.backend.stats()
+        if "evictions" in stats:
+            lines += ["# TYPE response_cache_evictions_total counter",
+                      f'response_cache_evictions_total{{pid="{pid}"}} {stats["evictions"]}']
+        for name in ("entries", "bytes"):
+            if name in stats:
+                lines += [f"# TYPE response_cache_{name} gauge", f'response_cache_{name}{{pid="{pid}"}} {stats[name]}']
+        return lines
+
+
+def generation(org_id: str) -> int:
+    """The org's committed write generation, shared by every worker."""
+    table = CacheGeneration.__table__
+    # Cache bookkeeping, not part of the view's query budget.
+    with untracked():
+        stmt = select(table.c.generation).where(table.c.organization_id == org_id)
+        return db.session.execute(stmt).scalar() or 0
+
+
+def _bump(session, org_ids: set[str]) -> None:
+    table = CacheGeneration.__table__
+    dialect = session.get_bind().dialect.name
+    # Sorted, so concurrent transactions lock generation rows in one order.
+    ordered = sorted(org_ids)
+    if dialect in ("postgresql", "sqlite"):
+        upsert = importlib.import_module(f"sqlalchemy.dialects.{dialect}").insert
+        stmt = upsert(table).values([{"organization_id": org_id, "generation": 1} for org_id in ordered])
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=[table.c.organization_id], set_={"generation": table.c.generation + 1},
+        ))
+        return
+    session.execute(
+        update(table).where(table.c.organization_id.in_(ordered)).values(generation=table.c.generation + 1)
+    )
+    known = set(session.execute(select(table.c.organization_id).where(table.c.organization_id.in_(ordered))).scalars())
+    missing = [{"organization_id": org_id, "generation": 1} for org_id in ordered if org_id not in known]
+    if missing:
+        session.execute(insert(table), missing)
+
+
+def _request_key(org_id: str, generation: int, resource: str, scope: str) -> str:
+    args = "&".join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+    digest = hashlib.sha1(args.encode()).hexdigest()[:16]
+    return f"{org_id}:{generation}:{resource}:{scope}:{digest}"
+
+
+def cached(resource: str, vary_on_user: bool = False, vary_on: Callable[[], str] | None = None):
+    """Cache a list view's 200 responses per org (``organizationId`` arg).
+
+    Misses go through the single-flight group (``app/single_flight.py``)
+    when it is enabled, so identical concurrent misses run the view once;
+    the flight key carries the org generation, so a read that starts after
+    a committed write never joins a flight that began before it. Requests
+    without ``organizationId`` are passed straight through. Set
+    ``vary_on_user`` for views whose output depends on the caller, and
+    ``vary_on`` to a callable returning what else it depends on beyond the
+    query string (such as today's date).
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            cache: ResponseCache | None = current_app.extensions.get("response_cache")
+            flights = current_app.extensions.get("single_flight")
+            org_id = request.args.get("organizationId")
+            if cache is None or not org_id:
+                return view(*args, **kwargs)
+            scope = f"user={get_jwt_identity()}" if vary_on_user else "org"
+            if vary_on is not None:
+                scope = f"{scope}:{vary_on()}"
+            key = cache.key(org_id, resource, scope)
+            body = cache.backend.get(key)
+            cache.record(resource, body is not None)
+            if body is not None:
+                response = Response(body, status=200, mimetype="application/json")
+                response.headers["X-Cache"] = "HIT"
+                return response
+
+            def compute() -> tuple[bytes, int, str]:
+                response = make_response(view(*args, **kwargs))
+                body = response.get_data()
+                if response.status_code == 200:
+                    cache.backend.set(key, body, cache.ttl)
+                return body, response.status_code, response.mimetype
+
+            if flights is not None:
+                (body, status, mimetype), shared = flights.do(key, compute, resource)
+            else:
+                (body, status, mimetype), shared = compute(), False
+            response = Response(body, status=status, mimetype=mimetype)
+            response.headers["X-Cache"] = "COALESCED" if shared else "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def touch(*org_ids: str | None) -> None:
+    """Mark orgs as changed by the current transaction (for Core writes)."""
+    if current_app.extensions.get("response_cache") is None:
+        return
+    db.session().info.setdefault(_TOUCHED, set()).update(o for o in org_ids if o)
+
+
+def _after_flush(session, flush_context) -> None:
+    touched = session.info.setdefault(_TOUCHED, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        org_id = getattr(obj, "organization_id", None)
+        if org_id:
+            touched.add(org_id)
+    for obj in session.dirty:
+        if hasattr(obj, "organization_id"):
+            # A row moved between orgs invalidates the old org too.
+            touched.update(o for o in inspect(obj).attrs.organization_id.history.deleted if o)
+
+
+def _before_commit(session) -> None:
+    # Flush first so rows still pending are part of ``touched``; the bump
+    # then commits atomically with the write.
+    session.flush()
+    touched = session.info.pop(_TOUCHED, None)
+    if touched:
+        _bump(session, touched)
+
+
+def _after_rollback(session) -> None:
+    session.info.pop(_TOUCHED, None)
+
+
+def _load_backend(app: Flask) -> Any:
+    spec = app.config["RESPONSE_CACHE_BACKEND"]
+    if spec == "memory":
+        max_bytes = app.config["RESPONSE_CACHE_MAX_BYTES"]
+        return MemoryBackend(max_bytes, app.config["RESPONSE_CACHE_MAX_ENTRY_BYTES"] or max_bytes // 8)
+    if spec.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend(spec)
+    module, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module), attr)(app.config)
+
+
+def init_response_cache(app: Flask) -> None:
+    """Set up the backend and write tracking when ``RESPONSE_CACHE_BACKEND`` is set."""
+    if not app.config.get("RESPONSE_CACHE_BACKEND"):
+        return
+    cache = ResponseCache(_load_backend(app), app.config["RESPONSE_CACHE_TTL"])
+    app.extensions["response_cache"] = cache
+    if not event.contains(db.session, "after_flush", _after_flush):
+        event.listen(db.session, "after_flush", _after_flush)
+        event.listen(db.session, "before_commit", _before_commit)
+        event.listen(db.session, "after_rollback", _after_rollback)
+    metrics.add_collector("response_cache", cache.metric_lines)
@@ -1 +1,12 @@
 # Pydantic schemas for request/response validation
+from pydantic import BaseModel, ConfigDict
+
+
+class Schema(BaseModel):
+    """Base for request schemas.
+
+    Validators are built on first use rather than at import, which keeps
+    them off the cold-start path of workers and CLI commands.
+    """
+
+    model_config = ConfigDict(defer_build=True)
@@ -0,0 +1,17 @@
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import Field
+
+from . import Schema
+
+
+class SubRequestSchema(Schema):
+    id: Optional[str] = None
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str
+    body: Optional[Any] = None
+    headers: Optional[Dict[str, str]] = None
+
+
+class BatchSchema(Schema):
+    requests: List[SubRequestSchema] = Field(min_length=1)
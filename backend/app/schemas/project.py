@@ -1,9 +1,9 @@
 from typing import Optional
 
-from pydantic import BaseModel
+from . import Schema
 
 
-class ProjectCreateSchema(BaseModel):
+class ProjectCreateSchema(Schema):
     organizationId: str
     name: str
     key: str
@@ -12,7 +12,7 @@ class ProjectCreateSchema(BaseModel):
     status: Optional[str] = "active"
 
 
-class ProjectUpdateSchema(BaseModel):
+class ProjectUpdateSchema(Schema):
     organizationId: Optional[str] = None
     name: Optional[str] = None
     key: Optional[str] = None
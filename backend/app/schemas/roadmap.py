@@ -1,9 +1,9 @@
 from typing import Optional
 
-from pydantic import BaseModel
+from . import Schema
 
 
-class PhaseCreateSchema(BaseModel):
+class PhaseCreateSchema(Schema):
     organizationId: Optional[str] = None
     name: str
     description: Optional[str] = None
@@ -12,7 +12,7 @@ class PhaseCreateSchema(BaseModel):
     orderIndex: Optional[int] = 0
 
 
-class PhaseUpdateSchema(BaseModel):
+class PhaseUpdateSchema(Schema):
     organizationId: Optional[str] = None
     name: Optional[str] = None
     description: Optional[str] = None
@@ -21,7 +21,7 @@ class PhaseUpdateSchema(BaseModel):
     orderIndex: Optional[int] = None
 
 
-class MilestoneCreateSchema(BaseModel):
+class MilestoneCreateSchema(Schema):
     organizationId: Optional[str] = None
     phaseId: Optional[str] = None
     title: str
@@ -29,7 +29,7 @@ class MilestoneCreateSchema(BaseModel):
     week: Optional[int] = None
 
 
-class MilestoneUpdateSchema(BaseModel):
+class MilestoneUpdateSchema(Schema):
     organizationId: Optional[str] = None
     phaseId: Optional[str] = None
     title: Optional[str] = None
@@ -1,16 +1,29 @@
 from datetime import date, datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
+from . import Schema
 
-class SubtaskSchema(BaseModel):
+
+class SubtaskSchema(Schema):
     id: str
     title: str
     status: str = Field(default="pending")
 
 
-class TaskCreateSchema(BaseModel):
+class SubtaskCreateSchema(Schema):
+    id: Optional[str] = Field(default=None, min_length=1, max_length=64)
+    title: str = Field(min_length=1, max_length=255)
+    status: str = Field(default="pending", max_length=50)
+
+
+class SubtaskUpdateSchema(Schema):
+    title: Optional[str] = Field(default=None, min_length=1, max_length=255)
+    status: Optional[str] = Field(default=None, max_length=50)
+
+
+class TaskCreateSchema(Schema):
     organizationId: Optional[str] = None
     projectId: Optional[str] = None
     title: str
@@ -32,7 +45,7 @@ class TaskCreateSchema(BaseModel):
     completedAt: Optional[datetime] = None
 
 
-class TaskUpdateSchema(BaseModel):
+class TaskUpdateSchema(Schema):
     title: Optional[str] = None
     description: Optional[str] = None
     status: Optional[str] = None
@@ -50,3 +63,13 @@ class TaskUpdateSchema(BaseModel):
     subtasks: Optional[List[SubtaskSchema]] = None
     blockedReason: Optional[str] = None
     completedAt: Optional[datetime] = None
+
+
+class ActivityQuerySchema(Schema):
+    taskId: Optional[str] = None
+    actorId: Optional[str] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    cursor: Optional[str] = None
+    limit: int = Field(default=50, ge=1, le=200)
+    order: Literal["desc", "asc"] = "desc"
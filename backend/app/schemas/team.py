@@ -1,9 +1,12 @@
+from datetime import date
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import Field
 
+from . import Schema
 
-class TeamCreateSchema(BaseModel):
+
+class TeamCreateSchema(Schema):
     organizationId: Optional[str] = None
     name: str
     category: Optional[str] = None
@@ -11,9 +14,17 @@ class TeamCreateSchema(BaseModel):
     memberCount: Optional[int] = 0
 
 
-class TeamUpdateSchema(BaseModel):
+class TeamUpdateSchema(Schema):
     organizationId: Optional[str] = None
     name: Optional[str] = None
     category: Optional[str] = None
     description: Optional[str] = None
     memberCount: Optional[int] = None
+
+
+class WorkloadQuerySchema(Schema):
+    organizationId: str
+    start: Optional[date] = Field(default=None, alias="from")
+    weeks: int = Field(default=12, ge=1, le=52)
+    capacity: Optional[float] = Field(default=None, gt=0)
+    planStart: Optional[date] = None
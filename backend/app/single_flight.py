@@ -0,0 +1,88 @@
+"""Coalescing of identical concurrent reads within a worker.
+
+When several threads ask for the same key at once, the first one runs the
+computation and the others wait for it and reuse its result, so a burst of
+identical list requests costs one query. Only requests that overlap in time
+are merged; nothing is kept once the computation finishes (that is the
+response cache's job). If the leader raises, or a follower times out
+waiting, followers compute on their own.
+
+Keys come from the response cache and include the org's write generation,
+which commits with every write, so a request arriving after a committed
+write (its own or another worker's) starts a fresh flight instead of
+joining one that may have read the old rows. That is why coalescing only
+runs when the response cache is enabled.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable
+
+from flask import Flask
+
+from .metrics import metrics
+
+
+class _Call:
+    __slots__ = ("done", "value", "failed")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.failed = False
+
+
+class SingleFlight:
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        self.leaders: dict[str, int] = {}
+        self.coalesced: dict[str, int] = {}
+
+    def do(self, key: str, fn: Callable[[], Any], label: str = "") -> tuple[Any, bool]:
+        """Return ``(fn(), shared)``, sharing one call among concurrent callers."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders[label] = self.leaders.get(label, 0) + 1
+
+        if not leader:
+            if call.done.wait(self.timeout) and not call.failed:
+                with self._lock:
+                    self.coalesced[label] = self.coalesced.get(label, 0) + 1
+                return call.value, True
+            return fn(), False
+
+        try:
+            call.value = fn()
+        except BaseException:
+            call.failed = True
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value, False
+
+    def metric_lines(self, pid: str) -> list[str]:
+        with self._lock:
+            leaders, coalesced = dict(self.leaders), dict(self.coalesced)
+        lines = ["# TYPE single_flight_leaders_total counter"]
+        lines += [f'single_flight_leaders_total{{pid="{pid}",resource="{r}"}} {n}' for r, n in sorted(leaders.items())]
+        lines.append("# TYPE single_flight_coalesced_total counter")
+        lines += [
+            f'single_flight_coalesced_total{{pid="{pid}",resource="{r}"}} {n}' for r, n in sorted(coalesced.items())
+        ]
+        return lines
+
+
+def init_single_flight(app: Flask) -> None:
+    """Enable coalescing; call after ``init_response_cache``, whose keys it uses."""
+    if not app.config.get("REQUEST_COALESCING", True) or "response_cache" not in app.extensions:
+        return
+    flights = SingleFlight(app.config["REQUEST_COALESCING_TIMEOUT"])
+    app.extensions["single_flight"] = flights
+    metrics.add_collector("single_flight", flights.metric_lines)
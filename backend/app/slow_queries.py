@@ -0,0 +1,151 @@
+"""Slow-query log with automatic EXPLAIN capture.
+
+Statements slower than ``SLOW_QUERY_MS`` are written as JSON lines to a
+rotating file (``SLOW_QUERY_LOG_PATH``, default ``instance/slow_queries.log``)
+together with their bind parameters, the route that ran them and the query
+plan. The most recent entries are also kept in memory for
+``GET /api/admin/slow-queries``.
+
+Plans use ``EXPLAIN QUERY PLAN`` on SQLite and ``EXPLAIN`` on Postgres;
+``SLOW_QUERY_EXPLAIN_ANALYZE=1`` switches Postgres to
+``EXPLAIN (ANALYZE, BUFFERS)``, which re-runs the statement, so it is only
+applied to SELECTs.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Any
+
+from flask import Flask, has_request_context, request
+from sqlalchemy import event
+
+from .extensions import db
+
+logger = logging.getLogger(__name__)
+
+_MAX_PARAM_CHARS = 2000
+
+
+class SlowQueryLog:
+    def __init__(self, threshold_ms: float, explain_analyze: bool, keep: int, file_logger: logging.Logger) -> None:
+        self.threshold = threshold_ms / 1000
+        self.explain_analyze = explain_analyze
+        self.recent: deque[dict[str, Any]] = deque(maxlen=keep)
+        self._lock = threading.Lock()
+        self._file_logger = file_logger
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("slow_query_started")
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+        if elapsed < self.threshold or conn.info.get("slow_query_explaining"):
+            return
+
+        entry: dict[str, Any] = {
+            "at": datetime.utcnow().isoformat(),
+            "durationMs": round(elapsed * 1000, 3),
+            "statement": statement,
+            "parameters": repr(parameters)[:_MAX_PARAM_CHARS],
+            "executemany": executemany,
+            "route": None,
+            "method": None,
+            "path": None,
+            "plan": None,
+        }
+        if has_request_context():
+            entry.update(route=request.endpoint, method=request.method, path=request.path)
+        if not executemany:
+            entry["plan"] = self._explain(conn, cursor, statement, parameters)
+
+        with self._lock:
+            self.recent.appendleft(entry)
+        self._file_logger.info(json.dumps(entry, default=str))
+
+    def _explain(self, conn, cursor, statement: str, parameters) -> list[str] | str | None:
+        dialect = conn.dialect.name
+        verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+        if verb not in {"SELECT", "WITH", "INSERT", "UPDATE", "DELETE"}:
+            return None
+        is_select = verb in {"SELECT", "WITH"}
+        if dialect == "sqlite":
+            prefix = "EXPLAIN QUERY PLAN "
+        elif dialect == "postgresql":
+            prefix = "EXPLAIN (ANALYZE, BUFFERS) " if self.explain_analyze and is_select else "EXPLAIN "
+        else:
+            return None
+
+        # A separate DBAPI cursor keeps the original result set intact and
+        # bypasses engine events, so the EXPLAIN itself is never logged.
+        # On Postgres a savepoint keeps a failed EXPLAIN from aborting the
+        # request's transaction.
+        savepoint = dialect == "postgresql"
+        conn.info["slow_query_explaining"] = True
+        explain_cursor = cursor.connection.cursor()
+        try:
+            if savepoint:
+                explain_cursor.execute("SAVEPOINT slow_query_explain")
+            explain_cursor.execute(prefix + statement, parameters)
+            rows = explain_cursor.fetchall()
+            if savepoint:
+                explain_cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        except Exception as err:  # noqa: BLE001 - a plan is best effort
+            if savepoint:
+                explain_cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            return f"EXPLAIN failed: {err}"
+        finally:
+            explain_cursor.close()
+            conn.info["slow_query_explaining"] = False
+        if dialect == "sqlite":
+            # (id, parent, notused, detail)
+            return [row[-1] for row in rows]
+        return [row[0] for row in rows]
+
+    def entries(self, limit: int) -> list[dict[str, Any]]:
+        with self._lock:
+            return list(self.recent)[:limit]
+
+
+def _file_logger(path: str, max_bytes: int, backups: int) -> logging.Logger:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    file_logger = logging.getLogger(f"{__name__}.file")
+    file_logger.propagate = False
+    file_logger.setLevel(logging.INFO)
+    path = os.path.abspath(path)
+    if not any(getattr(h, "baseFilename", None) == path for h in file_logger.handlers):
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        file_logger.addHandler(handler)
+    return file_logger
+
+
+def init_slow_queries(app: Flask) -> None:
+    """Attach the slow-query listeners when ``SLOW_QUERY_MS`` is set."""
+    threshold = app.config.get("SLOW_QUERY_MS") or 0
+    if threshold <= 0:
+        return
+
+    path = app.config.get("SLOW_QUERY_LOG_PATH") or os.path.join(app.instance_path, "slow_queries.log")
+    log = SlowQueryLog(
+        threshold,
+        app.config["SLOW_QUERY_EXPLAIN_ANALYZE"],
+        app.config["SLOW_QUERY_KEEP"],
+        _file_logger(path, app.config["SLOW_QUERY_LOG_MAX_BYTES"], app.config["SLOW_QUERY_LOG_BACKUPS"]),
+    )
+    app.extensions["slow_queries"] = log
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", log.before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", log.after_cursor_execute)
+    logger.info("Slow-query log enabled (>%s ms) at %s", threshold, path)
@@ -0,0 +1,283 @@
+"""Subtasks stored as rows, rolled up onto their parent task.
+
+Each subtask is a row of ``subtasks`` keyed by ``(task_id, id)``, so ticking
+one off is a single-row UPDATE instead of rewriting the task's whole list.
+The parent keeps ``subtasks_total`` and ``subtasks_completed`` and, while it
+has subtasks, a ``progress`` derived from them (completed / total, rounded
+to a percentage like the web app does).
+
+Single-subtask writes adjust the counters relatively (``SET
+subtasks_completed = subtasks_completed + 1``) in the same transaction as
+the subtask row, so concurrent toggles on one task neither lose updates nor
+recount the list. Sending ``subtasks`` with a task create, PUT or PATCH
+replaces the whole list and recomputes the counters from it.
+
+Every subtask write bumps the parent's ``version`` and is published as a
+task ``updated`` change event and a ``task_events`` entry, like any other
+task write. An update that changes nothing writes nothing, so it leaves
+the parent's version (and other clients' ``If-Match`` tokens) alone.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Sequence
+
+from flask import abort
+from sqlalchemy import ColumnElement, Row, Select, case, delete, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from .extensions import db
+from .models import Subtask, Task
+from .org_events import record
+from .project_stats import record_change, with_snapshot
+from .response_cache import touch
+from .task_activity import current_actor, event_row, record as record_activity
+from .versioning import VersionConflict
+
+COMPLETED = "completed"
+
+_tasks = Task.__table__
+_subtasks = Subtask.__table__
+
+# Returned by every subtask write: what a client needs to update the parent.
+_ROLLUP_COLUMNS = (
+    _tasks.c.id,
+    _tasks.c.organization_id,
+    _tasks.c.progress,
+    _tasks.c.subtasks_total,
+    _tasks.c.subtasks_completed,
+    _tasks.c.version,
+)
+
+
+class DuplicateSubtask(Exception):
+    pass
+
+
+def derived_progress(total: int, completed: int) -> int:
+    """``completed / total`` as a percentage, rounded half up (``total > 0``)."""
+    return (completed * 200 + total) // (2 * total)
+
+
+def progress_expression(total: ColumnElement, completed: ColumnElement, otherwise: Any) -> ColumnElement:
+    """SQL for :func:`derived_progress`, or ``otherwise`` when there are no subtasks."""
+    return case((total > 0, (completed * 200 + total) // (total * 2)), else_=otherwise)
+
+
+def subtask_dict(row: Any) -> dict[str, Any]:
+    return {"id": row.id, "title": row.title, "status": row.status}
+
+
+def rollup_to_dict(row: Row) -> dict[str, Any]:
+    return {
+        "id": row.id,
+        "progress": row.progress,
+        "subtasksCompleted": row.subtasks_completed,
+        "subtasksTotal": row.subtasks_total,
+        "version": row.version,
+    }
+
+
+def normalize(items: Iterable[Any]) -> list[dict[str, Any]]:
+    """``SubtaskSchema`` items as dicts, dropping repeated ids (the first wins)."""
+    seen: set[str] = set()
+    result = []
+    for item in items:
+        if item.id not in seen:
+            seen.add(item.id)
+            result.append({"id": item.id, "title": item.title, "status": item.status})
+    return result
+
+
+def rollup_values(items: Sequence[dict[str, Any]]) -> dict[str, Any]:
+    """Task column values for a full subtask list (``progress`` only when non-empty)."""
+    total = len(items)
+    completed = sum(1 for item in items if item["status"] == COMPLETED)
+    values: dict[str, Any] = {"subtasks_total": total, "subtasks_completed": completed}
+    if total:
+        values["progress"] = derived_progress(total, completed)
+    return values
+
+
+def replace_subtasks(task_id: str, items: Sequence[dict[str, Any]]) -> None:
+    """Replace a task's subtasks with ``normalize()``-d ``items``; the caller sets the rollup."""
+    db.session.execute(delete(_subtasks).where(_subtasks.c.task_id == task_id))
+    if items:
+        now = datetime.utcnow()
+        db.session.execute(insert(_subtasks), [
+            {**item, "task_id": task_id, "position": position, "created_at": now, "updated_at": now}
+            for position, item in enumerate(items)
+        ])
+
+
+def subtasks_query(organization_id: str | None = None, task_ids: Sequence[str] | None = None,
+                   after: str | None = None) -> Select:
+    """Subtasks ordered by task id, then position (``after``: task ids greater than it)."""
+    stmt = select(_subtasks.c.task_id, _subtasks.c.id, _subtasks.c.title, _subtasks.c.status)
+    if organization_id is not None:
+        stmt = stmt.join(_tasks, _tasks.c.id == _subtasks.c.task_id).where(_tasks.c.organization_id == organization_id)
+    if task_ids is not None:
+        stmt = stmt.where(_subtasks.c.task_id.in_(task_ids))
+    if after is not None:
+        stmt = stmt.where(_subtasks.c.task_id > after)
+    return stmt.order_by(_subtasks.c.task_id, _subtasks.c.position)
+
+
+def group(rows: Iterable[Any]) -> dict[str, list[dict[str, Any]]]:
+    grouped: dict[str, list[dict[str, Any]]] = {}
+    for row in rows:
+        grouped.setdefault(row.task_id, []).append(subtask_dict(row))
+    return grouped
+
+
+def load_subtasks(organization_id: str | None = None, task_ids: Sequence[str] | None = None) -> dict[str, list]:
+    """Subtask lists by task id, in one query."""
+    return group(db.session.execute(subtasks_query(organization_id, task_ids)))
+
+
+def merge(tasks: Iterable[Any], subtasks: Iterable[Any]) -> Iterator[tuple[Any, list[dict[str, Any]]]]:
+    """Pair task rows with their subtasks; both streams must be ordered by task id."""
+    pending = iter(subtasks)
+    current = next(pending, None)
+    for task in tasks:
+        items = []
+        while current is not None and current.task_id < task.id:
+            current = next(pending, None)
+        while current is not None and current.task_id == task.id:
+            items.append(subtask_dict(current))
+            current = next(pending, None)
+        yield task, items
+
+
+def _adjust(task_id: str, added: int, completed: int, expected_version: int | None,
+            subtask: dict[str, Any], previous_progress: int | None = None) -> Row:
+    """Apply counter deltas to the parent and bump its version, in the current transaction.
+
+    ``subtask`` describes the change for the task's activity log. The
+    project rollup moves by the change in progress: a task with subtasks
+    always has the derived progress, so the old one follows from the old
+    counters. When the first subtask replaces a manual progress, that is
+    ``previous_progress``, read at ``expected_version``.
+    """
+    total_expr = _tasks.c.subtasks_total + added
+    completed_expr = _tasks.c.subtasks_completed + completed
+    stmt = (
+        update(_tasks)
+        .where(_tasks.c.id == task_id)
+        .values(
+            subtasks_total=total_expr,
+            subtasks_completed=completed_expr,
+            progress=progress_expression(total_expr, completed_expr, _tasks.c.progress),
+            version=_tasks.c.version + 1,
+        )
+        .returning(
+            *_ROLLUP_COLUMNS, _tasks.c.project_id, _tasks.c.status, _tasks.c.estimated_hours, _tasks.c.actual_hours,
+        )
+    )
+    if expected_version is not None:
+        stmt = stmt.where(_tasks.c.version == expected_version)
+    row = db.session.execute(stmt).one_or_none()
+    if row is None:
+        db.session.rollback()
+        current = db.session.execute(select(_tasks.c.version).where(_tasks.c.id == task_id)).scalar()
+        if current is not None and expected_version is not None:
+            raise VersionConflict(current)
+        abort(404)
+    touch(row.organization_id)
+    record(row.organization_id, _tasks.name, "updated", row.id, row.version)
+    old_total = row.subtasks_total - added
+    if old_total > 0:
+        old_progress = derived_progress(old_total, row.subtasks_completed - completed)
+    else:
+        old_progress = previous_progress
+    if old_progress != row.progress:
+        record_change({**row._mapping, "progress": old_progress}, row._mapping)
+    changes = {
+        "progress": row.progress,
+        "subtasksTotal": row.subtasks_total,
+        "subtasksCompleted": row.subtasks_completed,
+        "subtask": subtask,
+    }
+    record_activity([event_row(row.organization_id, row.id, "updated", changes, current_actor())])
+    return row
+
+
+def add_subtask(task_id: str, item: dict[str, Any], expected_version: int | None = None) -> tuple[dict, Row]:
+    """Append a subtask. Raises ``DuplicateSubtask`` when its id is taken."""
+    # The parent goes first: it 404s for unknown tasks and, on Postgres, locks
+    # the row so concurrent appends take consecutive positions.
+    # Read first so the project rollup knows the progress the first subtask replaces.
+    rollup = with_snapshot(task_id, expected_version, lambda old, version: _adjust(
+        task_id, 1, int(item["status"] == COMPLETED), version, {**item, "action": "added"},
+        old.progress if old else None,
+    ))
+    now = datetime.utcnow()
+    position = (
+        select(func.coalesce(func.max(_subtasks.c.position) + 1, 0))
+        .where(_subtasks.c.task_id == task_id)
+        .scalar_subquery()
+    )
+    try:
+        db.session.execute(insert(_subtasks).values(
+            task_id=task_id, position=position, created_at=now, updated_at=now, **item,
+        ))
+        db.session.commit()
+    except IntegrityError as err:
+        db.session.rollback()
+        raise DuplicateSubtask(item["id"]) from err
+    return item, rollup
+
+
+def update_subtask(task_id: str, subtask_id: str, values: dict[str, Any],
+                   expected_version: int | None = None) -> tuple[dict, Row]:
+    """Change a subtask's ``title``/``status``, moving the completed counter if needed.
+
+    When ``values`` match the subtask already, returns it and the current
+    rollup without writing.
+    """
+    key = (_subtasks.c.task_id == task_id) & (_subtasks.c.id == subtask_id)
+    returning = (_subtasks.c.id, _subtasks.c.title, _subtasks.c.status)
+    delta = 0
+    row = None
+    if "status" in values:
+        # Only matches when completion actually flips, so two concurrent
+        # "complete" requests count once: the second re-checks the WHERE
+        # after the first commits and finds nothing to flip.
+        done = values["status"] == COMPLETED
+        flipped = key & ((_subtasks.c.status != COMPLETED) if done else (_subtasks.c.status == COMPLETED))
+        row = db.session.execute(update(_subtasks).where(flipped).values(values).returning(*returning)).one_or_none()
+        if row is not None:
+            delta = 1 if done else -1
+    if row is None and values:
+        # Only matches when some value differs, so a no-op finds no row.
+        changed = or_(*(_subtasks.c[column] != value for column, value in values.items()))
+        row = db.session.execute(
+            update(_subtasks).where(key & changed).values(values).returning(*returning)
+        ).one_or_none()
+    if row is None:
+        return _unchanged(task_id, key, returning, expected_version)
+    rollup = _adjust(task_id, 0, delta, expected_version, {**subtask_dict(row), "action": "updated"})
+    db.session.commit()
+    return subtask_dict(row), rollup
+
+
+def _unchanged(task_id: str, key: ColumnElement, returning: tuple, expected_version: int | None) -> tuple[dict, Row]:
+    row = db.session.execute(select(*returning).where(key)).one_or_none()
+    rollup = db.session.execute(select(*_ROLLUP_COLUMNS).where(_tasks.c.id == task_id)).one_or_none()
+    db.session.rollback()
+    if row is None or rollup is None:
+        abort(404)
+    if expected_version is not None and rollup.version != expected_version:
+        raise VersionConflict(rollup.version)
+    return subtask_dict(row), rollup
+
+
+def delete_subtask(task_id: str, subtask_id: str, expected_version: int | None = None) -> Row:
+    key = (_subtasks.c.task_id == task_id) & (_subtasks.c.id == subtask_id)
+    status = db.session.execute(delete(_subtasks).where(key).returning(_subtasks.c.status)).scalar()
+    if status is None:
+        db.session.rollback()
+        abort(404)
+    rollup = _adjust(task_id, -1, -int(status == COMPLETED), expected_version, {"id": subtask_id, "action": "deleted"})
+    db.session.commit()
+    return rollup
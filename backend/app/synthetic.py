@@ -0,0 +1,264 @@
+"""Deterministic synthetic data for benchmarks and capacity tests.
+
+Rows are generated from a seeded RNG and written with bulk Core inserts
+(``executemany``), bypassing the ORM unit of work, so millions of tasks load
+in minutes. The same seed and sizes always produce the same ids and rows.
+
+Every user shares one password (hashed once) and has the email
+``user<org>-<member>@<domain>``; member 0 of each org is its owner.
+"""
+from __future__ import annotations
+
+import random
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Any, Callable
+
+from sqlalchemy import Table, insert
+
+from .extensions import db
+from .models import (
+    Organization,
+    OrganizationMember,
+    Project,
+    RoadmapMilestone,
+    RoadmapPhase,
+    Task,
+    TaskEvent,
+    Team,
+    User,
+)
+from . import project_stats
+from .task_activity import changes_of, event_row
+
+STATUSES = ["pending", "in-progress", "completed", "blocked"]
+STATUS_WEIGHTS = [35, 30, 25, 10]
+PRIORITIES = ["low", "medium", "high", "critical"]
+PRIORITY_WEIGHTS = [25, 45, 22, 8]
+ROLES = ["admin", "manager", "member", "member", "member", "guest"]
+TEAM_CATEGORIES = ["engineering", "design", "product", "operations", "qa"]
+TAGS = ["backend", "frontend", "infra", "design", "qa", "docs", "security", "perf"]
+
+# Dependencies only point at one of the last few tasks of the same project,
+# which keeps the graph acyclic and local, like real plans.
+DEPENDENCY_WINDOW = 25
+DEPENDENCY_RATE = 0.35
+
+Progress = Callable[[str, int], None]
+
+
+class _BulkWriter:
+    """Buffers rows per table and flushes them in foreign-key order."""
+
+    def __init__(self, tables: list[Table], chunk: int, progress: Progress | None) -> None:
+        self.buffers: dict[Table, list[dict[str, Any]]] = {table: [] for table in tables}
+        self.counts: dict[str, int] = {table.name: 0 for table in tables}
+        self.chunk = chunk
+        self.progress = progress
+
+    def add(self, table: Table, row: dict[str, Any]) -> None:
+        buffer = self.buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.chunk:
+            self.flush()
+
+    def flush(self) -> None:
+        for table, rows in self.buffers.items():
+            if not rows:
+                continue
+            db.session.execute(insert(table), rows)
+            self.counts[table.name] += len(rows)
+            if self.progress:
+                self.progress(table.name, self.counts[table.name])
+            rows.clear()
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _share(total: int, parts: int, index: int) -> int:
+    return total // parts + (1 if index < total % parts else 0)
+
+
+def generate(
+    orgs: int = 1,
+    tasks: int = 1_000,
+    members_per_org: int = 10,
+    teams_per_org: int = 5,
+    projects_per_org: int = 5,
+    phases_per_org: int = 4,
+    milestones_per_phase: int = 2,
+    seed: int = 42,
+    password: str = "password",
+    email_domain: str = "example.test",
+    chunk: int = 10_000,
+    progress: Progress | None = None,
+) -> dict[str, int]:
+    """Insert a synthetic dataset into the current app's database.
+
+    ``tasks`` is the total across all orgs. Returns the row count per table.
+    The caller's session is committed once at the end.
+    """
+    rng = random.Random(seed)
+    now = datetime(2025, 1, 1)
+    week_one = date(2025, 1, 6)
+    # One password hash for every user; hashing per row would dominate.
+    probe = User(email="probe", display_name="probe")
+    probe.set_password(password)
+    password_hash = probe.password_hash
+
+    tables = [model.__table__ for model in (
+        User, Organization, OrganizationMember, Team, Project, RoadmapPhase, RoadmapMilestone, Task, TaskEvent,
+    )]
+    writer = _BulkWriter(tables, chunk, progress)
+    users, organizations, members, teams, projects, phases, milestones, task_table, task_events = tables
+
+    stats: project_stats.Deltas = {}
+    task_index = 0
+    for o in range(orgs):
+        org_id = _uuid(rng)
+        member_ids = [_uuid(rng) for _ in range(members_per_org)]
+        team_ids = [_uuid(rng) for _ in range(teams_per_org)]
+        team_members: dict[str, list[str]] = {team_id: [] for team_id in team_ids}
+
+        for m, user_id in enumerate(member_ids):
+            writer.add(users, {
+                "id": user_id,
+                "email": f"user{o}-{m}@{email_domain}",
+                "display_name": f"User {o}-{m}",
+                "password_hash": password_hash,
+                "created_at": now,
+                "updated_at": now,
+            })
+        writer.add(organizations, {
+            "id": org_id,
+            "name": f"Org {o}",
+            "slug": f"org-{o}",
+            "settings": {},
+            "created_by": member_ids[0],
+            "created_at": now,
+            "updated_at": now,
+        })
+        for m, user_id in enumerate(member_ids):
+            member_teams = [team_ids[m % teams_per_org]] if team_ids else []
+            if len(team_ids) > 1 and rng.random() < 0.25:
+                extra = rng.choice(team_ids)
+                if extra not in member_teams:
+                    member_teams.append(extra)
+            for team_id in member_teams:
+                team_members[team_id].append(user_id)
+            writer.add(members, {
+                "id": _uuid(rng),
+                "organization_id": org_id,
+                "user_id": user_id,
+                "role": "owner" if m == 0 else rng.choice(ROLES),
+                "teams": member_teams,
+                "status": "active",
+                "joined_at": now,
+            })
+        for t, team_id in enumerate(team_ids):
+            writer.add(teams, {
+                "id": team_id,
+                "organization_id": org_id,
+                "name": f"Team {t}",
+                "category": TEAM_CATEGORIES[t % len(TEAM_CATEGORIES)],
+                "member_count": len(team_members[team_id]),
+                "created_at": now,
+                "updated_at": now,
+            })
+
+        project_ids = []
+        for p in range(projects_per_org):
+            project_ids.append(_uuid(rng))
+            writer.add(projects, {
+                "id": project_ids[-1],
+                "organization_id": org_id,
+                "name": f"Project {p}",
+                "key": f"P{p}",
+                "visibility": "organization",
+                "status": "active",
+                "created_by": member_ids[0],
+                "created_at": now + timedelta(seconds=p),
+                "updated_at": now,
+            })
+        weeks_per_phase = 4
+        for ph in range(phases_per_org):
+            phase_id = _uuid(rng)
+            writer.add(phases, {
+                "id": phase_id,
+                "organization_id": org_id,
+                "name": f"Phase {ph}",
+                "start_week": ph * weeks_per_phase + 1,
+                "end_week": ph * weeks_per_phase + weeks_per_phase,
+                "order_index": ph,
+                "created_at": now,
+                "updated_at": now,
+            })
+            for ms in range(milestones_per_phase):
+                writer.add(milestones, {
+                    "id": _uuid(rng),
+                    "organization_id": org_id,
+                    "phase_id": phase_id,
+                    "title": f"Milestone {ph}.{ms}",
+                    "week": ph * weeks_per_phase + min(weeks_per_phase, 2 * ms + 2),
+                    "created_at": now,
+                    "updated_at": now,
+                })
+
+        total_weeks = max(1, phases_per_org * weeks_per_phase)
+        recent: dict[str | None, list[str]] = {project_id: [] for project_id in project_ids or [None]}
+        assignable = [ids for ids in team_members.values() if ids] or [member_ids]
+        for _ in range(_share(tasks, orgs, o)):
+            task_id = _uuid(rng)
+            project_id = rng.choice(project_ids) if project_ids else None
+            window = recent[project_id]
+            dependencies = []
+            if window and rng.random() < DEPENDENCY_RATE:
+                dependencies = rng.sample(window, k=min(len(window), rng.choice((1, 1, 2, 3))))
+            window.append(task_id)
+            if len(window) > DEPENDENCY_WINDOW:
+                window.pop(0)
+
+            status = rng.choices(STATUSES, STATUS_WEIGHTS)[0]
+            week = rng.randrange(1, total_weeks + 1)
+            start = week_one + timedelta(weeks=week - 1, days=rng.randrange(0, 5))
+            end = start + timedelta(days=rng.randrange(1, 21))
+            team = rng.choice(assignable)
+            estimated = float(rng.randrange(1, 40))
+            created_at = now + timedelta(seconds=task_index)
+            task = {
+                "id": task_id,
+                "organization_id": org_id,
+                "project_id": project_id,
+                "title": f"Task {task_index}",
+                "description": "Synthetic task",
+                "status": status,
+                "priority": rng.choices(PRIORITIES, PRIORITY_WEIGHTS)[0],
+                "phase": f"Phase {(week - 1) // weeks_per_phase}",
+                "week": week,
+                "start_date": start,
+                "end_date": end,
+                "estimated_hours": estimated,
+                "actual_hours": round(estimated * rng.uniform(0.2, 1.4), 1) if status != "pending" else 0.0,
+                "assigned_to": rng.sample(team, k=min(len(team), rng.choice((0, 1, 1, 1, 2)))),
+                "dependencies": dependencies,
+                "tags": rng.sample(TAGS, k=rng.randrange(0, 3)),
+                "progress": 100 if status == "completed" else rng.randrange(0, 100),
+                "blocked_reason": "Waiting on dependencies" if status == "blocked" else None,
+                "created_by": member_ids[0],
+                "completed_at": datetime.combine(end, datetime.min.time()) if status == "completed" else None,
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+            writer.add(task_table, task)
+            project_stats.add(stats, task)
+            writer.add(task_events, event_row(
+                org_id, task_id, "created", changes_of(task, skip_empty=True), member_ids[0], created_at,
+            ))
+            task_index += 1
+
+    writer.flush()
+    project_stats.apply(db.session, stats)
+    db.session.commit()
+    return writer.counts
@@ -0,0 +1,193 @@
+"""Append-only task history (``task_events``) and the activity feed over it.
+
+Every task write appends events in the same transaction: ORM flushes (task
+create, ``PUT``, delete) are picked up by a session listener, one executemany
+per flush; Core writes (``PATCH``, subtask changes, bulk import) call
+``record()`` with their rows, so an import batch adds its events with one
+insert (``COPY`` on Postgres) next to the tasks themselves.
+
+An event stores the values written, not a diff: the value before a change is
+the previous event's, and a task's ``created`` event holds its initial
+state. That is enough to rebuild status transitions for cycle time and
+burndown without reading the old row on the ``PATCH`` fast path.
+
+The feed reads newest (or oldest) first with keyset pagination on
+``(occurred_at, id)`` over the ``(organization_id, occurred_at, id)`` or
+``(task_id, occurred_at, id)`` index, so a page costs the same however long
+the log gets; there is no ``OFFSET`` and no ``COUNT``.
+"""
+from __future__ import annotations
+
+import base64
+from datetime import date, datetime, timezone
+from typing import Any, Iterable, Mapping
+
+from flask import Flask, has_request_context
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import Select, event, insert, inspect, select, tuple_
+
+from .extensions import db
+from .models import Task, TaskEvent
+
+# column -> key in ``changes`` (the API's field names); every column a client can write.
+TRACKED = {
+    "organization_id": "organizationId",
+    "project_id": "projectId",
+    "title": "title",
+    "description": "description",
+    "status": "status",
+    "priority": "priority",
+    "phase": "phase",
+    "week": "week",
+    "start_date": "startDate",
+    "end_date": "endDate",
+    "estimated_hours": "estimatedHours",
+    "actual_hours": "actualHours",
+    "assigned_to": "assignedTo",
+    "dependencies": "dependencies",
+    "tags": "tags",
+    "progress": "progress",
+    "subtasks_total": "subtasksTotal",
+    "subtasks_completed": "subtasksCompleted",
+    "blocked_reason": "blockedReason",
+    "completed_at": "completedAt",
+}
+
+
+def _json(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+def changes_of(values: Mapping[str, Any], skip_empty: bool = False) -> dict[str, Any]:
+    """``changes`` for column ``values`` (untracked columns are ignored)."""
+    return {
+        key: _json(values[column])
+        for column, key in TRACKED.items()
+        if column in values and not (skip_empty and values[column] in (None, [], ""))
+    }
+
+
+def current_actor() -> str | None:
+    """The authenticated user of the current request, if any."""
+    if not has_request_context():
+        return None
+    try:
+        return get_jwt_identity()
+    except RuntimeError:  # no JWT verified for this request
+        return None
+
+
+def event_row(organization_id: str | None, task_id: str, action: str, changes: dict[str, Any] | None,
+              actor_id: str | None = None, occurred_at: datetime | None = None) -> dict[str, Any]:
+    return {
+        "organization_id": organization_id,
+        "task_id": task_id,
+        "actor_id": actor_id,
+        "action": action,
+        "changes": changes or None,
+        "occurred_at": occurred_at or datetime.utcnow(),
+    }
+
+
+def record(rows: list[dict[str, Any]]) -> None:
+    """Append ``event_row()``s; they commit with the current transaction."""
+    if rows:
+        db.session.execute(insert(TaskEvent.__table__), rows)
+
+
+def record_update(row: Any, columns: Iterable[str]) -> None:
+    """Event for an ``UPDATE ... RETURNING`` of a task that wrote ``columns``."""
+    written = {column: getattr(row, column) for column in columns if column in TRACKED}
+    record([event_row(row.organization_id, row.id, "updated", changes_of(written), current_actor())])
+
+
+def _after_flush(session, flush_context) -> None:
+    rows = []
+    actor = None
+    for action, objects in (("created", session.new), ("updated", session.dirty), ("deleted", session.deleted)):
+        for obj in objects:
+            if not isinstance(obj, Task):
+                continue
+            if action == "created":
+                changes = changes_of({column: getattr(obj, column) for column in TRACKED}, skip_empty=True)
+            elif action == "updated":
+                state = inspect(obj)
+                changed = {
+                    column: getattr(obj, column) for column in TRACKED if state.attrs[column].history.has_changes()
+                }
+                if not changed:
+                    continue
+                changes = changes_of(changed)
+            else:
+                changes = None
+            actor = actor or current_actor()
+            rows.append(event_row(obj.organization_id, obj.id, action, changes, actor))
+    if rows:
+        session.connection().execute(insert(TaskEvent.__table__), rows)
+
+
+def init_task_activity(app: Flask) -> None:
+    if not event.contains(db.session, "after_flush", _after_flush):
+        event.listen(db.session, "after_flush", _after_flush)
+
+
+def _utc(value: datetime) -> datetime:
+    """Naive UTC, like the stored ``occurred_at``."""
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+def encode_cursor(row: Any) -> str:
+    raw = f"{row.occurred_at.isoformat()}|{row.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Raises ``ValueError`` for anything ``encode_cursor`` did not produce."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        occurred_at, _, event_id = raw.partition("|")
+        return datetime.fromisoformat(occurred_at), int(event_id)
+    except (ValueError, UnicodeDecodeError) as err:
+        raise ValueError("Invalid cursor") from err
+
+
+def feed_query(
+    organization_id: str,
+    limit: int,
+    task_id: str | None = None,
+    actor_id: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    cursor: tuple[datetime, int] | None = None,
+    newest_first: bool = True,
+) -> Select:
+    """One page of events, plus one extra row to tell whether another page follows."""
+    table = TaskEvent.__table__
+    stmt = select(table).where(table.c.organization_id == organization_id)
+    if task_id:
+        stmt = stmt.where(table.c.task_id == task_id)
+    if actor_id:
+        stmt = stmt.where(table.c.actor_id == actor_id)
+    if since:
+        stmt = stmt.where(table.c.occurred_at >= _utc(since))
+    if until:
+        stmt = stmt.where(table.c.occurred_at < _utc(until))
+    key = tuple_(table.c.occurred_at, table.c.id)
+    if cursor:
+        stmt = stmt.where(key < tuple_(*cursor) if newest_first else key > tuple_(*cursor))
+    if newest_first:
+        stmt = stmt.order_by(table.c.occurred_at.desc(), table.c.id.desc())
+    else:
+        stmt = stmt.order_by(table.c.occurred_at.asc(), table.c.id.asc())
+    return stmt.limit(limit + 1)
+
+
+def event_to_dict(row: Any) -> dict[str, Any]:
+    return {
+        "id": row.id,
+        "taskId": row.task_id,
+        "actorId": row.actor_id,
+        "action": row.action,
+        "changes": row.changes or {},
+        "occurredAt": row.occurred_at.isoformat(),
+    }
@@ -0,0 +1,284 @@
+"""Streaming bulk import of tasks from CSV or NDJSON.
+
+Input is parsed one row at a time, so memory use depends on the batch size,
+not the file size. Each row is validated with ``TaskCreateSchema`` and
+rows are written in batches (tasks, their subtasks, then one ``created``
+activity event per task): ``COPY ... FROM STDIN`` on Postgres,
+``executemany`` inserts elsewhere. Every batch commits on its own; when a
+batch fails at the database, its rows are retried one by one inside
+savepoints so only the offending rows are reported and the rest still land.
+
+CSV headers use the API's field names (``title``, ``startDate``...). List
+fields take a JSON array or ``;``-separated values, ``subtasks`` takes JSON.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import IO, Any, Callable, Iterable, Iterator
+
+from pydantic import ValidationError
+from sqlalchemy import Table, insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from .extensions import db
+from .models import Subtask, Task, TaskEvent
+from .org_events import record
+from .project_stats import record_inserted
+from .response_cache import touch
+from .task_activity import changes_of, event_row
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "ndjson")
+LIST_FIELDS = ("assignedTo", "dependencies", "tags")
+
+# (line number, task row, its subtask rows)
+Entry = tuple[int, dict[str, Any], list[dict[str, Any]]]
+
+
+@dataclass
+class ImportResult:
+    processed: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "processed": self.processed,
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
+
+
+def detect_format(filename: str | None = None, content_type: str | None = None) -> str | None:
+    name = (filename or "").lower()
+    mime = (content_type or "").split(";")[0].strip().lower()
+    if name.endswith(".csv") or mime in {"text/csv", "application/csv"}:
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or mime in {"application/x-ndjson", "application/jsonl"}:
+        return "ndjson"
+    return None
+
+
+def _csv_value(key: str, value: str) -> Any:
+    if key in LIST_FIELDS:
+        if value.startswith("["):
+            return json.loads(value)
+        return [item.strip() for item in value.split(";") if item.strip()]
+    if key == "subtasks":
+        return json.loads(value)
+    return value
+
+
+def iter_rows(stream: IO[bytes], fmt: str) -> Iterator[tuple[int, dict[str, Any] | Exception]]:
+    """Yield ``(line_number, row)``; unparseable rows yield the exception."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for raw in reader:
+            try:
+                row = {k: _csv_value(k, v) for k, v in raw.items() if k and v not in (None, "")}
+            except ValueError as err:
+                yield reader.line_num, err
+            else:
+                yield reader.line_num, row
+    else:
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as err:
+                yield line_number, err
+                continue
+            if isinstance(row, dict):
+                yield line_number, row
+            else:
+                yield line_number, ValueError("Each line must be a JSON object")
+
+
+class TaskImporter:
+    def __init__(
+        self,
+        organization_id: str,
+        created_by: str | None,
+        batch_size: int = 5_000,
+        max_errors: int = 1_000,
+        progress: Callable[[ImportResult], None] | None = None,
+    ) -> None:
+        self.organization_id = organization_id
+        self.created_by = created_by
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.progress = progress
+        self.result = ImportResult()
+
+    def run(self, rows: Iterable[tuple[int, dict[str, Any] | Exception]]) -> ImportResult:
+        for _ in self.iter_run(rows):
+            pass
+        return self.result
+
+    def iter_run(self, rows: Iterable[tuple[int, dict[str, Any] | Exception]]) -> Iterator[ImportResult]:
+        """Like ``run`` but yields the running result after every batch."""
+        from .blueprints.tasks import _parse_date, _parse_datetime
+        from .schemas.task import TaskCreateSchema
+        from .subtasks import normalize, rollup_values
+
+        batch: list[Entry] = []
+        for line, row in rows:
+            self.result.processed += 1
+            if isinstance(row, Exception):
+                self._error(line, str(row))
+                continue
+            try:
+                data = TaskCreateSchema.model_validate(row)
+            except ValidationError as err:
+                self._error(line, "Invalid row", err.errors(include_url=False, include_context=False))
+                continue
+            now = datetime.utcnow()
+            task_id = str(uuid.uuid4())
+            subtasks = normalize(data.subtasks or [])
+            batch.append((line, {
+                "id": task_id,
+                "organization_id": self.organization_id,
+                "project_id": data.projectId,
+                "title": data.title,
+                "description": data.description,
+                "status": data.status or "pending",
+                "priority": data.priority or "medium",
+                "phase": data.phase,
+                "week": data.week,
+                "start_date": _parse_date(data.startDate),
+                "end_date": _parse_date(data.endDate),
+                "estimated_hours": data.estimatedHours,
+                "actual_hours": data.actualHours,
+                "assigned_to": data.assignedTo or [],
+                "dependencies": data.dependencies or [],
+                "tags": data.tags or [],
+                "progress": data.progress or 0,
+                "subtasks_total": 0,
+                "subtasks_completed": 0,
+                "blocked_reason": data.blockedReason,
+                "created_by": self.created_by,
+                "completed_at": _parse_datetime(data.completedAt),
+                "created_at": now,
+                "updated_at": now,
+                **rollup_values(subtasks),
+            }, [
+                {**item, "task_id": task_id, "position": position, "created_at": now, "updated_at": now}
+                for position, item in enumerate(subtasks)
+            ]))
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = []
+                yield self.result
+        if batch:
+            self._flush(batch)
+        yield self.result
+
+    def _error(self, line: int, message: str, details: Any = None) -> None:
+        self.result.failed += 1
+        if len(self.result.errors) < self.max_errors:
+            error = {"line": line, "message": message}
+            if details is not None:
+                error["errors"] = details
+            self.result.errors.append(error)
+
+    def _flush(self, batch: list[Entry]) -> None:
+        rows = [row for _, row, _ in batch]
+        subtasks = [subtask for _, _, items in batch for subtask in items]
+        events = [self._event(row) for row in rows]
+        try:
+            if db.session.get_bind().dialect.name == "postgresql":
+                self._copy(Task.__table__, rows)
+                if subtasks:
+                    self._copy(Subtask.__table__, subtasks)
+                self._copy(TaskEvent.__table__, events)
+            else:
+                db.session.execute(insert(Task.__table__), rows)
+                if subtasks:
+                    db.session.execute(insert(Subtask.__table__), subtasks)
+                db.session.execute(insert(TaskEvent.__table__), events)
+            record_inserted(rows)
+            touch(self.organization_id)
+            record(self.organization_id, "tasks", "imported", data={"count": len(rows)})
+            db.session.commit()
+            self.result.imported += len(rows)
+        except Exception as err:  # noqa: BLE001 - COPY raises unwrapped DBAPI errors
+            if not isinstance(err, SQLAlchemyError) and not _is_dbapi_error(err):
+                raise
+            db.session.rollback()
+            self._insert_one_by_one(batch)
+        if self.progress:
+            self.progress(self.result)
+        logger.info(
+            "Task import into %s: %s processed, %s imported, %s failed",
+            self.organization_id, self.result.processed, self.result.imported, self.result.failed,
+        )
+
+    def _insert_one_by_one(self, batch: list[Entry]) -> None:
+        imported = self.result.imported
+        inserted = []
+        for line, row, subtasks in batch:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(insert(Task.__table__), [row])
+                    if subtasks:
+                        db.session.execute(insert(Subtask.__table__), subtasks)
+                    db.session.execute(insert(TaskEvent.__table__), [self._event(row)])
+            except SQLAlchemyError as err:
+                self._error(line, str(getattr(err, "orig", err)).strip())
+            else:
+                self.result.imported += 1
+                inserted.append(row)
+        record_inserted(inserted)
+        touch(self.organization_id)
+        if self.result.imported > imported:
+            record(self.organization_id, "tasks", "imported", data={"count": self.result.imported - imported})
+        db.session.commit()
+
+    def _event(self, row: dict[str, Any]) -> dict[str, Any]:
+        changes = changes_of(row, skip_empty=True)
+        return event_row(self.organization_id, row["id"], "created", changes, self.created_by, row["created_at"])
+
+    def _copy(self, table: Table, rows: list[dict[str, Any]]) -> None:
+        columns = list(rows[0])
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(_copy_text(row[column]) for column in columns))
+            buffer.write("\n")
+        buffer.seek(0)
+        raw = db.session.connection().connection.driver_connection
+        with raw.cursor() as cursor:
+            cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN", buffer)
+
+
+def _copy_text(value: Any) -> str:
+    """Encode one value for COPY's text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, (list, dict)):
+        value = json.dumps(value)
+    elif isinstance(value, datetime):
+        value = value.isoformat(sep=" ")
+    else:
+        value = str(value) if not isinstance(value, str) else value
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _is_dbapi_error(err: Exception) -> bool:
+    dbapi = db.session.get_bind().dialect.dbapi
+    return dbapi is not None and isinstance(err, dbapi.Error)
@@ -0,0 +1,62 @@
+"""Optimistic concurrency for versioned rows.
+
+Tasks, projects, roadmap phases, milestones and teams carry a ``version``
+column that every write increments (the ORM does it through
+``version_id_col``; PATCH does it in its UPDATE). Responses expose it as
+the ``ETag``. A write sent with ``If-Match: "<version>"`` only applies while
+the row is still at that version, as one compare-and-swap UPDATE, otherwise
+it fails with 412 and the current version. Writes without ``If-Match`` keep
+last-write-wins semantics.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from flask import Response, jsonify, request
+from werkzeug.exceptions import PreconditionFailed
+
+
+class VersionConflict(PreconditionFailed):
+    description = "Resource was modified by someone else"
+
+    def __init__(self, current_version: int | None = None) -> None:
+        super().__init__()
+        self.current_version = current_version
+
+
+def expected_version() -> int | None:
+    """The version from ``If-Match``, or ``None`` when absent or ``*``."""
+    if_match = request.if_match
+    if not if_match or if_match.star_tag:
+        return None
+    for tag in if_match.as_set(include_weak=True):
+        try:
+            return int(tag)
+        except ValueError:
+            continue
+    # An ETag we never issued cannot match the current version.
+    raise VersionConflict()
+
+
+def check_if_match(current_version: int) -> None:
+    expected = expected_version()
+    if expected is not None and expected != current_version:
+        raise VersionConflict(current_version)
+
+
+def versioned(payload: dict[str, Any], version: int, status: int = 200) -> Response:
+    response = jsonify(payload)
+    response.status_code = status
+    response.set_etag(str(version))
+    return response
+
+
+def conflict_response(error: VersionConflict) -> Response:
+    body: dict[str, Any] = {"message": error.description}
+    if error.current_version is not None:
+        body["version"] = error.current_version
+    response = jsonify(body)
+    response.status_code = 412
+    if error.current_version is not None:
+        response.set_etag(str(error.current_version))
+    return response
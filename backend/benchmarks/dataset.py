@@ -0,0 +1,37 @@
+"""Fixed synthetic datasets for benchmarks.
+
+Datasets are SQLite files under ``benchmarks/.data``, built once per size
+with ``app.synthetic`` from a fixed seed so every run measures the same rows.
+"""
+from __future__ import annotations
+
+import os
+
+from app.extensions import db
+from app.synthetic import generate
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data")
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+TASKS_PER_ORG = 10_000
+MEMBERS_PER_ORG = 10
+BENCH_PASSWORD = "bench-password"
+
+
+def dataset_path(size: str) -> str:
+    return os.path.join(DATA_DIR, f"bench-{size}.db")
+
+
+def build(size: str, seed: int = 42, chunk: int = 10_000) -> None:
+    """Populate the current app's database with the ``size`` dataset."""
+    total = SIZES[size]
+    db.create_all()
+    generate(
+        orgs=max(1, total // TASKS_PER_ORG),
+        tasks=total,
+        members_per_org=MEMBERS_PER_ORG,
+        seed=seed,
+        password=BENCH_PASSWORD,
+        email_domain="bench.test",
+        chunk=chunk,
+    )
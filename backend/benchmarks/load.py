@@ -0,0 +1,284 @@
+"""End-to-end load test against a locally launched server.
+
+Seeds (or reuses) a benchmark dataset, starts the full ``create_app()``
+stack in a subprocess, drives it with concurrent keep-alive clients using a
+weighted request mix, and reports p50/p95/p99 latency and throughput per
+route.
+
+Usage (from backend/):
+    python -m benchmarks.load --size 1k --concurrency 16 --duration 30
+    python -m benchmarks.load --server gunicorn --mix me=4,list_tasks=5,update_task=2 --json load.json
+    python -m benchmarks.load --baseline load.json --tolerance 0.2
+
+With ``--baseline`` the run exits non-zero when a route's p95 is higher, or
+its throughput lower, than the baseline by more than the tolerance.
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Callable
+
+from . import dataset
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MIX = "login=1,me=4,list_tasks=5,update_task=2,roadmap_phases=1,roadmap_milestones=1"
+
+Request = tuple[str, str, dict | None]
+
+
+class Session:
+    """One simulated user: a keep-alive connection, a token and a task pool."""
+
+    def __init__(self, host: str, port: int, email: str, rng: random.Random) -> None:
+        self.conn = http.client.HTTPConnection(host, port, timeout=30)
+        self.email = email
+        self.rng = rng
+        self.token = ""
+        self.org_id = ""
+        self.task_ids: list[str] = []
+
+    def call(self, method: str, path: str, body: dict | None = None) -> tuple[int, Any]:
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        payload = json.dumps(body) if body is not None else None
+        try:
+            self.conn.request(method, path, body=payload, headers=headers)
+            response = self.conn.getresponse()
+            data = response.read()
+        except (http.client.HTTPException, OSError):
+            self.conn.close()
+            raise
+        return response.status, data
+
+    def login(self) -> None:
+        status, data = self.call("POST", "/api/auth/login", {"email": self.email, "password": dataset.BENCH_PASSWORD})
+        if status != 200:
+            raise RuntimeError(f"login failed for {self.email}: {status} {data[:200]!r}")
+        self.token = json.loads(data)["accessToken"]
+        _, data = self.call("GET", "/api/auth/me")
+        self.org_id = json.loads(data)["memberships"][0]["id"]
+        _, data = self.call("GET", f"/api/tasks/?organizationId={self.org_id}")
+        self.task_ids = [t["id"] for t in json.loads(data)["tasks"][:500]]
+
+
+SCENARIOS: dict[str, Callable[[Session], Request]] = {
+    "login": lambda s: ("POST", "/api/auth/login", {"email": s.email, "password": dataset.BENCH_PASSWORD}),
+    "me": lambda s: ("GET", "/api/auth/me", None),
+    "list_tasks": lambda s: ("GET", f"/api/tasks/?organizationId={s.org_id}", None),
+    "update_task": lambda s: (
+        "PUT",
+        f"/api/tasks/{s.rng.choice(s.task_ids)}",
+        {"progress": s.rng.randrange(0, 100), "actualHours": float(s.rng.randrange(0, 40))},
+    ),
+    "list_projects": lambda s: ("GET", f"/api/projects/?organizationId={s.org_id}", None),
+    "roadmap_phases": lambda s: ("GET", f"/api/roadmap/phases?organizationId={s.org_id}", None),
+    "roadmap_milestones": lambda s: ("GET", f"/api/roadmap/milestones?organizationId={s.org_id}", None),
+    "list_teams": lambda s: ("GET", f"/api/teams/?organizationId={s.org_id}", None),
+}
+
+
+def parse_mix(spec: str) -> list[tuple[str, int]]:
+    mix = []
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix.append((name, int(weight or 1)))
+    return mix
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind: str, db_path: str, port: int, workers: int) -> subprocess.Popen:
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}", PORT=str(port), WEB_CONCURRENCY=str(workers))
+    if kind == "gunicorn":
+        cmd = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--bind", f"127.0.0.1:{port}",
+               "--access-logfile", "/dev/null", "wsgi:app"]
+    elif kind == "uvicorn":
+        cmd = [sys.executable, "-m", "uvicorn", "asgi:app", "--port", str(port), "--no-access-log",
+               "--workers", str(workers)]
+    else:
+        cmd = [sys.executable, "-c",
+               "from werkzeug.serving import run_simple; from wsgi import app; "
+               f"run_simple('127.0.0.1', {port}, app, threaded=True)"]
+    # A file rather than a pipe: nobody drains the pipe, and a full one
+    # blocks the server's access log mid-run.
+    log = tempfile.TemporaryFile()
+    proc = subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            log.seek(0)
+            raise RuntimeError(f"server exited: {log.read().decode()[-2000:]}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("server did not start within 30s")
+
+
+def ensure_dataset(size: str) -> str:
+    path = dataset.dataset_path(size)
+    if not os.path.exists(path):
+        from app import create_app
+        from app.config import Config
+
+        os.makedirs(dataset.DATA_DIR, exist_ok=True)
+        config = type("LoadConfig", (Config,), {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}"})
+        with create_app(config).app_context():
+            print(f"Building {size} dataset at {path} ...", file=sys.stderr)
+            dataset.build(size)
+    return path
+
+
+def run_load(host: str, port: int, args, mix: list[tuple[str, int]]) -> dict[str, Any]:
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    org_count = max(1, dataset.SIZES[args.size] // dataset.TASKS_PER_ORG)
+    samples: dict[str, list[float]] = {name: [] for name in names}
+    errors: dict[str, int] = {name: 0 for name in names}
+    lock = threading.Lock()
+    start_gate = threading.Barrier(args.concurrency + 1)
+    stop_at: list[float] = [0.0]
+
+    def worker(index: int) -> None:
+        rng = random.Random(args.seed + index)
+        email = f"user{index % org_count}-{index % dataset.MEMBERS_PER_ORG}@bench.test"
+        session = Session(host, port, email, rng)
+        session.login()
+        local: dict[str, list[float]] = {name: [] for name in names}
+        local_errors = {name: 0 for name in names}
+        start_gate.wait()
+        sent = 0
+        while time.perf_counter() < stop_at[0] and (not args.requests or sent < args.requests):
+            name = rng.choices(names, weights)[0]
+            method, path, body = SCENARIOS[name](session)
+            started = time.perf_counter()
+            try:
+                status, _ = session.call(method, path, body)
+            except (http.client.HTTPException, OSError):
+                status = 0
+            local[name].append(time.perf_counter() - started)
+            if status >= 400 or status == 0:
+                local_errors[name] += 1
+            sent += 1
+        with lock:
+            for name in names:
+                samples[name] += local[name]
+                errors[name] += local_errors[name]
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    start_gate.wait()
+    began = time.perf_counter()
+    stop_at[0] = began + args.duration
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+
+    routes = {}
+    for name in names:
+        values = sorted(samples[name])
+        routes[name] = {
+            "requests": len(values),
+            "errors": errors[name],
+            "throughput": round(len(values) / elapsed, 2),
+            "p50Ms": round(percentile(values, 50) * 1000, 3),
+            "p95Ms": round(percentile(values, 95) * 1000, 3),
+            "p99Ms": round(percentile(values, 99) * 1000, 3),
+        }
+    total = sum(len(v) for v in samples.values())
+    return {"elapsedSeconds": round(elapsed, 3), "throughput": round(total / elapsed, 2), "routes": routes}
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    regressions = []
+    for name, current in report["routes"].items():
+        previous = baseline["routes"].get(name)
+        if not previous or not previous["requests"]:
+            continue
+        if current["p95Ms"] > previous["p95Ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {current['p95Ms']:.1f} ms vs {previous['p95Ms']:.1f} ms")
+        if current["throughput"] < previous["throughput"] * (1 - tolerance):
+            regressions.append(f"{name}: {current['throughput']:.1f} req/s vs {previous['throughput']:.1f} req/s")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=sorted(dataset.SIZES), default="1k")
+    parser.add_argument("--server", choices=["werkzeug", "gunicorn", "uvicorn"], default="werkzeug")
+    parser.add_argument("--workers", type=int, default=2, help="server worker processes (gunicorn/uvicorn)")
+    parser.add_argument("--url", help="use an already running server (host:port) instead of launching one")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds")
+    parser.add_argument("--requests", type=int, default=0, help="cap per client (0 = unlimited)")
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", dest="json_path")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    proc = None
+    if args.url:
+        host, _, port = args.url.partition(":")
+        port = int(port or 80)
+    else:
+        host, port = "127.0.0.1", _free_port()
+        proc = start_server(args.server, ensure_dataset(args.size), port, args.workers)
+    try:
+        report = run_load(host, port, args, mix)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+    report.update(size=args.size, server=args.server, concurrency=args.concurrency, mix=args.mix)
+    print(f"{'route':22} {'reqs':>7} {'err':>5} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, r in report["routes"].items():
+        print(f"{name:22} {r['requests']:>7} {r['errors']:>5} {r['throughput']:>9.1f} "
+              f"{r['p50Ms']:>9.2f} {r['p95Ms']:>9.2f} {r['p99Ms']:>9.2f}")
+    print(f"\ntotal {report['throughput']:.1f} req/s over {report['elapsedSeconds']:.1f}s")
+
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(report, fh, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as fh:
+            regressions = compare(report, json.load(fh), args.tolerance)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
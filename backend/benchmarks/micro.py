@@ -0,0 +1,300 @@
+"""Micro-benchmarks for backend hot paths.
+
+Covers task serialization, schema validation, RBAC checks and every list
+endpoint's query against a fixed SQLite dataset (see ``dataset.py``).
+
+Usage (from backend/):
+    python -m benchmarks.micro --size 1k
+    python -m benchmarks.micro --size 100k --save-baseline
+    python -m benchmarks.micro --size 100k --tolerance 0.2
+
+Without ``--save-baseline`` results are compared against
+``benchmarks/baselines/micro-<size>.json`` when it exists, and the run exits
+non-zero if any benchmark's median is slower than baseline by more than the
+tolerance.
+"""
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Callable
+
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import Organization, OrganizationMember, Task
+from app.rbac import has_permission
+
+from . import dataset
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_DIR = os.path.join(HERE, "baselines")
+RESULTS_DIR = os.path.join(HERE, "results")
+
+Setup = Callable[["BenchContext"], Callable[[], Any]]
+BENCHMARKS: list[tuple[str, Setup]] = []
+
+
+def benchmark(name: str) -> Callable[[Setup], Setup]:
+    """Register ``setup(ctx)``, which returns the zero-argument callable to time."""
+
+    def decorator(setup: Setup) -> Setup:
+        BENCHMARKS.append((name, setup))
+        return setup
+
+    return decorator
+
+
+class BenchContext:
+    def __init__(self, size: str) -> None:
+        path = dataset.dataset_path(size)
+        config = type("BenchConfig", (Config,), {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}"})
+        self.app = create_app(config)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        if not os.path.exists(path) or Task.query.first() is None:
+            os.makedirs(dataset.DATA_DIR, exist_ok=True)
+            print(f"Building {size} dataset at {path} ...", file=sys.stderr)
+            dataset.build(size)
+        self.client = self.app.test_client()
+        owner = (
+            OrganizationMember.query.join(Organization)
+            .filter(Organization.slug == "org-0", OrganizationMember.role == "owner")
+            .one()
+        )
+        self.org_id = owner.organization_id
+        self.owner_id = owner.user_id
+        self.headers = {"Authorization": f"Bearer {create_access_token(identity=owner.user_id)}"}
+
+    def close(self) -> None:
+        db.session.remove()
+        self.ctx.pop()
+
+
+TASK_PAYLOAD = {
+    "organizationId": "org",
+    "projectId": "project",
+    "title": "Benchmark task",
+    "description": "A task with every field populated",
+    "status": "in-progress",
+    "priority": "high",
+    "phase": "Phase 1",
+    "week": 3,
+    "startDate": "2025-01-06",
+    "endDate": "2025-01-20",
+    "estimatedHours": 12.5,
+    "actualHours": 4,
+    "assignedTo": ["u1", "u2"],
+    "dependencies": ["t1"],
+    "tags": ["backend", "perf"],
+    "progress": 40,
+    "subtasks": [{"id": f"s{i}", "title": f"Step {i}", "status": "pending"} for i in range(5)],
+    "completedAt": None,
+}
+
+
+@benchmark("serialize.task_to_dict")
+def _serialize_task(ctx: BenchContext):
+    from app.blueprints.tasks import _task_to_dict
+
+    task = Task.query.filter_by(organization_id=ctx.org_id).first()
+    return lambda: _task_to_dict(task)
+
+
+@benchmark("validate.task_create")
+def _validate_create(ctx: BenchContext):
+    from app.schemas.task import TaskCreateSchema
+
+    return lambda: TaskCreateSchema.model_validate(TASK_PAYLOAD)
+
+
+@benchmark("validate.task_update")
+def _validate_update(ctx: BenchContext):
+    from app.schemas.task import TaskUpdateSchema
+
+    payload = {"status": "completed", "progress": 100, "actualHours": 10}
+    return lambda: TaskUpdateSchema.model_validate(payload)
+
+
+@benchmark("rbac.owner_all_scope")
+def _rbac_owner(ctx: BenchContext):
+    return lambda: has_permission("owner", [], "task", "delete")
+
+
+@benchmark("rbac.member_team_scope")
+def _rbac_member_team(ctx: BenchContext):
+    teams = ["t1", "t2"]
+    context = ["t3", "t2"]
+    return lambda: has_permission("member", teams, "task", "update", context_team_ids=context)
+
+
+@benchmark("rbac.guest_denied")
+def _rbac_guest_denied(ctx: BenchContext):
+    return lambda: has_permission("guest", ["t1"], "task", "delete", created_by="u1", user_id="u1")
+
+
+@benchmark("query.tasks_by_org")
+def _query_tasks(ctx: BenchContext):
+    def run():
+        tasks = Task.query.filter_by(organization_id=ctx.org_id).order_by(Task.created_at.desc()).all()
+        db.session.expunge_all()
+        return tasks
+
+    return run
+
+
+def _endpoint(path: str) -> Setup:
+    def setup(ctx: BenchContext):
+        url = path.format(org=ctx.org_id)
+
+        def run():
+            response = ctx.client.get(url, headers=ctx.headers)
+            assert response.status_code == 200, (url, response.status_code)
+
+        return run
+
+    return setup
+
+
+for _name, _path in (
+    ("endpoint.list_tasks", "/api/tasks/?organizationId={org}"),
+    ("endpoint.list_projects", "/api/projects/?organizationId={org}"),
+    ("endpoint.list_phases", "/api/roadmap/phases?organizationId={org}"),
+    ("endpoint.list_milestones", "/api/roadmap/milestones?organizationId={org}"),
+    ("endpoint.list_teams", "/api/teams/?organizationId={org}"),
+    ("endpoint.list_organizations", "/api/organizations/"),
+    ("endpoint.me", "/api/auth/me"),
+):
+    benchmark(_name)(_endpoint(_path))
+
+# The same page-load reads as separate calls and as one /api/batch call;
+# the batch should not cost more than the calls it replaces.
+BATCH_READS = (
+    "/api/roadmap/phases?organizationId={org}",
+    "/api/roadmap/milestones?organizationId={org}",
+    "/api/teams/?organizationId={org}",
+    "/api/projects/?organizationId={org}",
+)
+
+
+@benchmark("endpoint.reads_separate")
+def _reads_separate(ctx: BenchContext):
+    runs = [_endpoint(path)(ctx) for path in BATCH_READS]
+
+    def run():
+        for call in runs:
+            call()
+
+    return run
+
+
+@benchmark("endpoint.reads_batch")
+def _reads_batch(ctx: BenchContext):
+    body = {"requests": [{"method": "GET", "path": path.format(org=ctx.org_id)} for path in BATCH_READS]}
+
+    def run():
+        response = ctx.client.post("/api/batch", json=body, headers=ctx.headers)
+        assert response.status_code == 200, response.status_code
+        assert all(item["status"] == 200 for item in response.get_json()["responses"])
+
+    return run
+
+
+def measure(fn: Callable[[], Any], repeat: int, min_sample: float) -> dict[str, Any]:
+    """Median and min seconds per call, with loops calibrated like ``timeit``."""
+    fn()  # warm caches and lazy imports
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_sample or loops >= 1_000_000:
+            break
+        loops *= 10 if elapsed < min_sample / 10 else 2
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - started) / loops)
+    return {"median": statistics.median(samples), "min": min(samples), "loops": loops, "repeat": repeat}
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        ratio = current["median"] / previous["median"]
+        current["baselineRatio"] = round(ratio, 3)
+        if ratio > 1 + tolerance:
+            regressions.append(f"{name}: {ratio:.2f}x baseline (tolerance {1 + tolerance:.2f}x)")
+    return regressions
+
+
+def _format(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=sorted(dataset.SIZES), default="1k")
+    parser.add_argument("--filter", default="*", help="glob on benchmark names")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-sample", type=float, default=0.05, help="seconds per timing sample")
+    parser.add_argument("--tolerance", type=float, default=float(os.environ.get("BENCH_TOLERANCE", "0.2")))
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    ctx = BenchContext(args.size)
+    results: dict[str, Any] = {}
+    try:
+        for name, setup in BENCHMARKS:
+            if not fnmatch.fnmatch(name, args.filter):
+                continue
+            results[name] = measure(setup(ctx), args.repeat, args.min_sample)
+            print(f"{name:32} {_format(results[name]['median'])}  (min {_format(results[name]['min'])})")
+    finally:
+        ctx.close()
+
+    report = {
+        "size": args.size,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    baseline_path = os.path.join(BASELINE_DIR, f"micro-{args.size}.json")
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(baseline_path, "w") as fh:
+            json.dump(report, fh, indent=2, sort_keys=True)
+        print(f"Baseline saved to {baseline_path}")
+        return
+
+    regressions = []
+    if os.path.exists(baseline_path):
+        with open(baseline_path) as fh:
+            regressions = compare(results, json.load(fh)["results"], args.tolerance)
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    with open(os.path.join(RESULTS_DIR, f"micro-{args.size}.json"), "w") as fh:
+        json.dump(report, fh, indent=2, sort_keys=True)
+    if regressions:
+        print("\nRegressions:\n  " + "\n  ".join(regressions))
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
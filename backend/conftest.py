@@ -0,0 +1,47 @@
+"""Shared fixtures: an app on a fresh SQLite file and an org owner to call it as."""
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import Organization, OrganizationMember, User
+
+
+@pytest.fixture
+def config(tmp_path):
+    """The app's config class; override it in a test module to change settings."""
+
+    class TestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'test.db'}"
+        RESPONSE_CACHE_BACKEND = ""
+
+    return TestConfig
+
+
+@pytest.fixture
+def app(config):
+    app = create_app(config)
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def owner(app):
+    """``(org_id, headers)`` for the owner of a new org."""
+    with app.app_context():
+        user = User(email="owner@example.test", display_name="Owner")
+        user.set_password("password")
+        db.session.add(user)
+        db.session.flush()
+        org = Organization(name="Org", slug="org", created_by=user.id)
+        db.session.add(org)
+        db.session.flush()
+        db.session.add(OrganizationMember(organization_id=org.id, user_id=user.id, role="owner", status="active"))
+        db.session.commit()
+        return org.id, {"Authorization": f"Bearer {create_access_token(identity=user.id)}"}
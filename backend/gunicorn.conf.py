@@ -0,0 +1,49 @@
+"""Gunicorn settings for production.
+
+Usage:
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+The app is imported once in the master (``preload_app``) and forked, so code
+and read-only state are shared copy-on-write between workers. Each worker then
+rebuilds its own connection pool in ``post_fork``. Send ``HUP`` to the master
+for a graceful reload: new workers start before old ones finish in-flight
+requests and exit.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get("BIND", f"0.0.0.0:{os.environ.get('PORT', '5001')}")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+worker_class = "gthread" if threads > 1 else "sync"
+preload_app = True
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", "5"))
+
+# Recycle workers periodically to cap slow memory growth; jitter avoids
+# restarting them all at once.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "5000"))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", "500"))
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+
+
+def post_fork(server, worker):
+    from app.database import reset_engine_after_fork
+    from app.jobs import start_workers
+
+    app = worker.app.wsgi()
+    reset_engine_after_fork(app)
+    # Background job threads (JOB_WORKERS) start per worker, never in the master.
+    start_workers(app)
+
+
+def worker_exit(server, worker):
+    from app.jobs import stop_workers
+
+    stop_workers(timeout=graceful_timeout)
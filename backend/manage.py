@@ -1,7 +1,178 @@
+import click
+
 from app import create_app
 
 app = create_app()
 
 
+@app.cli.command("generate-data")
+@click.option("--orgs", default=1, show_default=True, help="Organizations to create.")
+@click.option("--tasks", default=1_000, show_default=True, help="Tasks in total, spread evenly across orgs.")
+@click.option("--members", default=10, show_default=True, help="Users (and memberships) per org.")
+@click.option("--teams", default=5, show_default=True, help="Teams per org.")
+@click.option("--projects", default=5, show_default=True, help="Projects per org.")
+@click.option("--phases", default=4, show_default=True, help="Roadmap phases per org.")
+@click.option("--milestones", default=2, show_default=True, help="Milestones per phase.")
+@click.option("--seed", default=42, show_default=True, help="RNG seed; same seed, same rows.")
+@click.option("--password", default="password", show_default=True, help="Password for every generated user.")
+@click.option("--email-domain", default="example.test", show_default=True)
+@click.option("--chunk", default=10_000, show_default=True, help="Rows per bulk INSERT.")
+@click.option("--create-tables", is_flag=True, help="Run db.create_all() first (instead of flask db upgrade).")
+def generate_data(orgs, tasks, members, teams, projects, phases, milestones, seed, password, email_domain, chunk,
+                  create_tables):
+    """Bulk-load a deterministic synthetic dataset."""
+    import time
+
+    from app.extensions import db
+    from app.synthetic import generate
+
+    if create_tables:
+        db.create_all()
+    started = time.perf_counter()
+    reported = {"at": started}
+
+    def progress(table: str, count: int) -> None:
+        now = time.perf_counter()
+        if table == "tasks" and now - reported["at"] >= 2:
+            reported["at"] = now
+            click.echo(f"  {count:,} / {tasks:,} tasks ({count / (now - started):,.0f}/s)")
+
+    counts = generate(
+        orgs=orgs,
+        tasks=tasks,
+        members_per_org=members,
+        teams_per_org=teams,
+        projects_per_org=projects,
+        phases_per_org=phases,
+        milestones_per_phase=milestones,
+        seed=seed,
+        password=password,
+        email_domain=email_domain,
+        chunk=chunk,
+        progress=progress,
+    )
+    for table, count in counts.items():
+        click.echo(f"{table:22} {count:>12,}")
+    click.echo(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+@app.cli.command("import-tasks")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--org", "org_id", required=True, help="Organization id to import into.")
+@click.option("--format", "fmt", type=click.Choice(["csv", "ndjson"]), help="Defaults to the file extension.")
+@click.option("--created-by", help="Email of the user recorded as creator.")
+@click.option("--batch-size", type=int, help="Rows per insert batch (default IMPORT_BATCH_SIZE).")
+def import_tasks(path, org_id, fmt, created_by, batch_size):
+    """Stream-import tasks from a CSV or NDJSON file."""
+    import json
+
+    from app.models import Organization, User
+    from app.task_import import TaskImporter, detect_format, iter_rows
+
+    fmt = fmt or detect_format(path)
+    if fmt is None:
+        raise click.UsageError("Cannot tell the format from the file name; pass --format")
+    if Organization.query.get(org_id) is None:
+        raise click.UsageError(f"Organization {org_id} not found")
+    creator = None
+    if created_by:
+        user = User.query.filter_by(email=created_by.strip().lower()).first()
+        if user is None:
+            raise click.UsageError(f"User {created_by} not found")
+        creator = user.id
+
+    def progress(result) -> None:
+        click.echo(f"  {result.processed:,} processed, {result.imported:,} imported, {result.failed:,} failed")
+
+    importer = TaskImporter(
+        org_id,
+        creator,
+        batch_size=batch_size or app.config["IMPORT_BATCH_SIZE"],
+        max_errors=app.config["IMPORT_MAX_ERRORS"],
+        progress=progress,
+    )
+    with open(path, "rb") as fh:
+        result = importer.run(iter_rows(fh, fmt))
+    for error in result.errors:
+        click.echo(json.dumps(error), err=True)
+    click.echo(f"Imported {result.imported:,} of {result.processed:,} rows ({result.failed:,} failed)")
+
+
+@app.cli.command("export-org")
+@click.argument("org_id")
+@click.option("--output", "-o", type=click.Path(dir_okay=False), help="Defaults to stdout; a .gz name implies --gzip.")
+@click.option("--format", "fmt", type=click.Choice(["ndjson", "csv"]), default="ndjson", show_default=True)
+@click.option("--resource", type=click.Choice(["teams", "projects", "phases", "milestones", "tasks"]),
+              help="Required for CSV; with NDJSON, start from this resource.")
+@click.option("--after", help="Resume after this id within --resource.")
+@click.option("--gzip", "compress", is_flag=True)
+def export_org(org_id, output, fmt, resource, after, compress):
+    """Stream an organization's data as NDJSON or CSV."""
+    import sys
+
+    from app.models import Organization
+    from app.org_export import csv_lines, encode, export_plan, iter_records, ndjson_lines
+
+    if Organization.query.get(org_id) is None:
+        raise click.UsageError(f"Organization {org_id} not found")
+    if fmt == "csv" and not resource:
+        raise click.UsageError("CSV exports need --resource")
+    compress = compress or bool(output and output.endswith(".gz"))
+    records = iter_records(org_id, export_plan(resource, single=fmt == "csv"), after=after)
+    lines = csv_lines(records) if fmt == "csv" else ndjson_lines(records)
+    out = open(output, "wb") if output else sys.stdout.buffer
+    try:
+        for chunk in encode(lines, gzip=compress):
+            out.write(chunk)
+    finally:
+        if output:
+            out.close()
+
+
+@app.cli.command("prune-events")
+@click.option("--hours", type=int, help="Keep this many hours of events (default EVENTS_RETENTION_HOURS).")
+def prune_events(hours):
+    """Delete old rows from the org_events log behind the SSE streams."""
+    from datetime import timedelta
+
+    from app.org_events import prune
+
+    hours = app.config["EVENTS_RETENTION_HOURS"] if hours is None else hours
+    click.echo(f"Pruned {prune(timedelta(hours=hours)):,} events older than {hours}h")
+
+
+@app.cli.command("run-jobs")
+@click.option("--workers", type=click.IntRange(min=1), default=2, show_default=True, help="Worker threads.")
+def run_jobs(workers):
+    """Run background jobs from the jobs table until interrupted (sidecar worker)."""
+    import signal
+    import threading
+
+    from app.jobs import start_workers, stop_workers
+
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    pool = start_workers(app, workers)
+    click.echo(f"Running jobs with {workers} workers as {pool.worker_id}")
+    try:
+        stopped.wait()
+    except KeyboardInterrupt:
+        pass
+    click.echo("Stopping; waiting for running jobs")
+    stop_workers()
+
+
+@app.cli.command("prune-jobs")
+@click.option("--hours", type=int, help="Keep finished jobs this many hours (default JOB_RETENTION_HOURS).")
+def prune_jobs(hours):
+    """Delete finished jobs and their files."""
+    from datetime import timedelta
+
+    from app.jobs import output_dir, prune
+
+    hours = app.config["JOB_RETENTION_HOURS"] if hours is None else hours
+    click.echo(f"Pruned {prune(timedelta(hours=hours), output_dir(app)):,} jobs finished over {hours}h ago")
+
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5001, debug=True)
@@ -0,0 +1,147 @@
+"""store subtasks as rows
+
+Revision ID: bd329fc9486c
+Revises: 659d8e417112
+Create Date: 2026-10-19 14:20:59.835739
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'bd329fc9486c'
+down_revision = '659d8e417112'
+branch_labels = None
+depends_on = None
+
+BATCH = 1000
+
+tasks = sa.table(
+    'tasks',
+    sa.column('id', sa.String),
+    sa.column('subtasks', sa.JSON),
+    sa.column('subtasks_total', sa.Integer),
+    sa.column('subtasks_completed', sa.Integer),
+    sa.column('progress', sa.Integer),
+)
+subtasks = sa.table(
+    'subtasks',
+    sa.column('task_id', sa.String),
+    sa.column('id', sa.String),
+    sa.column('title', sa.String),
+    sa.column('status', sa.String),
+    sa.column('position', sa.Integer),
+    sa.column('created_at', sa.DateTime),
+    sa.column('updated_at', sa.DateTime),
+)
+
+
+def _task_pages(bind, *columns):
+    """Tasks in id order, ``BATCH`` at a time."""
+    after = ''
+    while True:
+        rows = bind.execute(
+            sa.select(tasks.c.id, *columns).where(tasks.c.id > after).order_by(tasks.c.id).limit(BATCH)
+        ).all()
+        if not rows:
+            return
+        yield rows
+        after = rows[-1].id
+
+
+def _move_json_to_rows(bind):
+    now = datetime.utcnow()
+    for rows in _task_pages(bind, tasks.c.subtasks):
+        items, counters = [], []
+        for row in rows:
+            own = {}
+            for item in row.subtasks or []:
+                # Ids must now be unique per task; the first of any repeats is kept.
+                if isinstance(item, dict) and item.get('id') and str(item['id'])[:64] not in own:
+                    own[str(item['id'])[:64]] = item
+            for position, (subtask_id, item) in enumerate(own.items()):
+                items.append({
+                    'task_id': row.id,
+                    'id': subtask_id,
+                    'title': str(item.get('title') or '')[:255],
+                    'status': str(item.get('status') or 'pending')[:50],
+                    'position': position,
+                    'created_at': now,
+                    'updated_at': now,
+                })
+            if own:
+                total = len(own)
+                completed = sum(1 for item in own.values() if item.get('status') == 'completed')
+                counters.append({'_id': row.id, 'total': total, 'completed': completed,
+                                 'progress': (completed * 200 + total) // (2 * total)})
+        if items:
+            bind.execute(subtasks.insert(), items)
+        if counters:
+            bind.execute(
+                tasks.update().where(tasks.c.id == sa.bindparam('_id')).values(
+                    subtasks_total=sa.bindparam('total'),
+                    subtasks_completed=sa.bindparam('completed'),
+                    progress=sa.bindparam('progress'),
+                ),
+                counters,
+            )
+
+
+def _move_rows_to_json(bind):
+    for rows in _task_pages(bind):
+        ids = [row.id for row in rows]
+        grouped = {task_id: [] for task_id in ids}
+        for item in bind.execute(
+            sa.select(subtasks.c.task_id, subtasks.c.id, subtasks.c.title, subtasks.c.status)
+            .where(subtasks.c.task_id.in_(ids))
+            .order_by(subtasks.c.task_id, subtasks.c.position)
+        ):
+            grouped[item.task_id].append({'id': item.id, 'title': item.title, 'status': item.status})
+        values = [{'_id': task_id, 'items': items} for task_id, items in grouped.items() if items]
+        if values:
+            bind.execute(
+                tasks.update().where(tasks.c.id == sa.bindparam('_id')).values(subtasks=sa.bindparam('items')),
+                values,
+            )
+
+
+def upgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('subtasks',
+    sa.Column('task_id', sa.String(length=36), nullable=False),
+    sa.Column('id', sa.String(length=64), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('task_id', 'id')
+    )
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('subtasks_total', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('subtasks_completed', sa.Integer(), server_default='0', nullable=False))
+
+    _move_json_to_rows(op.get_bind())
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_column('subtasks')
+
+    # ### end Alembic commands ###
+
+
+def downgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('subtasks', sa.JSON(), server_default='[]', nullable=False))
+
+    _move_rows_to_json(op.get_bind())
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_column('subtasks_completed')
+        batch_op.drop_column('subtasks_total')
+
+    op.drop_table('subtasks')
+    # ### end Alembic commands ###
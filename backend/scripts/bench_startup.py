@@ -0,0 +1,136 @@
+"""
+Cold-start benchmark for the Flask app factory.
+
+Each run starts a fresh interpreter with ``-X importtime``, imports ``app`` and
+calls ``create_app()``. Reports per-module import time for the ``app`` package
+and the heaviest third-party imports, plus factory time per blueprint, and
+fails when the median cold start is over budget.
+
+Usage:
+    python backend/scripts/bench_startup.py --runs 5 --budget-ms 800
+    python backend/scripts/bench_startup.py --json startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import json, time
+import flask
+
+blueprint_ms = {}
+_register = flask.Flask.register_blueprint
+
+def register_blueprint(self, blueprint, **options):
+    started = time.perf_counter()
+    _register(self, blueprint, **options)
+    blueprint_ms[blueprint.name] = (time.perf_counter() - started) * 1000
+
+flask.Flask.register_blueprint = register_blueprint
+
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+app.create_app()
+built = time.perf_counter()
+print(json.dumps({
+    "importMs": (imported - started) * 1000,
+    "factoryMs": (built - imported) * 1000,
+    "blueprintMs": blueprint_ms,
+}))
+"""
+
+
+def run_once() -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        name, self_us, cumulative_us = _parse_importtime_line(line)
+        modules[name.strip()] = (self_us / 1000, cumulative_us / 1000)
+    result["modules"] = modules
+    return result
+
+
+def _parse_importtime_line(line: str):
+    self_us, cumulative_us, name = line[len("import time:"):].split("|")
+    return name.rstrip(), int(self_us), int(cumulative_us)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=float(os.environ.get("STARTUP_BUDGET_MS", "1000")))
+    parser.add_argument("--top", type=int, default=10, help="third-party imports to list")
+    parser.add_argument("--json", dest="json_path", help="write the median results to this file")
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+
+    def median(values):
+        return round(statistics.median(values), 2)
+
+    names = set().union(*(r["modules"] for r in runs))
+    modules = {
+        name: {
+            "selfMs": median([r["modules"].get(name, (0, 0))[0] for r in runs]),
+            "cumulativeMs": median([r["modules"].get(name, (0, 0))[1] for r in runs]),
+        }
+        for name in names
+    }
+    blueprints = {
+        name: median([r["blueprintMs"].get(name, 0) for r in runs])
+        for name in runs[0]["blueprintMs"]
+    }
+    summary = {
+        "runs": args.runs,
+        "importMs": median([r["importMs"] for r in runs]),
+        "factoryMs": median([r["factoryMs"] for r in runs]),
+        "blueprintMs": blueprints,
+        "modules": modules,
+    }
+    total = round(summary["importMs"] + summary["factoryMs"], 2)
+    summary["totalMs"] = total
+    summary["budgetMs"] = args.budget_ms
+
+    own = sorted((n for n in modules if n == "app" or n.startswith("app.")), key=lambda n: -modules[n]["selfMs"])
+    third_party = sorted(
+        (n for n in modules if "." not in n and n != "app"),
+        key=lambda n: -modules[n]["cumulativeMs"],
+    )[: args.top]
+
+    print(f"{'module':45} {'self ms':>10} {'cumul ms':>10}")
+    for name in own + third_party:
+        print(f"{name:45} {modules[name]['selfMs']:>10.2f} {modules[name]['cumulativeMs']:>10.2f}")
+    print()
+    for name, ms in blueprints.items():
+        print(f"register {name:36} {ms:>10.2f}")
+    print()
+    print(f"import app     {summary['importMs']:>8.2f} ms")
+    print(f"create_app()   {summary['factoryMs']:>8.2f} ms")
+    print(f"total (median) {total:>8.2f} ms  budget {args.budget_ms:.0f} ms")
+
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(summary, fh, indent=2, sort_keys=True)
+
+    if total > args.budget_ms:
+        raise SystemExit(f"Cold start {total:.0f} ms exceeds budget of {args.budget_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
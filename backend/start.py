@@ -1,5 +1,9 @@
 #!/usr/bin/env python3
-"""Start Flask server with debugging"""
+"""Start Flask development server with debugging.
+
+Not for deployment: use ``gunicorn -c gunicorn.conf.py wsgi:app`` instead.
+Pass ``--routes`` to print the route table.
+"""
 
 from app import create_app
 import sys
@@ -14,17 +18,19 @@ try:
     print(f"✓ Debug mode: {app.debug}")
     print(f"✓ CORS Origins: {app.config.get('CORS_ORIGINS', [])}")
     
-    print("\n" + "=" * 70)
-    print("Registered Routes:")
-    print("=" * 70)
-    for rule in sorted(app.url_map.iter_rules(), key=lambda r: str(r)):
-        methods = ', '.join(sorted(rule.methods - {'HEAD'}))
-        print(f"  {methods:30} {rule}")
+    if "--routes" in sys.argv:
+        print("\n" + "=" * 70)
+        print("Registered Routes:")
+        print("=" * 70)
+        for rule in sorted(app.url_map.iter_rules(), key=lambda r: str(r)):
+            methods = ', '.join(sorted(rule.methods - {'HEAD'}))
+            print(f"  {methods:30} {rule}")
     
     print("\n" + "=" * 70)
     print("Server starting on http://0.0.0.0:5001")
     print("Frontend should use: http://localhost:5001")
     print("=" * 70)
+    print("Development only - production: gunicorn -c gunicorn.conf.py wsgi:app")
     print("\nWatching for requests...\n")
     
     app.run(host="0.0.0.0", port=5001, debug=True, use_reloader=True)
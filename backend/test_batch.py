@@ -0,0 +1,25 @@
+"""A batch verifies its bearer token once, however many sub-requests it runs."""
+
+import flask_jwt_extended.tokens as tokens
+
+
+def test_sub_requests_reuse_the_verified_token(app, owner, monkeypatch):
+    org_id, headers = owner
+    client = app.test_client()
+    decode = tokens.jwt.decode
+    decoded: list = []
+    monkeypatch.setattr(tokens.jwt, "decode", lambda *args, **kwargs: decoded.append(1) or decode(*args, **kwargs))
+
+    def batch(*paths):
+        decoded.clear()
+        response = client.post("/api/batch", json={"requests": [{"method": "GET", "path": path} for path in paths]},
+                               headers=headers)
+        assert response.status_code == 200
+        assert [item["status"] for item in response.get_json()["responses"]] == [200] * len(paths)
+        return len(decoded)
+
+    # Whatever the library decodes for /api/batch itself, the sub-requests add nothing.
+    alone = batch("/api/auth/me")
+    assert alone > 0
+    assert batch("/api/auth/me", f"/api/tasks/?organizationId={org_id}",
+                 f"/api/projects/?organizationId={org_id}") == alone
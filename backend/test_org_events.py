@@ -0,0 +1,40 @@
+"""The event cursor must skip a gap only once that gap itself has timed out."""
+
+from types import SimpleNamespace
+
+import app.org_events as org_events
+from app.org_events import Cursor
+
+
+def _rows(*ids):
+    return [SimpleNamespace(id=event_id) for event_id in ids]
+
+
+def test_old_gap_does_not_skip_newer_one(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(org_events.time, "monotonic", lambda: clock[0])
+    cursor = Cursor(0, 0.2)
+
+    # Per-org reads: 2 is another org's event and never shows up.
+    assert [row.id for row in cursor.advance(_rows(1, 3))] == [1, 3]
+    assert cursor.position == 1
+
+    clock[0] += 0.3
+    # 5 is still committing when 7 appears; 4 and 6 are other orgs'.
+    assert [row.id for row in cursor.advance(_rows(3, 7))] == [7]
+    assert cursor.position == 3
+
+    clock[0] += 0.1
+    assert [row.id for row in cursor.advance(_rows(5, 7))] == [5]
+
+    clock[0] += 0.2
+    assert cursor.advance(_rows(5, 7)) == []
+    assert cursor.position == 7
+
+
+def test_rows_past_a_gap_are_returned_once():
+    cursor = Cursor(10, 60)
+    assert [row.id for row in cursor.advance(_rows(12, 13))] == [12, 13]
+    assert cursor.advance(_rows(12, 13)) == []
+    assert [row.id for row in cursor.advance(_rows(11, 12, 13))] == [11]
+    assert cursor.position == 13
@@ -0,0 +1,43 @@
+"""Profiling a streamed response must not buffer the stream."""
+
+import os
+import time
+
+import pytest
+
+
+@pytest.fixture
+def config(config, tmp_path):
+    class ProfilingConfig(config):
+        ADMIN_EMAILS = ["owner@example.test"]
+        PROFILE_DIR = str(tmp_path / "profiles")
+        EVENTS_WSGI_STREAM_SECONDS = 10
+        EVENTS_POLL_INTERVAL = 0.05
+
+    return ProfilingConfig
+
+
+def test_profiled_event_stream_flows_and_is_saved_on_close(app, owner):
+    org_id, headers = owner
+    started = time.monotonic()
+    response = app.test_client().get(f"/api/organizations/{org_id}/events",
+                                     headers={**headers, "X-Profile": "1"}, buffered=False)
+    assert response.status_code == 200
+    assert next(response.response).startswith(b"retry:")
+    assert time.monotonic() - started < 5
+    profile_id = response.headers["X-Profile-Id"]
+    assert not os.path.exists(os.path.join(app.config["PROFILE_DIR"], f"{profile_id}.json"))
+
+    response.close()
+    assert os.path.exists(os.path.join(app.config["PROFILE_DIR"], f"{profile_id}.prof"))
+    assert os.path.exists(os.path.join(app.config["PROFILE_DIR"], f"{profile_id}.json"))
+
+
+def test_profiled_request_returns_its_body(app, owner):
+    org_id, headers = owner
+    response = app.test_client().get("/api/auth/me", headers={**headers, "X-Profile": "1"})
+    assert response.status_code == 200
+    assert response.get_json()["user"]["email"] == "owner@example.test"
+    response.close()
+    profile_id = response.headers["X-Profile-Id"]
+    assert os.path.exists(os.path.join(app.config["PROFILE_DIR"], f"{profile_id}.prof"))
@@ -0,0 +1,167 @@
+"""The stored project rollups must match a recount of the tasks after every kind of task write."""
+
+import json
+from datetime import date
+
+import pytest
+from sqlalchemy import case, func, select
+
+from app.extensions import db
+from app.models import ProjectStats, Task
+
+
+@pytest.fixture
+def config(config, request):
+    class StatsConfig(config):
+        RESPONSE_CACHE_BACKEND = getattr(request, "param", "")
+
+    return StatsConfig
+
+
+def _recount():
+    tasks = Task.__table__
+    done = tasks.c.status == "completed"
+    rows = db.session.execute(
+        select(
+            tasks.c.project_id,
+            func.count(),
+            *(func.sum(case((tasks.c.status == s, 1), else_=0)) for s in ("pending", "in-progress", "completed", "blocked")),
+            func.coalesce(func.sum(tasks.c.estimated_hours), 0),
+            func.coalesce(func.sum(tasks.c.actual_hours), 0),
+            func.sum(case((done, 100), else_=tasks.c.progress)),
+        ).where(tasks.c.project_id.is_not(None)).group_by(tasks.c.project_id)
+    )
+    return {row[0]: tuple(row[1:]) for row in rows}
+
+
+def _stored():
+    table = ProjectStats.__table__
+    rows = db.session.execute(select(table).where(table.c.tasks != 0))
+    return {
+        row.project_id: (row.tasks, row.pending, row.in_progress, row.completed, row.blocked,
+                         row.estimated_hours, row.actual_hours, row.progress_sum)
+        for row in rows
+    }
+
+
+def test_rollup_follows_every_task_write(app, owner):
+    org_id, headers = owner
+    client = app.test_client()
+    projects = [
+        client.post("/api/projects/", json={"organizationId": org_id, "name": name, "key": name.upper()},
+                    headers=headers).get_json()["project"]["id"]
+        for name in ("alpha", "beta")
+    ]
+    alpha, beta = projects
+
+    def create(**fields):
+        response = client.post("/api/tasks/", json={"organizationId": org_id, "title": "t", **fields}, headers=headers)
+        assert response.status_code == 201
+        return response.get_json()["task"]["id"]
+
+    first = create(projectId=alpha, estimatedHours=5, progress=30, endDate="2000-01-01")
+    second = create(projectId=alpha, status="blocked", actualHours=2.5)
+    third = create(projectId=beta, progress=40, subtasks=[{"id": "a", "title": "A", "status": "completed"}])
+    create(title="no project", progress=10)
+
+    assert client.put(f"/api/tasks/{first}", json={"status": "in-progress", "actualHours": 1},
+                      headers=headers).status_code == 200
+    assert client.patch(f"/api/tasks/{second}", json={"status": "completed"}, headers=headers).status_code == 200
+    assert client.patch(f"/api/tasks/{first}", json={"progress": 75, "estimatedHours": 8},
+                        headers=headers).status_code == 200
+    assert client.patch(f"/api/tasks/{first}", json={"title": "renamed"}, headers=headers).status_code == 200
+    # The first subtask replaces a manual progress; later ones derive it.
+    assert client.post(f"/api/tasks/{first}/subtasks", json={"id": "s1", "title": "S1"},
+                       headers=headers).status_code == 201
+    assert client.post(f"/api/tasks/{first}/subtasks", json={"id": "s2", "title": "S2", "status": "completed"},
+                       headers=headers).status_code == 201
+    assert client.patch(f"/api/tasks/{first}/subtasks/s1", json={"status": "completed"},
+                        headers=headers).status_code == 200
+    assert client.delete(f"/api/tasks/{first}/subtasks/s2", headers=headers).status_code == 200
+    assert client.delete(f"/api/tasks/{third}", headers=headers).status_code == 204
+
+    body = "\n".join(json.dumps(row) for row in (
+        {"title": "imported", "projectId": beta, "status": "in-progress", "progress": 20, "estimatedHours": 3},
+        {"title": "imported done", "projectId": alpha, "status": "completed", "progress": 50},
+    ))
+    response = client.post(f"/api/tasks/import?organizationId={org_id}", data=body,
+                           content_type="application/x-ndjson", headers=headers)
+    assert response.get_json()["imported"] == 2
+
+    with app.app_context():
+        assert _stored() == _recount()
+
+    listed = client.get(f"/api/projects/?organizationId={org_id}&include=stats", headers=headers).get_json()
+    stats = {project["id"]: project["stats"] for project in listed["projects"]}
+    assert stats[alpha]["tasks"] == 3
+    assert stats[alpha]["byStatus"]["completed"] == 2
+    assert stats[alpha]["overdue"] == (1 if date.today() > date(2000, 1, 1) else 0)
+    assert stats[beta] == {
+        "tasks": 1,
+        "byStatus": {"pending": 0, "in-progress": 1, "completed": 0, "blocked": 0},
+        "open": 1,
+        "overdue": 0,
+        "estimatedHours": 3.0,
+        "actualHours": 0.0,
+        "percentComplete": 20,
+    }
+
+
+def test_patch_rereads_when_a_write_lands_after_its_snapshot(app, owner, monkeypatch):
+    org_id, headers = owner
+    client = app.test_client()
+    project = client.post("/api/projects/", json={"organizationId": org_id, "name": "alpha", "key": "A"},
+                          headers=headers).get_json()["project"]["id"]
+    task = client.post("/api/tasks/", json={"organizationId": org_id, "title": "t", "projectId": project},
+                       headers=headers).get_json()["task"]["id"]
+
+    import app.project_stats as project_stats
+
+    snapshot = project_stats.snapshot
+    competing: list = []
+
+    def snapshot_then_compete(task_id):
+        old = snapshot(task_id)
+        if not competing:
+            competing.append(None)
+            # Another request commits between this read and the PATCH's UPDATE.
+            competing[0] = app.test_client().patch(f"/api/tasks/{task}", json={"status": "blocked"}, headers=headers)
+        return old
+
+    monkeypatch.setattr(project_stats, "snapshot", snapshot_then_compete)
+    response = client.patch(f"/api/tasks/{task}", json={"status": "completed"}, headers=headers)
+    assert competing[0].status_code == 200
+    assert response.status_code == 200
+    assert response.get_json()["task"]["status"] == "completed"
+
+    # With If-Match the client's version is the one to swap on: the competing write is its 412.
+    competing.clear()
+    stale = client.patch(f"/api/tasks/{task}", json={"status": "pending"},
+                         headers={**headers, "If-Match": response.headers["ETag"]})
+    assert stale.status_code == 412
+
+    with app.app_context():
+        assert _stored() == _recount() == {project: (1, 0, 0, 0, 1, 0, 0, 0)}
+
+
+
+@pytest.mark.parametrize("config", ["memory"], indirect=True)
+def test_cached_stats_list_follows_the_day(app, owner, monkeypatch):
+    import app.project_stats as project_stats
+
+    org_id, headers = owner
+    client = app.test_client()
+    project = client.post("/api/projects/", json={"organizationId": org_id, "name": "alpha", "key": "A"},
+                          headers=headers).get_json()["project"]["id"]
+    client.post("/api/tasks/", json={"organizationId": org_id, "title": "t", "projectId": project,
+                                     "endDate": "2025-03-03"}, headers=headers)
+    url = f"/api/projects/?organizationId={org_id}&include=stats"
+    day = [date(2025, 3, 3)]
+    monkeypatch.setattr(project_stats, "current_day", lambda: day[0])
+
+    assert client.get(url, headers=headers).get_json()["projects"][0]["stats"]["overdue"] == 0
+    assert client.get(url, headers=headers).headers["X-Cache"] == "HIT"
+    day[0] = date(2025, 3, 4)
+    response = client.get(url, headers=headers)
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.get_json()["projects"][0]["stats"]["overdue"] == 1
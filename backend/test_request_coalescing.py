@@ -0,0 +1,52 @@
+"""Request coalescing must not hand a read the result of a query started before a write."""
+
+import threading
+
+import pytest
+
+
+@pytest.fixture(params=["memory", ""], ids=["cache", "no-cache"])
+def config(config, request):
+    class CoalescingConfig(config):
+        RESPONSE_CACHE_BACKEND = request.param
+        REQUEST_COALESCING = True
+        REQUEST_COALESCING_TIMEOUT = 10
+
+    return CoalescingConfig
+
+
+def test_read_after_write_does_not_join_earlier_flight(app, owner, monkeypatch):
+    org_id, headers = owner
+    client = app.test_client()
+    url = f"/api/tasks/?organizationId={org_id}"
+    assert client.post("/api/tasks/", json={"organizationId": org_id, "title": "old"}, headers=headers).status_code == 201
+
+    # Hold the first list request inside the view, after it has read the tasks.
+    import app.subtasks as subtasks
+
+    load_subtasks = subtasks.load_subtasks
+    entered, release = threading.Event(), threading.Event()
+
+    def blocking_load(*args, **kwargs):
+        if not entered.is_set():
+            entered.set()
+            assert release.wait(10)
+        return load_subtasks(*args, **kwargs)
+
+    monkeypatch.setattr(subtasks, "load_subtasks", blocking_load)
+    leader: dict = {}
+    thread = threading.Thread(target=lambda: leader.update(response=app.test_client().get(url, headers=headers)))
+    thread.start()
+    try:
+        assert entered.wait(10)
+        created = client.post("/api/tasks/", json={"organizationId": org_id, "title": "new"}, headers=headers)
+        assert created.status_code == 201
+
+        response = client.get(url, headers=headers)
+    finally:
+        release.set()
+        thread.join(10)
+
+    assert response.headers.get("X-Cache") != "COALESCED"
+    assert {task["title"] for task in response.get_json()["tasks"]} == {"old", "new"}
+    assert [task["title"] for task in leader["response"].get_json()["tasks"]] == ["old"]
@@ -0,0 +1,23 @@
+"""Edits to any client-editable task field must show up in the task's activity log."""
+
+import pytest
+
+
+@pytest.mark.parametrize("method", ["patch", "put"])
+@pytest.mark.parametrize("changes", [
+    {"description": "Now with details"},
+    {"tags": ["backend", "perf"]},
+    {"dependencies": ["other-task"]},
+], ids=["description", "tags", "dependencies"])
+def test_edit_records_updated_event(app, owner, method, changes):
+    org_id, headers = owner
+    client = app.test_client()
+    created = client.post("/api/tasks/", json={"organizationId": org_id, "title": "Task"}, headers=headers)
+    task_id = created.get_json()["task"]["id"]
+
+    response = getattr(client, method)(f"/api/tasks/{task_id}", json=changes, headers=headers)
+    assert response.status_code == 200
+
+    feed = client.get(f"/api/organizations/{org_id}/activity?taskId={task_id}", headers=headers).get_json()
+    assert [event["action"] for event in feed["events"]] == ["updated", "created"]
+    assert feed["events"][0]["changes"] == changes
@@ -0,0 +1,32 @@
+"""A cached workload without ``from`` must follow the current week."""
+
+from datetime import date
+
+import pytest
+
+
+@pytest.fixture
+def config(config):
+    class CachedConfig(config):
+        RESPONSE_CACHE_BACKEND = "memory"
+
+    return CachedConfig
+
+
+def test_default_window_is_part_of_the_cache_key(app, owner, monkeypatch):
+    import app.workload as workload
+
+    org_id, headers = owner
+    client = app.test_client()
+    url = f"/api/teams/workload?organizationId={org_id}&weeks=1"
+    monday = [date(2025, 3, 3)]
+    monkeypatch.setattr(workload, "week_start", lambda day: monday[0])
+
+    first = client.get(url, headers=headers)
+    assert first.get_json()["workload"]["weekStarts"] == ["2025-03-03"]
+    assert client.get(url, headers=headers).headers["X-Cache"] == "HIT"
+
+    monday[0] = date(2025, 3, 10)
+    later = client.get(url, headers=headers)
+    assert later.headers["X-Cache"] == "MISS"
+    assert later.get_json()["workload"]["weekStarts"] == ["2025-03-10"]